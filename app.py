@@ -5,11 +5,25 @@ import config
 
 # extensions.py에서 불러오기
 from extensions import db, csrf, limiter
+from services.assets import asset_url, assets_cli
+from services.compression import init_compression
+from services.metrics import init_metrics
+from services.profiling import init_profiling, profile_cli
+from services.startup import init_startup, startup_cli
+from services.submission_throttle import init_submission_throttle
+from services.views import FastJSONProvider
+from services.query_budget import perf_cli
+from services.transfer import export_command, import_command
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(config.Config)
+    # jsonify: orjson 이 있으면 사용, 뷰 모델(slots 데이터클래스) 직렬화
+    app.json = FastJSONProvider(app)
+
+    # 응답 압축 (gzip/brotli)
+    init_compression(app)
 
     # 프록시 설정
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_host=1)
@@ -19,10 +33,30 @@ def create_app():
     csrf.init_app(app)
     limiter.init_app(app)
 
+    # 요청 단위 계측 (SQL 횟수/시간, 렌더링, Server-Timing)
+    init_metrics(app)
+    # 서명 토큰이 붙은 요청만 프로파일 (사용자 로딩 SQL 까지 포함되도록 일찍 등록)
+    init_profiling(app)
+
+    # 정적 자원 (fingerprint 번들)
+    app.jinja_env.globals["asset_url"] = asset_url
+    # 기동 최적화: 템플릿 바이트코드 캐시, fork 후 DB 풀 정리 (preload_app)
+    init_startup(app)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(perf_cli)
+    app.cli.add_command(profile_cli)
+    app.cli.add_command(startup_cli)
+    app.cli.add_command(export_command)
+    app.cli.add_command(import_command)
+
     # 모델 import (순환참조 방지)
     from models.user import User
     from models.research import Competition, TeamApplication, TeamPost
     from models.wargame import WargameAttempt, WargameChallenge
+    from models.transfer import TransferIdMap
+
+    # 플래그 제출 제한 (로그인 사용자 로딩보다 먼저: 거절 시 DB 접근 없음)
+    init_submission_throttle(app)
 
     # 로그인 사용자 로딩
     @app.before_request
@@ -40,7 +74,8 @@ def create_app():
         resp.headers["Permissions-Policy"] = "geolocation=(), microphone=()"
         resp.headers["Content-Security-Policy"] = (
             "default-src 'self'; "
-            "style-src 'self' 'unsafe-inline'; "
+            "style-src 'self'; "
+            "style-src-attr 'unsafe-inline'; "
             "script-src 'self' 'unsafe-inline'; "
             "img-src 'self'; "
             "object-src 'none'; "
@@ -52,11 +87,19 @@ def create_app():
     from routes.auth import auth_bp
     from routes.research import research_bp
     from routes.wargame import wargame_bp
+    from routes.assets import assets_bp
+    from routes.metrics import metrics_bp
+    from routes.admin import admin_bp
+    from routes.health import health_bp
 
     app.register_blueprint(home_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(research_bp)
     app.register_blueprint(wargame_bp)
+    app.register_blueprint(assets_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(health_bp)
 
     return app
 
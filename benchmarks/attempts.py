@@ -0,0 +1,74 @@
+"""오답 제출 처리량 벤치마크: 동기 INSERT+COMMIT vs write-behind 배치.
+
+    python -m benchmarks.attempts --attempts 2000
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+
+from benchmarks.common import build_app, clear_flashes, login
+
+
+def _submit_many(client, challenge_ids, count, rng):
+    elapsed = 0.0
+    for index in range(count):
+        data = {"challenge_id": rng.choice(challenge_ids), "flag": f"FLAG{{wrong_{index}}}"}
+        started = time.perf_counter()
+        client.post("/wargame/attempt", data=data)
+        elapsed += time.perf_counter() - started
+        clear_flashes(client)
+    return elapsed
+
+
+def run(attempts=1000, batch_size=200):
+    from extensions import db
+    from models.wargame import WargameAttempt, WargameChallenge
+    from services import attempt_ingest
+
+    spool_dir = tempfile.mkdtemp(prefix="attempt_spool_")
+    app = build_app(
+        scale={"users": 20, "challenges": 50, "attempts": 0, "posts": 0, "applications": 0},
+        ATTEMPT_SPOOL_DIR=spool_dir,
+        ATTEMPT_BATCH_SIZE=batch_size,
+    )
+    client = app.test_client()
+    login(app, client)
+    with app.app_context():
+        challenge_ids = [challenge_id for (challenge_id,) in db.session.query(WargameChallenge.id)]
+    rng = random.Random(42)
+    client.post("/wargame/attempt", data={"challenge_id": challenge_ids[0], "flag": "warm-up"})
+
+    results = {}
+    for mode, write_behind in (("sync_commit", False), ("write_behind", True)):
+        app.config["ATTEMPT_WRITE_BEHIND"] = write_behind
+        elapsed = _submit_many(client, challenge_ids, attempts, rng)
+        flushed_at = time.perf_counter()
+        with app.app_context():
+            attempt_ingest.flush(app)
+        flush_tail = time.perf_counter() - flushed_at
+        results[mode] = {
+            "attempts": attempts,
+            "seconds": round(elapsed, 3),
+            "attempts_per_sec": round(attempts / elapsed, 1),
+            "final_flush_seconds": round(flush_tail, 4),
+        }
+    with app.app_context():
+        results["rows_written"] = db.session.query(WargameAttempt).count()
+    results["speedup"] = round(
+        results["write_behind"]["attempts_per_sec"] / results["sync_commit"]["attempts_per_sec"], 2
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.attempts, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
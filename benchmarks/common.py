@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def build_app(database_url=None, seed=42, scale=None, **config):
+    # 벤치마크 전용 임시 DB. create_app 이 Config 를 읽기 전에 환경변수를 정해야 한다.
+    os.environ["DATABASE_URL"] = database_url or "sqlite:///" + tempfile.mktemp(suffix=".db")
+    from app import create_app
+    from extensions import db, limiter
+    from services.datagen import generate
+
+    app = create_app()
+    app.config.update(
+        {"WTF_CSRF_ENABLED": False, "RATELIMIT_ENABLED": False, "SUBMIT_THROTTLE_ENABLED": False, **config}
+    )
+    # RATELIMIT_ENABLED 는 init_app 시점에만 읽히므로 직접 끈다.
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+        generate(seed=seed, **(scale or {}))
+    return app
+
+
+def login(app, client):
+    from models.user import User
+
+    with app.app_context():
+        user_id = User.query.order_by(User.id).first().id
+    with client.session_transaction() as sess:
+        sess["user_id"] = user_id
+    return user_id
+
+
+def clear_flashes(client):
+    # 리다이렉트를 따라가지 않으면 flash 메시지가 세션 쿠키에 계속 쌓여 측정이 왜곡된다.
+    with client.session_transaction() as sess:
+        sess.pop("_flashes", None)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fake_ctftime_events(count=30):
+    return [
+        {
+            "id": 9000 + index,
+            "title": f"Stub CTF {index}",
+            "description": "로컬 벤치마크용 CTFtime 응답입니다. " * 4,
+            "format": "Jeopardy",
+            "onsite": index % 3 == 0,
+            "weight": 25.0,
+            "location": "Online",
+            "participants": 100 + index,
+            "ctftime_url": f"https://ctftime.org/event/{9000 + index}/",
+            "url": "https://example.com",
+            "logo": "",
+            "start": "2030-01-01T00:00:00+00:00",
+            "finish": "2030-01-03T00:00:00+00:00",
+            "duration": {"days": 2, "hours": 0},
+        }
+        for index in range(count)
+    ]
+
+
+class StubCTFtimeServer:
+    # CTFtime API 흉내: 어떤 경로든 고정된 이벤트 목록을 돌려준다.
+    # ETag/Last-Modified 를 붙이고 조건부 요청에는 304 로 답한다.
+    # fail_status 를 주면 fail_count 번(None 이면 계속) 그 상태 코드로 실패한다.
+    protocol_version = "HTTP/1.1"  # keep-alive: 연결 재사용 효과를 재려면 필요
+
+    def __init__(self, events=None, delay=0.0, fail_status=None, fail_count=None):
+        body = json.dumps(events if events is not None else fake_ctftime_events()).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        last_modified = formatdate(usegmt=True)
+        served = {"count": 0, "not_modified": 0, "failed": 0, "connections": set()}
+        protocol = self.protocol_version
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = protocol
+            # 헤더와 본문을 따로 보내므로 Nagle + delayed ACK 로 keep-alive 요청마다 ~40ms 가 붙는다
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                served["count"] += 1
+                served["connections"].add(self.client_address)
+                if delay:
+                    threading.Event().wait(delay)
+                if fail_status and (fail_count is None or served["failed"] < fail_count):
+                    served["failed"] += 1
+                    self.send_response(fail_status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == etag or (
+                    "If-None-Match" not in self.headers
+                    and self.headers.get("If-Modified-Since") == last_modified
+                ):
+                    served["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.served = served
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/api/v1/events/"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
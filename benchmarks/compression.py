@@ -0,0 +1,82 @@
+"""응답 압축 벤치마크: 인코딩/레벨별 전송 바이트와 요청당 CPU 시간.
+
+    python -m benchmarks.compression --requests 50
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.common import build_app, login
+from services.compression import CompressionMiddleware, brotli
+
+VARIANTS = [
+    ("identity", None),
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("br", 4),
+    ("br", 11),
+]
+
+
+def run(requests_per_variant=30, posts=200):
+    os.environ["COMPRESS_ENABLED"] = "0"
+    app = build_app(scale={"users": 50, "posts": posts, "applications": posts * 2})
+    raw_wsgi = app.wsgi_app
+    client = app.test_client()
+    login(app, client)
+
+    targets = [
+        ("GET", "/research", None),
+        ("GET", "/wargame/", None),
+        ("POST", "/api/random-match", {}),
+    ]
+    results = []
+    for path_method, path, payload in targets:
+        client.open(path, method=path_method, json=payload)  # warm-up
+        baseline_cpu = None
+        for encoding, level in VARIANTS:
+            if encoding == "br" and brotli is None:
+                continue
+            if encoding == "identity":
+                app.wsgi_app = raw_wsgi
+            else:
+                app.wsgi_app = CompressionMiddleware(
+                    raw_wsgi,
+                    level=level if encoding == "gzip" else 6,
+                    brotli_quality=level if encoding == "br" else 4,
+                )
+            headers = {"Accept-Encoding": encoding}
+            wire_bytes = 0
+            start = time.process_time()
+            for _ in range(requests_per_variant):
+                resp = client.open(path, method=path_method, json=payload, headers=headers)
+                wire_bytes = len(resp.get_data())
+            cpu_ms = (time.process_time() - start) * 1000 / requests_per_variant
+            if encoding == "identity":
+                baseline_cpu = cpu_ms
+            results.append(
+                {
+                    "path": path,
+                    "encoding": encoding,
+                    "level": level,
+                    "bytes_on_wire": wire_bytes,
+                    "cpu_ms_per_request": round(cpu_ms, 3),
+                    "compression_cpu_ms": round(cpu_ms - (baseline_cpu or 0), 3),
+                }
+            )
+    app.wsgi_app = raw_wsgi
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--posts", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.posts), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
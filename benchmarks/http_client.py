@@ -0,0 +1,114 @@
+"""외부 API 클라이언트 벤치마크: 매번 새 연결 vs 연결 풀 vs 조건부 GET, 서킷 브레이커 동작.
+
+    python -m benchmarks.http_client --requests 200 --events 300
+"""
+import argparse
+import json
+import time
+
+import requests
+from flask import Flask
+
+from benchmarks.common import StubCTFtimeServer, fake_ctftime_events
+from config import Config
+from services import http_client
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(HTTP_BACKOFF_SECONDS=0.01, HTTP_BACKOFF_MAX_SECONDS=0.05, **config)
+    return app
+
+
+def _reset():
+    http_client._STATE["pid"] = None
+
+
+def _measure(label, server, call, count):
+    before = server.served["count"]
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    elapsed = time.perf_counter() - start
+    return {
+        "variant": label,
+        "requests": count,
+        "ms_per_request": round(elapsed * 1000 / count, 3),
+        "served": server.served["count"] - before,
+    }
+
+
+def run(count=200, events=300):
+    results = []
+    with StubCTFtimeServer(fake_ctftime_events(events)) as server:
+        url = server.url
+
+        def fresh():
+            # 기존 ctftime 구현: 매 호출 새 TCP 연결, 본문 전체 다운로드
+            requests.get(url, timeout=5).json()
+
+        connections = len(server.served["connections"])
+        results.append(_measure("fresh_connection", server, fresh, count))
+        results[-1]["connections"] = len(server.served["connections"]) - connections
+
+        app = _app()
+        with app.app_context():
+            _reset()
+            connections = len(server.served["connections"])
+            # 매번 다른 쿼리 -> 조건부 요청 없이 풀만 사용
+            counter = iter(range(10 ** 9))
+            results.append(
+                _measure(
+                    "pooled",
+                    server,
+                    lambda: http_client.get_json("bench", url, params={"n": next(counter)}),
+                    count,
+                )
+            )
+            results[-1]["connections"] = len(server.served["connections"]) - connections
+
+            not_modified = server.served["not_modified"]
+            results.append(
+                _measure("pooled_conditional", server, lambda: http_client.get_json("bench", url), count)
+            )
+            results[-1]["not_modified"] = server.served["not_modified"] - not_modified
+
+    # 서킷 브레이커: 업스트림이 계속 503 이면 threshold 회 실패 후에는 네트워크 없이 바로 실패한다
+    with StubCTFtimeServer(fail_status=503) as server:
+        app = _app(HTTP_RETRIES=1, HTTP_BREAKER_THRESHOLD=3, HTTP_BREAKER_RESET_SECONDS=60)
+        with app.app_context():
+            _reset()
+            outcomes = {"upstream_error": 0, "circuit_open": 0}
+            start = time.perf_counter()
+            for _ in range(20):
+                try:
+                    http_client.get_json("failing", server.url)
+                except http_client.CircuitOpenError:
+                    outcomes["circuit_open"] += 1
+                except http_client.UpstreamError:
+                    outcomes["upstream_error"] += 1
+            results.append(
+                {
+                    "variant": "circuit_breaker",
+                    "calls": 20,
+                    "served": server.served["count"],
+                    "ms_total": round((time.perf_counter() - start) * 1000, 3),
+                    "state": http_client.breaker("failing").state,
+                    **outcomes,
+                }
+            )
+    _reset()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--events", type=int, default=300)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.events), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
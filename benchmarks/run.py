@@ -0,0 +1,172 @@
+"""라우트 벤치마크: 처리량, p50/p95/p99 지연, 요청당 SQL 수를 JSON 으로 출력.
+
+    python -m benchmarks.run --requests 200 --users 2000 --output bench.json
+    python -m benchmarks.run --baseline bench.json   # 이전 커밋 결과와 비교
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import re
+import time
+
+from benchmarks.common import StubCTFtimeServer, build_app, clear_flashes, git_revision, login
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # nearest-rank
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _scenarios(app, rng):
+    from sqlalchemy import func
+
+    from extensions import db
+    from models.research import TeamApplication
+    from models.wargame import WargameChallenge
+    from services.datagen import flag_for
+
+    with app.app_context():
+        challenges = [
+            (challenge_id, flag_for(challenge_id))
+            for (challenge_id,) in db.session.query(WargameChallenge.id).filter(
+                WargameChallenge.author_name == "seed"
+            )
+        ]
+        busiest = (
+            db.session.query(TeamApplication.post_id)
+            .group_by(TeamApplication.post_id)
+            .order_by(func.count(TeamApplication.id).desc())
+            .first()
+        )
+    busiest_post = busiest[0] if busiest else 1
+
+    def attempt():
+        challenge_id, flag = rng.choice(challenges)
+        submitted = flag if rng.random() < 0.2 else f"FLAG{{guess_{rng.randint(0, 10 ** 6)}}}"
+        return {"data": {"challenge_id": challenge_id, "flag": submitted}}
+
+    return [
+        ("wargame_dashboard", "GET", "/wargame/", None, {}),
+        ("wargame_attempt", "POST", "/wargame/attempt", attempt, {}),
+        ("research", "GET", "/research", None, {}),
+        ("team_detail", "GET", f"/team/{busiest_post}", None, {}),
+        ("catalog", "GET", "/catalog", None, {}),
+        ("catalog_uncached", "GET", "/catalog", None, {"CTFTIME_CACHE_SECONDS": 0, "CATALOG_CACHE_SECONDS": 0}),
+        ("random_match", "POST", "/api/random-match", lambda: {"json": {"level": "중급"}}, {}),
+    ]
+
+
+def run_scenario(app, client, method, path, payload_factory, requests):
+    latencies, queries, statuses = [], [], {}
+    # 워밍업 (템플릿 컴파일, 커넥션 생성)
+    client.open(path, method=method, **(payload_factory() if payload_factory else {}))
+    for _ in range(requests):
+        kwargs = payload_factory() if payload_factory else {}
+        t0 = time.perf_counter()
+        resp = client.open(path, method=method, **kwargs)
+        resp.get_data()
+        latencies.append(time.perf_counter() - t0)
+        if resp.status_code in (301, 302, 303):
+            clear_flashes(client)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+        match = _QUERIES_RE.search(resp.headers.get("Server-Timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+    elapsed = sum(latencies)
+    latencies.sort()
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_queries": round(sum(queries) / len(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def run(requests=100, seed=42, scale=None, only=None):
+    rng = random.Random(seed)
+    with StubCTFtimeServer() as ctftime:
+        app = build_app(seed=seed, scale=scale, CTFTIME_API_URL=ctftime.url)
+        client = app.test_client()
+        login(app, client)
+        results = {}
+        for name, method, path, payload_factory, overrides in _scenarios(app, rng):
+            if only and name not in only:
+                continue
+            previous = {key: app.config.get(key) for key in overrides}
+            app.config.update(overrides)
+            try:
+                results[name] = run_scenario(app, client, method, path, payload_factory, requests)
+            finally:
+                app.config.update(previous)
+        upstream_requests = ctftime.served["count"]
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "scale": scale or {},
+        "ctftime_upstream_requests": upstream_requests,
+        "results": results,
+    }
+
+
+def compare(current, baseline):
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        rows.append(
+            {
+                "scenario": name,
+                "p95_ms": [before["p95_ms"], result["p95_ms"]],
+                "throughput_rps": [before["throughput_rps"], result["throughput_rps"]],
+                "mean_queries": [before["mean_queries"], result["mean_queries"]],
+            }
+        )
+    return {"baseline": baseline.get("revision"), "current": current.get("revision"), "diff": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--challenges", type=int)
+    parser.add_argument("--attempts", type=int)
+    parser.add_argument("--competitions", type=int)
+    parser.add_argument("--posts", type=int)
+    parser.add_argument("--applications", type=int)
+    parser.add_argument("--only", nargs="*", help="실행할 시나리오 이름")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    scale = {
+        key: getattr(args, key)
+        for key in ("users", "challenges", "attempts", "competitions", "posts", "applications")
+        if getattr(args, key) is not None
+    }
+    report = run(args.requests, args.seed, scale, args.only)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            report["comparison"] = compare(report, json.load(fh))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
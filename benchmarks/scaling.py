@@ -0,0 +1,191 @@
+"""수평 확장 벤치마크: 복제본 수(N)별 처리량과 확장 효율, 드레인 중 오류.
+
+    python -m benchmarks.scaling --replicas 1 --replicas 2 --replicas 3 --seconds 10
+    python -m benchmarks.scaling --url http://localhost:8080 --seconds 30   # compose scale 프로필의 nginx
+
+로컬 모드는 gunicorn 복제본(각각 sync 워커 1개)을 N 개 띄우고 같은 sqlite DB 와 SHARED_STATE_DIR 를 나눠 쓴다.
+클라이언트가 /readyz 를 보고 준비된 복제본에만 라운드로빈으로 보낸다 (nginx 대신).
+efficiency = rps(N) / (N * rps(1)). 복제본마다 CPU 코어가 따로 있어야 1 에 가깝게 나온다 (cpu_count 를 함께 기록).
+--drain 이면 측정 중간에 복제본 하나에 SIGTERM 을 보내고, 그동안 실패한 요청 수를 센다 (0 이어야 한다).
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.common import ROOT, git_revision
+from benchmarks.startup import PATHS, _free_port, _prepare, _session_cookie, _wait_for_port
+
+SECRET_KEY = "scaling-benchmark"
+
+
+def _ready(base):
+    try:
+        with urllib.request.urlopen(base + "/readyz", timeout=2) as resp:
+            return resp.status == 200
+    except (OSError, urllib.error.HTTPError):
+        return False
+
+
+class _Balancer:
+    # 준비된 복제본만 돌아가며 고른다. 0.2초마다 /readyz 를 다시 본다.
+    def __init__(self, bases):
+        self.bases = bases
+        self.ready = list(bases)
+        self._cycle = itertools.cycle(self.ready)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def _poll(self):
+        while not self._stop.wait(0.2):
+            ready = [base for base in self.bases if _ready(base)]
+            with self._lock:
+                # 모두 빠지면 이전 목록을 유지한다 (요청은 실패로 센다)
+                if ready and ready != self.ready:
+                    self.ready = ready
+                    self._cycle = itertools.cycle(ready)
+
+    def next(self):
+        with self._lock:
+            return next(self._cycle)
+
+    def close(self):
+        self._stop.set()
+
+
+def _load(pick, cookie, seconds, concurrency):
+    counts = {"ok": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def _client(offset):
+        paths = itertools.cycle(PATHS[offset % len(PATHS):] + PATHS[:offset % len(PATHS)])
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(pick() + next(paths), headers={"Cookie": cookie})
+            try:
+                with urllib.request.urlopen(request, timeout=30) as resp:
+                    resp.read()
+                key = "ok"
+            except (OSError, urllib.error.HTTPError):
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=_client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {**counts, "rps": round(counts["ok"] / elapsed, 1)}
+
+
+def _start_replicas(count, database_url, shared_dir, bytecode_dir, drain_seconds):
+    env = os.environ.copy()
+    env.update(
+        DATABASE_URL=database_url,
+        SHARED_STATE_DIR=shared_dir,
+        JINJA_BYTECODE_CACHE_DIR=bytecode_dir,
+        GUNICORN_WORKER_CLASS="sync",
+        SECRET_KEY=SECRET_KEY,
+        DRAIN_SECONDS=str(drain_seconds),
+    )
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    replicas = []
+    for _ in range(count):
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", "1", "app:create_app()"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        replicas.append((proc, f"http://127.0.0.1:{port}", port))
+    for _, base, port in replicas:
+        _wait_for_port(port, time.perf_counter() + 60)
+        while not _ready(base):
+            time.sleep(0.1)
+    return replicas
+
+
+def _stop_replicas(replicas):
+    for proc, _, _ in replicas:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGTERM)
+    for proc, _, _ in replicas:
+        proc.wait(timeout=60)
+
+
+def run_local(replica_counts, seconds=10, concurrency_per_replica=4, drain=False, drain_seconds=2):
+    folder = tempfile.mkdtemp(prefix="scaling-bench-")
+    database_url = "sqlite:///" + os.path.join(folder, "bench.db")
+    bytecode_dir = os.path.join(folder, "jinja_cache")
+    cookie = _session_cookie(SECRET_KEY)
+    results = []
+    try:
+        _prepare(database_url, bytecode_dir)
+        for count in replica_counts:
+            shared_dir = os.path.join(folder, f"shared-{count}")
+            replicas = _start_replicas(count, database_url, shared_dir, bytecode_dir, drain_seconds)
+            balancer = _Balancer([base for _, base, _ in replicas])
+            try:
+                if drain and count > 1:
+                    # 측정 중간에 복제본 하나를 내린다: 드레인 동안 /readyz 503 -> 빠진 뒤 종료
+                    timer = threading.Timer(seconds / 3, replicas[0][0].send_signal, args=(signal.SIGTERM,))
+                    timer.start()
+                result = _load(balancer.next, cookie, seconds, concurrency_per_replica * count)
+            finally:
+                balancer.close()
+                _stop_replicas(replicas)
+            results.append({"replicas": count, "drained": bool(drain and count > 1), **result})
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    base = next((item["rps"] for item in results if item["replicas"] == 1), None)
+    for item in results:
+        if base:
+            item["efficiency"] = round(item["rps"] / (item["replicas"] * base), 2)
+    return {"revision": git_revision(), "cpu_count": os.cpu_count(), "seconds": seconds, "results": results}
+
+
+def run_url(url, secret_key, seconds=10, concurrency=16):
+    # 외부 로드밸런서: 세션 쿠키는 대상 서버의 SECRET_KEY 로 서명해야 로그인 상태가 된다
+    cookie = _session_cookie(secret_key)
+    base = url.rstrip("/")
+    return {"revision": git_revision(), "url": base, "seconds": seconds, **_load(lambda: base, cookie, seconds, concurrency)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, action="append", help="여러 번 지정 가능 (기본 1, 2, 3)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=4, help="복제본당 동시 요청 수 (--url 이면 전체)")
+    parser.add_argument("--drain", action="store_true", help="측정 중 복제본 하나에 SIGTERM")
+    parser.add_argument("--drain-seconds", type=int, default=2)
+    parser.add_argument("--url", help="로컬 복제본 대신 이 주소(로드밸런서)로 부하")
+    parser.add_argument("--secret-key", help="--url 대상의 SECRET_KEY (기본: 환경변수 SECRET_KEY)")
+    args = parser.parse_args()
+    if args.url:
+        secret_key = args.secret_key or os.environ.get("SECRET_KEY")
+        if not secret_key:
+            parser.error("--url 에는 --secret-key 또는 SECRET_KEY 환경변수가 필요합니다")
+        result = run_url(args.url, secret_key, args.seconds, args.concurrency)
+    else:
+        result = run_local(args.replicas or [1, 2, 3], args.seconds, args.concurrency, args.drain, args.drain_seconds)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
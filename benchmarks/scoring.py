@@ -0,0 +1,76 @@
+"""동적 점수 벤치마크: 풀이당 증분 갱신 vs 전체 재계산 (기본 사용자 10k).
+
+    python -m benchmarks.scoring --users 10000 --solves 500
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import build_app
+from benchmarks.run import percentile
+
+
+def run(users=10000, challenges=200, attempts=100000, solves=500, seed=42):
+    from extensions import db
+    from models.wargame import WargameChallenge, WargameSolve
+    from models.user import User
+    from services import scoring
+
+    app = build_app(
+        seed=seed,
+        scale={"users": users, "challenges": challenges, "attempts": attempts, "posts": 0, "applications": 0},
+    )
+    rng = random.Random(seed)
+    with app.app_context():
+        user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+        challenge_ids = [challenge_id for (challenge_id,) in db.session.query(WargameChallenge.id)]
+        solved = set(db.session.query(WargameSolve.user_id, WargameSolve.challenge_id))
+
+        latencies = []
+        while len(latencies) < solves:
+            pair = (rng.choice(user_ids), rng.choice(challenge_ids))
+            if pair in solved:
+                continue
+            solved.add(pair)
+            started = time.perf_counter()
+            scoring.record_solve(pair[1], pair[0])
+            latencies.append(time.perf_counter() - started)
+
+        mismatches = scoring.verify()
+        started = time.perf_counter()
+        scoring.recompute_all()
+        recompute_seconds = time.perf_counter() - started
+
+    latencies.sort()
+    mean = sum(latencies) / len(latencies)
+    return {
+        "users": users,
+        "challenges": challenges,
+        "solves": solves,
+        "incremental": {
+            "mean_ms": round(mean * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        },
+        "full_recompute_ms": round(recompute_seconds * 1000, 3),
+        # 풀이마다 전체를 다시 계산했다면 걸렸을 시간 대비 배율
+        "speedup": round(recompute_seconds / mean, 1) if mean else None,
+        "mismatches_after_incremental": len(mismatches),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--challenges", type=int, default=200)
+    parser.add_argument("--attempts", type=int, default=100000)
+    parser.add_argument("--solves", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(run(args.users, args.challenges, args.attempts, args.solves, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
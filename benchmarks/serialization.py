@@ -0,0 +1,179 @@
+"""직렬화 벤치마크: ORM 전체 로드 + 행마다 dict vs 컬럼 로드 + slots 뷰 모델 (기본 10k 행).
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import build_app
+
+
+def _measure(label, build, repeat=3):
+    # 시간은 repeat 회 중 최솟값, 메모리는 결과 목록이 살아 있는 동안의 tracemalloc 피크
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "variant": label,
+        "rows": len(result),
+        "ms": round(best * 1000, 2),
+        "us_per_row": round(best * 1e6 / max(1, len(result)), 2),
+        "retained_kib": round(current / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _legacy_post(post):
+    # 변경 전 _serialize_post: 관계를 따라가며 행마다 태그/날짜를 다시 파싱
+    from routes.research import _coerce_date, d_day_badge
+
+    def tags(raw):
+        return [tag.strip() for tag in raw.split(",") if tag.strip()] if raw else []
+
+    def period(start, end):
+        s = _coerce_date.__wrapped__(start)
+        e = _coerce_date.__wrapped__(end)
+        s = s.strftime("%m/%d %H:%M") if s else ""
+        e = e.strftime("%m/%d %H:%M") if e else ""
+        return f"{s} - {e}" if s and e else s or e or "상시"
+
+    competition = post.competition
+    event_start = post.event_start or (competition.event_start if competition else None)
+    event_end = post.event_end or (competition.event_end if competition else None)
+    return {
+        "id": post.id,
+        "title": post.title,
+        "owner": post.owner,
+        "summary": post.summary,
+        "requirements": post.requirements,
+        "tags": tags(post.tags),
+        "team_size": post.team_size,
+        "level": post.level,
+        "use_random_matching": post.use_random_matching,
+        "phase": post.phase,
+        "created_at": post.created_at,
+        "applicant_count": len(post.applications or []),
+        "competition_title": competition.title if competition else post.custom_competition,
+        "competition_organizer": competition.organizer if competition else None,
+        "competition_summary": competition.summary if competition else None,
+        "competition_mode": competition.mode if competition else None,
+        "competition_tags": tags(competition.tags) if competition else [],
+        "competition_difficulty": competition.difficulty if competition else None,
+        "apply_period": period(competition.apply_start, competition.apply_end) if competition else "상시",
+        "event_period": period(event_start, event_end),
+        "apply_badge": d_day_badge(competition.apply_end) if competition else "",
+        "event_badge": d_day_badge(event_start),
+        "has_applied": False,
+    }
+
+
+def run(rows=10000, seed=42):
+    from flask import json as flask_json
+    from sqlalchemy.orm import joinedload
+
+    from extensions import db
+    from models.research import TeamPost
+    from models.wargame import WargameChallenge
+    from routes.research import fetch_team_posts
+    from routes.wargame import CHALLENGE_COLUMNS, _serialize_challenge
+    from services import views
+
+    app = build_app(
+        seed=seed,
+        scale={
+            "users": 100,
+            "challenges": rows,
+            "attempts": 0,
+            "posts": rows,
+            "applications": rows * 2,
+        },
+    )
+    results = []
+    with app.app_context():
+
+        def legacy_challenges():
+            db.session.expire_all()
+            items = []
+            for challenge in WargameChallenge.query.all():
+                items.append(
+                    {
+                        "id": challenge.id,
+                        "title": challenge.title,
+                        "summary": challenge.summary,
+                        "difficulty": challenge.difficulty,
+                        "category": challenge.category,
+                        "hint": challenge.hint,
+                        "reward_points": challenge.reward_points,
+                        "is_community": challenge.is_community,
+                        "author_name": challenge.author_name or "익명",
+                        "created_at": challenge.created_at,
+                        "solved_count": challenge.solve_count or 0,
+                        "calibration": None,
+                        "attachment_path": challenge.attachment_path,
+                    }
+                )
+            db.session.expunge_all()
+            return items
+
+        def view_challenges():
+            return [_serialize_challenge(row) for row in db.session.query(*CHALLENGE_COLUMNS)]
+
+        def legacy_posts():
+            db.session.expire_all()
+            posts = TeamPost.query.options(
+                joinedload(TeamPost.competition), joinedload(TeamPost.applications)
+            ).order_by(TeamPost.created_at.desc())
+            items = [_legacy_post(post) for post in posts.all()]
+            db.session.expunge_all()
+            return items
+
+        def view_posts():
+            return fetch_team_posts(current_user_id=1)
+
+        results.append(_measure("challenges_orm_dict", legacy_challenges))
+        results.append(_measure("challenges_columns_view", view_challenges))
+        results.append(_measure("posts_orm_dict", legacy_posts))
+        results.append(_measure("posts_columns_view", view_posts))
+
+        # JSON: 표준 json(기본 provider) vs FastJSONProvider (orjson 이 있으면 orjson)
+        challenges = view_challenges()
+        payload = {"items": [views.as_dict(item) for item in challenges]}
+        standard = flask_json.provider.DefaultJSONProvider(app)
+        fast = views.FastJSONProvider(app)
+        for label, provider, body in (
+            ("json_stdlib_dicts", standard, payload),
+            ("json_fast_views", fast, {"items": challenges}),
+        ):
+            started = time.perf_counter()
+            encoded = provider.dumps(body)
+            results.append(
+                {
+                    "variant": label,
+                    "rows": len(challenges),
+                    "ms": round((time.perf_counter() - started) * 1000, 2),
+                    "bytes": len(encoded),
+                    "orjson": views.orjson is not None and provider is fast,
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
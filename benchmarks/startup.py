@@ -0,0 +1,163 @@
+"""기동 벤치마크: gunicorn 을 띄운 순간부터 첫 응답까지(TTFR)와 경로별 첫 요청 지연.
+
+    python -m benchmarks.startup --repeat 3 --workers 1
+
+변형
+    cold      바이트코드 캐시/워밍업/preload 없음 (첫 요청이 스키마 확인, 시드, 템플릿 컴파일을 떠안음)
+    bytecode  빌드 때 채운 Jinja 바이트코드 캐시만
+    warmup    바이트코드 캐시 + 워커별 워밍업
+    preload   바이트코드 캐시 + preload_app (마스터에서 한 번 워밍업 후 fork)
+after_restart_ms 는 워커를 죽인 직후 경로별 요청 시간 (preload 면 fork 만 하면 되므로 짧다).
+지연 import(numpy/scipy, requests) 효과는 변형으로 끌 수 없으므로 이전 커밋과 비교한다.
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.common import ROOT, git_revision
+
+SECRET_KEY = "startup-benchmark"
+PATHS = ["/wargame/", "/research", "/team/1"]
+VARIANTS = {
+    "cold": {"GUNICORN_PRELOAD": "0", "STARTUP_WARMUP": "0", "JINJA_BYTECODE_CACHE_DIR": ""},
+    "bytecode": {"GUNICORN_PRELOAD": "0", "STARTUP_WARMUP": "0"},
+    "warmup": {"GUNICORN_PRELOAD": "0", "STARTUP_WARMUP": "1"},
+    "preload": {"GUNICORN_PRELOAD": "1", "STARTUP_WARMUP": "1"},
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _session_cookie(secret_key, user_id=1):
+    # 로그인 상태로 측정 (익명이면 대부분 로그인 페이지로 리다이렉트된다)
+    from flask import Flask
+    from flask.sessions import SecureCookieSessionInterface
+
+    app = Flask(__name__)
+    app.secret_key = secret_key
+    return "session=" + SecureCookieSessionInterface().get_signing_serializer(app).dumps({"user_id": user_id})
+
+
+def _get(url, cookie, timeout=30):
+    started = time.perf_counter()
+    request = urllib.request.Request(url, headers={"Cookie": cookie})
+    with urllib.request.urlopen(request, timeout=timeout) as resp:
+        resp.read()
+    return (time.perf_counter() - started) * 1000
+
+
+def _wait_for_port(port, deadline):
+    # 마스터가 소켓을 열기만 하면 요청은 backlog 에서 워커를 기다린다
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.005)
+    raise RuntimeError("gunicorn did not bind in time")
+
+
+def _worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as fh:
+        return [int(pid) for pid in fh.read().split()]
+
+
+def _prepare(database_url, bytecode_dir):
+    # 스키마/데이터는 미리 만들고, 워밍업 대상(인덱스, 단계 집계, 시드)은 첫 요청/워밍업에 남겨 둔다.
+    # Config 는 import 시점에 DATABASE_URL 을 읽으므로 DB 마다 별도 프로세스에서 만든다.
+    env = os.environ.copy()
+    env.update(DATABASE_URL=database_url, JINJA_BYTECODE_CACHE_DIR=bytecode_dir)
+    for command in (["perf", "seed", "--users", "200", "--attempts", "2000"], ["startup", "compile-templates"]):
+        subprocess.run(
+            [sys.executable, "-m", "flask", "--app", "app:create_app", *command],
+            cwd=ROOT,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+
+def _run_once(name, overrides, database_url, bytecode_dir, workers, steady):
+    port = _free_port()
+    env = os.environ.copy()
+    env.update(
+        DATABASE_URL=database_url,
+        JINJA_BYTECODE_CACHE_DIR=bytecode_dir,
+        GUNICORN_WORKER_CLASS="sync",
+        SECRET_KEY=SECRET_KEY,
+    )
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    env.update(overrides)
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", str(workers), "app:create_app()"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, started + 60)
+        base = f"http://127.0.0.1:{port}"
+        cookie = _session_cookie(SECRET_KEY)
+        first = {}
+        for path in PATHS:
+            first[path] = round(_get(base + path, cookie), 2)
+            if path == PATHS[0]:
+                ttfr = round((time.perf_counter() - started) * 1000, 2)
+        after = {path: round(statistics.median(_get(base + path, cookie) for _ in range(steady)), 2) for path in PATHS}
+        # 워커 재시작 (배포/max_requests/크래시): 워커를 죽이고 바로 보낸 요청이 끝날 때까지
+        for pid in _worker_pids(proc.pid):
+            os.kill(pid, signal.SIGKILL)
+        restart = {path: round(_get(base + path, cookie), 2) for path in PATHS}
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+    return {"variant": name, "ttfr_ms": ttfr, "first_ms": first, "steady_ms": after, "after_restart_ms": restart}
+
+
+def run(repeat=3, workers=1, steady=10, variants=None):
+    folder = tempfile.mkdtemp(prefix="startup-bench-")
+    bytecode_dir = os.path.join(folder, "jinja_cache")
+    results = []
+    try:
+        for name in variants or VARIANTS:
+            runs = []
+            for _ in range(repeat):
+                # 변형마다 새 DB: 첫 요청의 스키마/시드 작업이 매번 같은 조건에서 일어나도록
+                database_url = "sqlite:///" + os.path.join(folder, f"{name}-{len(runs)}.db")
+                _prepare(database_url, bytecode_dir)
+                runs.append(_run_once(name, VARIANTS[name], database_url, bytecode_dir, workers, steady))
+            best = min(runs, key=lambda item: item["ttfr_ms"])
+            best["ttfr_ms_runs"] = [item["ttfr_ms"] for item in runs]
+            results.append(best)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return {"revision": git_revision(), "workers": workers, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--steady", type=int, default=10, help="첫 요청 이후 경로별 측정 횟수 (중앙값)")
+    parser.add_argument("--variant", action="append", choices=list(VARIANTS))
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat, args.workers, args.steady, args.variant), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,14 @@ from urllib.parse import quote_plus
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
+# 복제본끼리 공유하는 파일 상태(캐시 스탬프, 실시간 피드, 제출 제한)의 기본 위치
+SHARED_STATE_DIR = os.environ.get("SHARED_STATE_DIR", os.path.join(BASE_DIR, "instance"))
 
 
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or os.urandom(32)
+    # 미설정이면 프로세스마다 다른 키 -> 복제본끼리 세션 쿠키가 통하지 않는다 (/readyz 에서 확인)
+    SECRET_KEY_GENERATED = not os.environ.get("SECRET_KEY")
 
     DB_USER = os.environ.get("DB_USER", "huser")
     DB_PASSWORD = os.environ.get("DB_PASSWORD", "hs1234!!")
@@ -48,10 +52,132 @@ class Config:
         "pdf",
         "md",
     }
+    ASSET_BUILD_DIR = os.path.join(BASE_DIR, "static", "dist")
+    ASSET_PATTERNS = ("css/*.css",)
+    ASSET_MAX_AGE = 60 * 60 * 24 * 365  # 1 year, fingerprint 파일명이므로 immutable
+
+    # FLAG 는 salted 해시로 저장 (models.wargame.hash_flag)
+    WARGAME_FLAG_HASH_METHOD = os.environ.get("WARGAME_FLAG_HASH_METHOD", "pbkdf2:sha256:1000")
+
+    # 동적 점수: 난이도별 시작 점수 → WARGAME_SCORE_DECAY 명 풀이 시 시작 점수 × MINIMUM_RATIO 까지 감소
+    WARGAME_DIFFICULTY_POINTS = {"초급": 50, "중급": 120, "고급": 200}
+    WARGAME_SCORE_DECAY = int(os.environ.get("WARGAME_SCORE_DECAY", 30))
+    WARGAME_SCORE_MINIMUM_RATIO = float(os.environ.get("WARGAME_SCORE_MINIMUM_RATIO", 0.2))
+
+    # 추천 문제 (flask wargame refresh-recommendations)
+    RECOMMENDATION_TOP_K = int(os.environ.get("RECOMMENDATION_TOP_K", 5))
+    RECOMMENDATION_PROGRESS_SOLVES = int(os.environ.get("RECOMMENDATION_PROGRESS_SOLVES", 3))
+
+    # 풀이 분석 (flask wargame analyze-solves): 이 인원 이상 시도한 문제만 체감 난이도 산정
+    ANALYTICS_MIN_USERS = int(os.environ.get("ANALYTICS_MIN_USERS", 10))
+    CACHE_STAMP_DIR = os.environ.get("CACHE_STAMP_DIR", os.path.join(SHARED_STATE_DIR, "cache_stamps"))
+
+    # 오답 제출 write-behind: 버퍼에 모았다가 배치 INSERT (정답은 즉시 커밋)
+    ATTEMPT_WRITE_BEHIND = os.environ.get("ATTEMPT_WRITE_BEHIND", "1") != "0"
+    ATTEMPT_BATCH_SIZE = int(os.environ.get("ATTEMPT_BATCH_SIZE", 200))
+    ATTEMPT_FLUSH_SECONDS = float(os.environ.get("ATTEMPT_FLUSH_SECONDS", 2.0))
+    ATTEMPT_SPOOL_DIR = os.environ.get("ATTEMPT_SPOOL_DIR", os.path.join(BASE_DIR, "instance", "attempt_spool"))
+    ATTEMPT_SPOOL_FSYNC = os.environ.get("ATTEMPT_SPOOL_FSYNC", "0") == "1"
+
+    # 보존 기간이 지난 오답 시도는 일별 롤업으로 압축하고 원본은 gzip NDJSON 으로 보관
+    ATTEMPT_RETENTION_DAYS = int(os.environ.get("ATTEMPT_RETENTION_DAYS", 30))
+    ATTEMPT_ARCHIVE_DIR = os.environ.get("ATTEMPT_ARCHIVE_DIR", os.path.join(BASE_DIR, "instance", "attempt_archive"))
+    ATTEMPT_COMPACT_BATCH = int(os.environ.get("ATTEMPT_COMPACT_BATCH", 5000))
+
+    # 플래그 제출 제한 (services/submission_throttle.py). 분당 허용량과 순간 허용량(burst)
+    SUBMIT_THROTTLE_ENABLED = os.environ.get("SUBMIT_THROTTLE_ENABLED", "1") != "0"
+    SUBMIT_THROTTLE_BACKEND = os.environ.get("SUBMIT_THROTTLE_BACKEND", "shared")  # shared | memory | redis
+    SUBMIT_THROTTLE_PATH = os.environ.get(
+        "SUBMIT_THROTTLE_PATH", os.path.join(SHARED_STATE_DIR, "submit_throttle.bin")
+    )
+    SUBMIT_THROTTLE_SLOTS = int(os.environ.get("SUBMIT_THROTTLE_SLOTS", 65536))  # 24바이트/슬롯
+    SUBMIT_CHALLENGE_BURST = int(os.environ.get("SUBMIT_CHALLENGE_BURST", 5))
+    SUBMIT_CHALLENGE_PER_MINUTE = float(os.environ.get("SUBMIT_CHALLENGE_PER_MINUTE", 10))
+    SUBMIT_USER_BURST = int(os.environ.get("SUBMIT_USER_BURST", 20))
+    SUBMIT_USER_PER_MINUTE = float(os.environ.get("SUBMIT_USER_PER_MINUTE", 60))
+    SUBMIT_DEDUPE_SECONDS = int(os.environ.get("SUBMIT_DEDUPE_SECONDS", 600))  # 같은 오답 재기록 안 함
+
+    # /wargame/stream 실시간 피드 (SSE). 워커 간 전파는 LIVE_FEED_DIR 의 공유 이벤트 로그
+    LIVE_FEED_DIR = os.environ.get("LIVE_FEED_DIR", os.path.join(SHARED_STATE_DIR, "live_feed"))
+    LIVE_FEED_POLL_SECONDS = float(os.environ.get("LIVE_FEED_POLL_SECONDS", 0.5))
+    LIVE_FEED_HEARTBEAT_SECONDS = float(os.environ.get("LIVE_FEED_HEARTBEAT_SECONDS", 20))
+    LIVE_FEED_MAX_CLIENTS = int(os.environ.get("LIVE_FEED_MAX_CLIENTS", 5000))  # 워커당
+    LIVE_FEED_MAX_PENDING = int(os.environ.get("LIVE_FEED_MAX_PENDING", 50))
+    LIVE_FEED_MAX_BYTES = int(os.environ.get("LIVE_FEED_MAX_BYTES", 1024 * 1024))
+
     MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 8 * 1024 * 1024))
 
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1") != "0"
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 4))  # brotli 0-11
+    COMPRESS_MIN_SIZE = 500
+
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+    METRICS_SERVER_TIMING = True
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")  # 설정 시 /metrics 에 Bearer 토큰 필요
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")  # /admin/* 관리 API (미설정 시 비활성)
+    # 수평 확장 (services/shared_state.py, services/health.py)
+    SHARED_STATE_DIR = SHARED_STATE_DIR
+    REDIS_URL = os.environ.get("REDIS_URL")  # 호스트가 여러 대일 때 캐시 버전/제출 제한 공유
+    REDIS_TIMEOUT = float(os.environ.get("REDIS_TIMEOUT", 0.5))
+    CACHE_BUS_BACKEND = os.environ.get("CACHE_BUS_BACKEND", "file")  # file | redis
+    CACHE_BUS_REDIS_TTL = float(os.environ.get("CACHE_BUS_REDIS_TTL", 0.5))
+    RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "memory://")  # 예: redis://redis:6379/0
+    DRAIN_SECONDS = float(os.environ.get("DRAIN_SECONDS", 10))  # SIGTERM 후 /readyz 503 으로 버티는 시간
+    # 워커 기동 최적화 (services/startup.py). 빈 값이면 바이트코드 캐시를 쓰지 않는다
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get(
+        "JINJA_BYTECODE_CACHE_DIR", os.path.join(BASE_DIR, "instance", "jinja_cache")
+    )
+    STARTUP_WARMUP = os.environ.get("STARTUP_WARMUP", "1") != "0"
+    # 운영 프로파일링 (services/profiling.py). ADMIN_TOKEN 으로 서명한 토큰이 있어야 동작
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BASE_DIR, "instance", "profiles"))
+    PROFILE_TOKEN_TTL = int(os.environ.get("PROFILE_TOKEN_TTL", 900))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", 5))
+    PROFILE_MAX_SAMPLE_SECONDS = int(os.environ.get("PROFILE_MAX_SAMPLE_SECONDS", 120))
+    PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 50))  # 보관할 요청 프로파일 수
+    PROFILE_SAMPLER_ENABLED = os.environ.get("PROFILE_SAMPLER_ENABLED", "1") != "0"
+    PROFILE_SAMPLER_POLL_SECONDS = float(os.environ.get("PROFILE_SAMPLER_POLL_SECONDS", 1))
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+    # @query_budget: 같은 SQL 이 이 횟수를 넘게 반복되면 N+1 로 판단 (TESTING 에서는 예외)
+    NPLUSONE_THRESHOLD = 3
+
     CTFTIME_API_URL = "https://ctftime.org/api/v1/events/"
     CTFTIME_CACHE_SECONDS = 900
     CTFTIME_LOOKAHEAD_SECONDS = 60 * 60 * 24 * 90  # 90 days
     CTFTIME_TIMEOUT = 10
     CTFTIME_USER_AGENT = "HSpaceCatalog/1.0"
+
+    # 대회 카탈로그 소스 (services/event_sources.py, services/catalog.py)
+    CATALOG_SOURCES = os.environ.get("CATALOG_SOURCES", "ctftime,competitions")
+    CATALOG_FEEDS = os.environ.get("CATALOG_FEEDS", "")  # 쉼표 구분 JSON/ICS 경로 또는 URL
+    CATALOG_CACHE_SECONDS = int(os.environ.get("CATALOG_CACHE_SECONDS", 300))
+    CATALOG_SOURCE_TIMEOUT = float(os.environ.get("CATALOG_SOURCE_TIMEOUT", 5))
+    CATALOG_COLD_WAIT_SECONDS = float(os.environ.get("CATALOG_COLD_WAIT_SECONDS", 3))  # 첫 요청이 기다리는 최대 시간
+    CATALOG_WORKERS = int(os.environ.get("CATALOG_WORKERS", 4))
+    CATALOG_DEDUPE_THRESHOLD = float(os.environ.get("CATALOG_DEDUPE_THRESHOLD", 0.85))
+
+    # 외부 API 공용 HTTP 클라이언트 (services/http_client.py)
+    HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 4))  # 호스트별 풀 개수
+    HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 10))  # 호스트당 keep-alive 연결 수
+    HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 10))
+    HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+    HTTP_BACKOFF_SECONDS = float(os.environ.get("HTTP_BACKOFF_SECONDS", 0.5))
+    HTTP_BACKOFF_MAX_SECONDS = float(os.environ.get("HTTP_BACKOFF_MAX_SECONDS", 5))
+    HTTP_BREAKER_THRESHOLD = int(os.environ.get("HTTP_BREAKER_THRESHOLD", 5))  # 연속 실패 횟수
+    HTTP_BREAKER_RESET_SECONDS = float(os.environ.get("HTTP_BREAKER_RESET_SECONDS", 60))
+    HTTP_MAX_BYTES = int(os.environ.get("HTTP_MAX_BYTES", 8 * 1024 * 1024))
+
+    # 팀 리더 알림 (flask research send-notifications). 채널이 하나도 없으면 outbox 에 쌓아 둔다.
+    NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL")
+    NOTIFY_SMTP_HOST = os.environ.get("NOTIFY_SMTP_HOST")
+    NOTIFY_SMTP_PORT = int(os.environ.get("NOTIFY_SMTP_PORT", 25))
+    NOTIFY_MAIL_FROM = os.environ.get("NOTIFY_MAIL_FROM", "noreply@hspace.local")
+    NOTIFY_TIMEOUT = float(os.environ.get("NOTIFY_TIMEOUT", 5))
+    NOTIFY_DIGEST_SECONDS = int(os.environ.get("NOTIFY_DIGEST_SECONDS", 60))  # 리더별 묶음 대기 시간
+    NOTIFY_MAX_ATTEMPTS = int(os.environ.get("NOTIFY_MAX_ATTEMPTS", 8))
+    NOTIFY_BACKOFF_SECONDS = int(os.environ.get("NOTIFY_BACKOFF_SECONDS", 30))
+    NOTIFY_BACKOFF_MAX_SECONDS = int(os.environ.get("NOTIFY_BACKOFF_MAX_SECONDS", 3600))
+
+    # 배치 팀 매칭 (flask research match-teams)
+    MATCHING_MIN_SCORE = float(os.environ.get("MATCHING_MIN_SCORE", 0.3))
+    MATCHING_HUNGARIAN_MAX_CELLS = int(os.environ.get("MATCHING_HUNGARIAN_MAX_CELLS", 4_000_000))
@@ -1,6 +1,13 @@
 #!/bin/sh
 set -e
 
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  # 이전 실행의 워커별 메트릭 파일이 남아 있으면 합산 값이 틀어진다.
+  # 아래의 create_app / drain-attempts 도 메트릭 모듈을 import 하므로 가장 먼저 비우고 만든다.
+  rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+  mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 mkdir -p /app/static/uploads /app/static/wargame_attachments
 
 if [ "${DB_ENGINE:-sqlite}" = "mysql" ]; then
@@ -37,5 +44,11 @@ with app.app_context():
     db.create_all()
 PY
 
+echo "Draining attempt spool files left by previous workers..."
+flask --app app:create_app wargame drain-attempts
+
+echo "Backfilling solves/scores if this database predates dynamic scoring..."
+flask --app app:create_app wargame recompute-scores --if-needed
+
 echo "Starting server: $@"
 exec "$@"
@@ -0,0 +1,53 @@
+# gunicorn 은 작업 디렉터리의 gunicorn.conf.py 를 자동으로 읽는다.
+# CMD 의 -b / -w 옵션이 여기 설정보다 우선한다.
+import os
+
+# SSE(/wargame/stream) 유휴 연결을 워커 프로세스 하나가 수천 개씩 들고 있도록 gevent 워커를 쓴다.
+# sync 워커로 돌리면 연결 하나가 워커 하나를 통째로 점유한다.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 5000))
+
+# 마스터가 앱을 한 번 로드/워밍업한 뒤 fork 한다 (services/startup.py).
+# 워커 재시작이 import/스키마 확인 없이 끝나고, 읽기 전용 메모리는 워커끼리 공유된다.
+# fork 후 DB 연결 풀은 앱이 자식에서 정리한다. 코드 변경 반영은 HUP 대신 재시작으로.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# 종료 시 드레인 시간 + 진행 중 요청 마무리 시간. 이보다 오래 걸리는 워커는 마스터가 강제 종료한다.
+graceful_timeout = int(float(os.environ.get("DRAIN_SECONDS", 10))) + 30
+
+if preload_app and worker_class == "gevent":
+    # 앱 모듈을 마스터에서 import 하므로 gevent 패치가 그보다 먼저여야 한다
+    from gevent import monkey
+
+    monkey.patch_all()
+
+
+def _warm_up(app):
+    # STARTUP_WARMUP=0 이면 warm_up 이 아무것도 하지 않는다
+    from services.startup import warm_up
+
+    warm_up(app)
+
+
+def when_ready(server):
+    # preload 면 워커를 띄우기 전에 마스터에서 한 번 (결과가 fork 로 모든 워커에 공유된다)
+    if server.cfg.preload_app:
+        _warm_up(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    # preload 가 아니면 워커마다, 요청을 받기 전에
+    if not worker.cfg.preload_app:
+        _warm_up(worker.wsgi)
+    # SIGTERM 을 받으면 DRAIN_SECONDS 동안 /readyz 를 503 으로 두고 처리를 계속한 뒤 종료 (services/health.py)
+    from services.health import install_drain_handler
+
+    install_drain_handler(worker.wsgi.config["DRAIN_SECONDS"])
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 Prometheus 파일을 live 합산에서 제외한다.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
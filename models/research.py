@@ -7,7 +7,7 @@ class Competition(db.Model):
     __tablename__ = "competitions"
 
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=False, index=True)
     organizer = db.Column(db.String(255))
     apply_start = db.Column(db.String(32))
     apply_end = db.Column(db.String(32))
@@ -38,6 +38,9 @@ class TeamPost(db.Model):
     event_end = db.Column(db.String(32))
     title = db.Column(db.String(255), nullable=False)
     owner = db.Column(db.String(255))
+    # 지원 알림 수신자: 글을 쓴 사용자 + (선택) 알림 이메일
+    owner_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    notify_email = db.Column(db.String(255))
     summary = db.Column(db.Text)
     requirements = db.Column(db.Text)
     tags = db.Column(db.Text)
@@ -58,6 +61,11 @@ class TeamPost(db.Model):
 
 class TeamApplication(db.Model):
     __tablename__ = "team_applications"
+    __table_args__ = (
+        # 팀 페이지: 내 지원서 조회 / 지원자 목록 keyset 페이지
+        db.Index("ix_team_applications_post_user", "post_id", "user_id"),
+        db.Index("ix_team_applications_post_created", "post_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     post_id = db.Column(
@@ -75,3 +83,83 @@ class TeamApplication(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     post = db.relationship("TeamPost", back_populates="applications")
+
+
+# 단계별 모집글 수 (services/team_phases.py). 글 등록/단계 전환 때 같은 트랜잭션에서 증감한다.
+class TeamPhaseCount(db.Model):
+    __tablename__ = "team_phase_counts"
+
+    phase = db.Column(db.String(32), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# 팀 리더 알림 outbox (services/notifications.py).
+# 지원서와 같은 트랜잭션에서 쌓고, 별도 워커가 리더별 묶음(digest)으로 전송한다.
+class NotificationOutbox(db.Model):
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        db.Index("ix_notification_outbox_due", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    # 메시지별 멱등 키. 묶음 키(digest_key)는 처음 보낼 때 구성원의 키로 정해 커밋해 두고 재시도에도 그대로 쓴다.
+    idempotency_key = db.Column(db.String(64), nullable=False, unique=True)
+    leader_key = db.Column(db.String(64), nullable=False, index=True)
+    recipient_email = db.Column(db.String(255))
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    digest_key = db.Column(db.String(64))
+    sent_channels = db.Column(db.String(64))  # 이 묶음이 이미 성공한 채널 (쉼표 구분)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+
+# 배치 팀 매칭 (services/team_matching.py) 실행 기록과 결과
+class TeamMatchRun(db.Model):
+    __tablename__ = "team_match_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    method = db.Column(db.String(32), nullable=False)
+    applicants = db.Column(db.Integer, nullable=False, default=0)
+    posts = db.Column(db.Integer, nullable=False, default=0)
+    assigned = db.Column(db.Integer, nullable=False, default=0)
+    mean_score = db.Column(db.Float)
+    duration_ms = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    matches = db.relationship(
+        "TeamMatch",
+        back_populates="run",
+        cascade="all, delete-orphan",
+    )
+
+
+class TeamMatch(db.Model):
+    __tablename__ = "team_matches"
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(
+        db.Integer,
+        db.ForeignKey("team_match_runs.id"),
+        nullable=False,
+        index=True,
+    )
+    # 한 지원서는 한 번만 배정된다 (동시에 돈 배치가 겹쳐도 중복 배정 방지)
+    application_id = db.Column(
+        db.Integer,
+        db.ForeignKey("team_applications.id"),
+        nullable=False,
+        unique=True,
+    )
+    post_id = db.Column(db.Integer, db.ForeignKey("team_posts.id"), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    run = db.relationship("TeamMatchRun", back_populates="matches")
+    application = db.relationship("TeamApplication")
+    post = db.relationship("TeamPost")
@@ -0,0 +1,12 @@
+from extensions import db
+
+
+# flask import 실행 중 원본 id -> 새 id 매핑 (services/transfer.py).
+# 청크마다 필요한 FK 값만 IN 으로 조회하므로 임포트 크기와 무관하게 메모리가 일정하다. 실행이 끝나면 지운다.
+class TransferIdMap(db.Model):
+    __tablename__ = "transfer_id_map"
+
+    run_id = db.Column(db.String(32), primary_key=True)
+    table_name = db.Column(db.String(40), primary_key=True)
+    source_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    target_id = db.Column(db.Integer, nullable=False)
@@ -1,7 +1,26 @@
+import hmac
 from datetime import datetime
 
+from werkzeug.security import check_password_hash, generate_password_hash
+
 from extensions import db
 
+# 제출 판정이 핫패스라 반복 횟수를 낮게 잡은 salted pbkdf2 (약 0.5ms/회)
+DEFAULT_FLAG_HASH_METHOD = "pbkdf2:sha256:1000"
+_HASH_PREFIXES = ("pbkdf2:", "scrypt:")
+
+
+def is_flag_hashed(value):
+    return bool(value) and value.startswith(_HASH_PREFIXES)
+
+
+def hash_flag(flag, method=None):
+    return generate_password_hash(
+        flag.strip(),
+        method=method or DEFAULT_FLAG_HASH_METHOD,
+        salt_length=12,
+    )
+
 
 class WargameChallenge(db.Model):
     __tablename__ = "wargame_challenges"
@@ -13,7 +32,12 @@ class WargameChallenge(db.Model):
     category = db.Column(db.String(64), nullable=False, default="Misc")
     flag_answer = db.Column(db.String(255), nullable=False)
     hint = db.Column(db.String(255))
+    # 현재 점수 (동적 점수: 풀이 수에 따라 initial_points 에서 minimum_points 까지 감소)
     reward_points = db.Column(db.Integer, default=0)
+    initial_points = db.Column(db.Integer)
+    minimum_points = db.Column(db.Integer)
+    decay_solves = db.Column(db.Integer)
+    solve_count = db.Column(db.Integer, nullable=False, default=0)
     attachment_path = db.Column(db.String(255))
     is_community = db.Column(db.Boolean, default=False)
     author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -26,6 +50,21 @@ class WargameChallenge(db.Model):
         cascade="all, delete-orphan",
     )
 
+    def set_flag(self, flag, method=None):
+        self.flag_answer = hash_flag(flag, method)
+
+    def check_flag(self, flag):
+        return self.flag_matches(self.flag_answer, flag)
+
+    @staticmethod
+    def flag_matches(stored, flag):
+        if not stored or not flag:
+            return False
+        if not is_flag_hashed(stored):
+            # 마이그레이션 전 평문 값
+            return hmac.compare_digest(stored.encode(), flag.strip().encode())
+        return check_password_hash(stored, flag.strip())
+
 
 class WargameAttempt(db.Model):
     __tablename__ = "wargame_attempts"
@@ -44,3 +83,91 @@ class WargameAttempt(db.Model):
 
     challenge = db.relationship("WargameChallenge", back_populates="attempts")
     user = db.relationship("User")
+
+
+# 사용자별 첫 정답 (문제당 한 번만 점수에 반영)
+class WargameSolve(db.Model):
+    __tablename__ = "wargame_solves"
+    __table_args__ = (db.UniqueConstraint("challenge_id", "user_id", name="uq_wargame_solve"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    challenge_id = db.Column(
+        db.Integer,
+        db.ForeignKey("wargame_challenges.id"),
+        nullable=False,
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# 사용자 총점 캐시. 풀이가 생길 때 services/scoring.py 가 증분으로 갱신한다.
+class WargameUserScore(db.Model):
+    __tablename__ = "wargame_user_scores"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    points = db.Column(db.Integer, nullable=False, default=0, index=True)
+    solves = db.Column(db.Integer, nullable=False, default=0)
+    last_solve_at = db.Column(db.DateTime)
+
+    user = db.relationship("User")
+
+
+# 문제별 풀이 분석 요약 (services/solve_analytics.py 배치 결과)
+class WargameChallengeStats(db.Model):
+    __tablename__ = "wargame_challenge_stats"
+
+    challenge_id = db.Column(db.Integer, db.ForeignKey("wargame_challenges.id"), primary_key=True)
+    tried_users = db.Column(db.Integer, nullable=False, default=0)
+    solved_users = db.Column(db.Integer, nullable=False, default=0)
+    solve_rate = db.Column(db.Float)
+    attempts_p50 = db.Column(db.Float)
+    attempts_p90 = db.Column(db.Float)
+    solve_seconds_p50 = db.Column(db.Float)
+    solve_seconds_p90 = db.Column(db.Float)
+    # {"상위 10%": 0.8, ...} 사용자 등급별 풀이율
+    tier_solve_rates = db.Column(db.Text)
+    calibrated_difficulty = db.Column(db.String(32))
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# 사용자별 추천 문제 top-k 캐시 (services/recommendations.py 가 주기적으로 갱신).
+# user_id = 0 은 풀이 기록이 없는 사용자용 기본 추천.
+class WargameRecommendation(db.Model):
+    __tablename__ = "wargame_recommendations"
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    items = db.Column(db.Text, nullable=False, default="[]")
+    last_solve_id = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# 보존 기간이 지난 오답 시도를 압축해 둔 일별 카운터.
+# 통계는 "최근 raw 행 + 롤업 합계"로 계산한다 (services/attempt_rollup.py).
+class WargameUserDailyRollup(db.Model):
+    __tablename__ = "wargame_user_daily"
+    __table_args__ = (db.UniqueConstraint("user_id", "day", name="uq_wargame_user_daily"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    day = db.Column(db.Date, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+
+# 문제별 통계(시도한 사용자 수, 풀이까지 시도 수/시간)는 (문제, 사용자) 단위가 필요하므로
+# 압축된 오답 중 첫 정답 이전 것만 쌍별로 세고 가장 이른 시도 시각을 남긴다 (services/solve_analytics.py).
+class WargameChallengeUserRollup(db.Model):
+    __tablename__ = "wargame_challenge_user_rollup"
+    __table_args__ = (
+        db.UniqueConstraint("challenge_id", "user_id", name="uq_wargame_challenge_user_rollup"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    challenge_id = db.Column(
+        db.Integer,
+        db.ForeignKey("wargame_challenges.id"),
+        nullable=False,
+        index=True,
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    first_at = db.Column(db.DateTime)
@@ -0,0 +1,115 @@
+import glob
+import hmac
+import io
+import json
+import os
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request, send_from_directory, stream_with_context
+
+from extensions import csrf, db, limiter
+from services import profiling, transfer
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@admin_bp.before_request
+def _require_admin_token():
+    # ADMIN_TOKEN 이 없으면 관리 API 자체가 없는 것처럼 404
+    token = current_app.config.get("ADMIN_TOKEN")
+    supplied = request.headers.get("Authorization", "")
+    if not token or not hmac.compare_digest(supplied, f"Bearer {token}"):
+        abort(404)
+
+
+@admin_bp.route("/export/<table>")
+@limiter.exempt
+def export_table(table):
+    fmt = request.args.get("format", "ndjson")
+    include_secrets = request.args.get("include_password_hashes") == "1"
+    if table not in transfer.TABLES or fmt not in transfer.FORMATS:
+        abort(404)
+    lines = transfer.export_lines(table, fmt, include_secrets)
+    mimetype = "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+    resp = Response(stream_with_context(lines), mimetype=mimetype)
+    resp.headers["Content-Disposition"] = f"attachment; filename={table}.{fmt}"
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+@admin_bp.route("/import", methods=["POST"])
+@csrf.exempt
+@limiter.exempt
+def import_tables():
+    # multipart: 필드 이름 = 테이블, 파일 이름 확장자 = 형식 (users=@users.ndjson ...)
+    # 업로드 파일은 werkzeug 가 임시 파일로 받으므로 요청 크기와 무관하게 청크 단위로 읽는다.
+    uploads = [
+        (table, request.files[table])
+        for table in transfer.TABLES
+        if table in request.files
+    ]
+    if not uploads:
+        return jsonify({"error": f"가져올 파일이 없습니다 (필드: {', '.join(transfer.TABLES)})"}), 400
+    importer = transfer.Importer(request.args.get("chunk_size", 1000, type=int))
+    try:
+        for table, upload in uploads:
+            fmt = "csv" if (upload.filename or "").endswith(".csv") else "ndjson"
+            stream = io.TextIOWrapper(upload.stream, encoding="utf-8", newline="")
+            transfer.import_stream(table, stream, fmt, importer=importer)
+    except (ValueError, KeyError) as exc:
+        db.session.rollback()
+        return jsonify({"error": str(exc), "partial": importer.finish()}), 400
+    except Exception:
+        # IntegrityError 등: id 매핑과 파생 데이터는 정리하고 500 으로 넘긴다
+        db.session.rollback()
+        importer.finish()
+        raise
+    return jsonify(importer.finish())
+
+
+@admin_bp.route("/profile/token", methods=["POST"])
+@csrf.exempt
+@limiter.exempt
+def profile_token():
+    payload = request.get_json(silent=True) or {}
+    path = payload.get("path") or "*"
+    token = profiling.make_token(path, payload.get("ttl"))
+    return jsonify({"token": token, "path": path, "header": "X-Profile-Token"})
+
+
+@admin_bp.route("/profile/sample", methods=["POST"])
+@csrf.exempt
+@limiter.exempt
+def profile_sample():
+    sample = profiling.request_sample(
+        request.args.get("seconds", 10, type=float),
+        request.args.get("interval_ms", type=float),
+    )
+    return jsonify(sample), 202
+
+
+@admin_bp.route("/profile/sample/<sample_id>")
+@limiter.exempt
+def profile_sample_result(sample_id):
+    result = profiling.merge_samples(sample_id)
+    if result is None:
+        abort(404)
+    return jsonify(result)
+
+
+@admin_bp.route("/profiles")
+@limiter.exempt
+def list_profiles():
+    folder = current_app.config["PROFILE_DIR"]
+    reports = sorted(glob.glob(os.path.join(folder, "req-*.json")), key=os.path.getmtime, reverse=True)
+    items = []
+    for path in reports[:100]:
+        with open(path, encoding="utf-8") as fh:
+            report = json.load(fh)
+        items.append({key: report.get(key) for key in ("id", "mode", "method", "path", "status", "total_ms", "files")})
+    return jsonify({"items": items})
+
+
+@admin_bp.route("/profiles/<path:name>")
+@limiter.exempt
+def download_profile(name):
+    return send_from_directory(current_app.config["PROFILE_DIR"], name, as_attachment=True)
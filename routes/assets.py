@@ -0,0 +1,39 @@
+import mimetypes
+import os
+
+from flask import Blueprint, abort, current_app, request, send_from_directory
+
+from services.assets import MANIFEST_NAME
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+# 사전 압축된 형제 파일 (우선순위 순)
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+@assets_bp.route("/<path:filename>")
+def serve_asset(filename):
+    if filename == MANIFEST_NAME:
+        abort(404)
+    build_dir = current_app.config["ASSET_BUILD_DIR"]
+    if not os.path.isfile(os.path.join(build_dir, filename)):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    served_name, encoding = filename, None
+    for candidate, suffix in _PRECOMPRESSED:
+        if request.accept_encodings[candidate] and os.path.isfile(
+            os.path.join(build_dir, filename + suffix)
+        ):
+            served_name, encoding = filename + suffix, candidate
+            break
+
+    resp = send_from_directory(build_dir, served_name, mimetype=mimetype)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.cache_control.no_cache = None
+    resp.cache_control.public = True
+    resp.cache_control.max_age = current_app.config.get("ASSET_MAX_AGE", 31536000)
+    resp.cache_control.immutable = True
+    return resp
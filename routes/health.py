@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+
+from extensions import limiter
+from services import health
+
+health_bp = Blueprint("health", __name__)
+
+
+@health_bp.route("/healthz")
+@limiter.exempt
+def healthz():
+    # liveness: 외부 의존성은 보지 않는다 (드레인 중에도 200)
+    return jsonify({"status": "ok", "draining": health.is_draining()})
+
+
+@health_bp.route("/readyz")
+@limiter.exempt
+def readyz():
+    ready, body = health.readiness()
+    resp = jsonify(body)
+    resp.status_code = 200 if ready else 503
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
@@ -0,0 +1,20 @@
+import hmac
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from extensions import limiter
+from services.metrics import render_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics")
+@limiter.exempt
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        supplied = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(supplied, f"Bearer {token}"):
+            abort(404)
+    payload, content_type = render_metrics()
+    return Response(payload, content_type=content_type)
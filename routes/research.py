@@ -1,16 +1,25 @@
 import random
+import time
 from datetime import datetime, date
+from functools import lru_cache
 
-from flask import Blueprint, flash, get_flashed_messages, jsonify, redirect, render_template, request, url_for, g
-from sqlalchemy import func, inspect, text, or_
+import click
+
+from flask import Blueprint, abort, flash, get_flashed_messages, jsonify, redirect, render_template, request, url_for, g
+from sqlalchemy import exists, func, inspect, select, text, or_
 from sqlalchemy.exc import NoSuchTableError
 from sqlalchemy.orm import joinedload
 from extensions import csrf, db, limiter
 from models.research import Competition, TeamApplication, TeamPost
-from services.ctftime import fetch_ctftime_events, get_ctftime_event
+from services import catalog as event_catalog
+from services import competition_index, notification_sink, notifications, team_matching, team_phases
+from services.query_budget import query_budget
+from services.startup import on_warm_up
+from services.views import ApplicationView, PostView, parse_tags
 
 PHASE_TABS = ["전체", "모집 중", "진행중", "완료"]
 LEVELS = ["초급", "중급", "고급"]
+APPLICATIONS_PAGE_SIZE = 20
 
 research_bp = Blueprint("research", __name__)
 
@@ -18,6 +27,7 @@ research_bp = Blueprint("research", __name__)
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=4096)
 def _coerce_date(value):
     if isinstance(value, datetime):
         return value
@@ -55,6 +65,7 @@ def _normalize_datetime_str(value):
     return dt.replace(microsecond=0).isoformat()
 
 
+@lru_cache(maxsize=4096)
 def format_period(start, end):
     def _fmt(value):
         as_date = _coerce_date(value)
@@ -79,42 +90,12 @@ def d_day_badge(target):
     return f"{abs(delta)}일 경과"
 
 
-def parse_tags(raw):
-    if not raw:
-        return []
-    return [tag.strip() for tag in raw.split(",") if tag.strip()]
-
-
-def fetch_competitions(approved_only=True):
-    query = Competition.query
-    if approved_only:
-        query = query.filter(Competition.approved.is_(True))
-    competitions = []
-    for comp in query.order_by(Competition.created_at.desc()).all():
-        data = {
-            "id": comp.id,
-            "title": comp.title,
-            "organizer": comp.organizer,
-            "summary": comp.summary,
-            "mode": comp.mode,
-            "difficulty": comp.difficulty,
-            "cover_image": comp.cover_image,
-            "tags": parse_tags(comp.tags),
-            "apply_period": format_period(comp.apply_start, comp.apply_end),
-            "event_period": format_period(comp.event_start, comp.event_end),
-            "apply_badge": d_day_badge(comp.apply_end),
-            "event_badge": d_day_badge(comp.event_start or comp.event_end),
-            "approved": comp.approved,
-        }
-        competitions.append(data)
-    return competitions
-
-
 def _ensure_competition_from_event(event):
     title = event.get("title")
     if not title:
         return None
-    competition = Competition.query.filter_by(title=title).first()
+    competition_id = competition_index.resolve(title)
+    competition = db.session.get(Competition, competition_id) if competition_id else None
     start_str = _normalize_datetime_str(event.get("start"))
     finish_str = _normalize_datetime_str(event.get("finish"))
     summary = event.get("description_short") or event.get("description")
@@ -146,6 +127,7 @@ def _ensure_competition_from_event(event):
             updated = True
         if updated:
             db.session.commit()
+            competition_index.invalidate()
         return competition
 
     competition = Competition(
@@ -164,73 +146,158 @@ def _ensure_competition_from_event(event):
     )
     db.session.add(competition)
     db.session.commit()
+    competition_index.invalidate()
     return competition
 
 
-def _serialize_post(post, current_user_id=None):
-    competition = post.competition
-    tags = parse_tags(post.tags)
-    competition_tags = parse_tags(competition.tags) if competition else []
-    apply_start = competition.apply_start if competition else None
-    apply_end = competition.apply_end if competition else None
-    event_start = post.event_start or (competition.event_start if competition else None)
-    event_end = post.event_end or (competition.event_end if competition else None)
-    apply_period = format_period(apply_start, apply_end)
-    event_period = format_period(event_start, event_end)
-
-    competition_title = competition.title if competition else post.custom_competition
-    return {
-        "id": post.id,
-        "title": post.title,
-        "owner": post.owner,
-        "summary": post.summary,
-        "requirements": post.requirements,
-        "tags": tags,
-        "team_size": post.team_size,
-        "level": post.level,
-        "use_random_matching": post.use_random_matching,
-        "phase": post.phase,
-        "created_at": post.created_at,
-        "applicant_count": len(post.applications or []),
-        "competition_title": competition_title,
-        "competition_organizer": competition.organizer if competition else None,
-        "competition_summary": competition.summary if competition else None,
-        "competition_mode": competition.mode if competition else None,
-        "competition_tags": competition_tags,
-        "competition_difficulty": competition.difficulty if competition else None,
-        "apply_period": apply_period,
-        "event_period": event_period,
-        "apply_badge": d_day_badge(apply_end),
-        "event_badge": d_day_badge(event_start),
-        "has_applied": bool(
-            current_user_id
-            and any(app.user_id == current_user_id for app in (post.applications or []))
-        ),
-    }
+# 목록/팀 페이지는 ORM 객체 대신 필요한 컬럼만 읽는다 (identity map, 관계 로딩 없음)
+POST_COLUMNS = (
+    TeamPost.id,
+    TeamPost.title,
+    TeamPost.owner,
+    TeamPost.summary,
+    TeamPost.requirements,
+    TeamPost.tags,
+    TeamPost.team_size,
+    TeamPost.level,
+    TeamPost.use_random_matching,
+    TeamPost.phase,
+    TeamPost.created_at,
+    TeamPost.custom_competition,
+    TeamPost.event_start,
+    TeamPost.event_end,
+    Competition.title.label("competition_title"),
+    Competition.organizer.label("competition_organizer"),
+    Competition.summary.label("competition_summary"),
+    Competition.mode.label("competition_mode"),
+    Competition.tags.label("competition_tags"),
+    Competition.difficulty.label("competition_difficulty"),
+    Competition.apply_start.label("competition_apply_start"),
+    Competition.apply_end.label("competition_apply_end"),
+    Competition.event_start.label("competition_event_start"),
+    Competition.event_end.label("competition_event_end"),
+)
+
+APPLICATION_COLUMNS = (
+    TeamApplication.id,
+    TeamApplication.applicant_name,
+    TeamApplication.contact,
+    TeamApplication.desired_role,
+    TeamApplication.level,
+    TeamApplication.message,
+    TeamApplication.created_at,
+)
+
+
+def _post_rows(*extra):
+    applicant_count = (
+        select(func.count(TeamApplication.id))
+        .where(TeamApplication.post_id == TeamPost.id)
+        .scalar_subquery()
+    )
+    return db.session.query(*POST_COLUMNS, applicant_count.label("applicant_count"), *extra).outerjoin(
+        Competition, TeamPost.competition_id == Competition.id
+    )
+
+
+def _serialize_post(row, has_applied=False):
+    event_start = row.event_start or row.competition_event_start
+    event_end = row.event_end or row.competition_event_end
+    return PostView(
+        id=row.id,
+        title=row.title,
+        owner=row.owner,
+        summary=row.summary,
+        requirements=row.requirements,
+        tags=parse_tags(row.tags),
+        team_size=row.team_size,
+        level=row.level,
+        use_random_matching=row.use_random_matching,
+        phase=row.phase,
+        created_at=row.created_at,
+        applicant_count=row.applicant_count or 0,
+        competition_title=row.competition_title or row.custom_competition,
+        competition_organizer=row.competition_organizer,
+        competition_summary=row.competition_summary,
+        competition_mode=row.competition_mode,
+        competition_tags=parse_tags(row.competition_tags),
+        competition_difficulty=row.competition_difficulty,
+        apply_period=format_period(row.competition_apply_start, row.competition_apply_end),
+        event_period=format_period(event_start, event_end),
+        apply_badge=d_day_badge(row.competition_apply_end),
+        event_badge=d_day_badge(event_start),
+        has_applied=bool(has_applied),
+    )
 
 
 def fetch_team_posts(phase=None, limit=None, current_user_id=None):
-    query = (
-        TeamPost.query.options(
-            joinedload(TeamPost.competition),
-            joinedload(TeamPost.applications),
-        )
-        .order_by(TeamPost.created_at.desc())
+    has_applied = (
+        exists()
+        .where(TeamApplication.post_id == TeamPost.id, TeamApplication.user_id == current_user_id)
+        .correlate(TeamPost)
+        if current_user_id
+        else None
     )
+    query = _post_rows(*([has_applied.label("has_applied")] if has_applied is not None else []))
+    query = query.order_by(TeamPost.created_at.desc())
     if phase and phase != "전체":
         query = query.filter(TeamPost.phase == phase)
     if limit:
         query = query.limit(int(limit))
-    return [_serialize_post(post, current_user_id) for post in query.all()]
+    return [
+        _serialize_post(row, has_applied=has_applied is not None and row.has_applied)
+        for row in query
+    ]
 
 
-def phase_counts():
+def _serialize_application(row):
+    return ApplicationView(
+        id=row.id,
+        applicant_name=row.applicant_name,
+        contact=row.contact,
+        desired_role=row.desired_role,
+        level=row.level,
+        message=row.message,
+        created_at=row.created_at.strftime("%Y-%m-%d %H:%M") if row.created_at else "",
+    )
+
+
+def _application_cursor(app):
+    return f"{app.created_at.isoformat()}_{app.id}"
+
+
+def _parse_application_cursor(cursor):
+    try:
+        created_at, app_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(app_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def fetch_applications(post_id, cursor=None, limit=APPLICATIONS_PAGE_SIZE):
+    # (created_at, id) 내림차순 keyset 페이지: (post_id, created_at, id) 인덱스만 따라가므로
+    # 지원자가 몇 명이든 한 페이지 비용이 같다.
+    query = db.session.query(*APPLICATION_COLUMNS).filter(TeamApplication.post_id == post_id)
+    position = _parse_application_cursor(cursor) if cursor else None
+    if position:
+        created_at, app_id = position
+        query = query.filter(
+            or_(
+                TeamApplication.created_at < created_at,
+                (TeamApplication.created_at == created_at) & (TeamApplication.id < app_id),
+            )
+        )
     rows = (
-        db.session.query(TeamPost.phase, func.count(TeamPost.id))
-        .group_by(TeamPost.phase)
+        query.order_by(TeamApplication.created_at.desc(), TeamApplication.id.desc())
+        .limit(limit + 1)
         .all()
     )
-    counts = {phase: total for phase, total in rows}
+    next_cursor = _application_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [_serialize_application(app) for app in rows[:limit]], next_cursor
+
+
+def phase_counts():
+    counts = team_phases.phase_counts()
     counts["전체"] = sum(counts.values())
     for tab in PHASE_TABS:
         counts.setdefault(tab, 0)
@@ -241,8 +308,43 @@ def _sanitize_phase(value):
     return value if value in PHASE_TABS else "전체"
 
 
+_SCHEMA_READY = {"application_indexes": False, "phase_counts": False, "team_post_columns": False}
+
+
+@research_bp.before_app_request
+@on_warm_up("team_application_indexes", order=0)
+def _ensure_team_application_indexes():
+    # 기존 DB 에도 팀 페이지용 복합 인덱스를 만든다 (프로세스당 한 번)
+    if _SCHEMA_READY["application_indexes"]:
+        return
+    try:
+        for index in TeamApplication.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    except Exception:
+        # 테이블이 아직 없거나 다른 워커가 먼저 만든 경우
+        return
+    _SCHEMA_READY["application_indexes"] = True
+
+
 @research_bp.before_app_request
+@on_warm_up("phase_counts", order=10)
+def _ensure_phase_counts():
+    if _SCHEMA_READY["phase_counts"]:
+        return
+    try:
+        team_phases.ensure_counts()
+    except Exception:
+        db.session.rollback()
+        return
+    _SCHEMA_READY["phase_counts"] = True
+
+
+@research_bp.before_app_request
+@on_warm_up("team_post_columns", order=0)
 def _ensure_team_post_columns():
+    # 요청마다 inspect 하지 않도록 프로세스당 한 번 (preload 면 마스터의 워밍업에서 끝난다)
+    if _SCHEMA_READY["team_post_columns"]:
+        return
     engine = db.engine
     inspector = inspect(engine)
     try:
@@ -253,6 +355,8 @@ def _ensure_team_post_columns():
         "custom_competition": "VARCHAR(255)",
         "event_start": "VARCHAR(32)",
         "event_end": "VARCHAR(32)",
+        "owner_id": "INTEGER",
+        "notify_email": "VARCHAR(255)",
     }
     missing = [name for name in required if name not in columns]
     if missing:
@@ -274,16 +378,26 @@ def _ensure_team_post_columns():
             conn.execute(text("ALTER TABLE team_applications ADD COLUMN user_id INTEGER"))
             conn.commit()
 
+    try:
+        outbox_columns = [col["name"] for col in inspector.get_columns("notification_outbox")]
+    except NoSuchTableError:
+        outbox_columns = None
+    if outbox_columns is not None and "sent_channels" not in outbox_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE notification_outbox ADD COLUMN sent_channels VARCHAR(64)"))
+            conn.commit()
+    _SCHEMA_READY["team_post_columns"] = True
+
 
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
 @research_bp.route("/research", methods=["GET", "POST"])
+@query_budget(5)
 def research():
     if not g.user:
         return redirect(url_for("auth.login"))
     selected_phase = _sanitize_phase(request.args.get("phase", "전체"))
-    competitions = fetch_competitions()
     prefill = {
         "competition": request.args.get("prefill_competition", ""),
         "title": request.args.get("prefill_title", ""),
@@ -311,7 +425,6 @@ def research():
         phase_counts=counts,
         phases=PHASE_TABS,
         active_phase=selected_phase,
-        competitions=competitions,
         levels=LEVELS,
         messages=get_flashed_messages(),
         prefill=prefill,
@@ -322,15 +435,15 @@ def research():
 def catalog():
     if not g.user:
         return redirect(url_for("auth.login"))
-    events = fetch_ctftime_events(limit=30)
+    events = event_catalog.get_events()
     return render_template("catalog.html", events=events, levels=LEVELS)
 
 
-@research_bp.route("/catalog/<int:event_id>/team")
-def catalog_team(event_id):
+@research_bp.route("/catalog/<event_key>/team")
+def catalog_team(event_key):
     if not g.user:
         return redirect(url_for("auth.login"))
-    event = get_ctftime_event(event_id)
+    event = event_catalog.get_event(event_key)
     if not event:
         flash("대회 정보를 불러올 수 없습니다.", "error")
         return redirect(url_for("research.catalog"))
@@ -361,29 +474,23 @@ def catalog_team(event_id):
 
 
 @research_bp.route("/team/<int:post_id>")
+@query_budget(5)
 def team_detail(post_id):
     if not g.user:
         return redirect(url_for("auth.login"))
-    post = (
-        TeamPost.query.options(
-            joinedload(TeamPost.competition),
-            joinedload(TeamPost.applications),
-        ).get_or_404(post_id)
-    )
-    serialized = _serialize_post(post, g.user.id)
-    applications = (
-        TeamApplication.query.filter_by(post_id=post.id)
-        .order_by(TeamApplication.created_at.desc())
-        .all()
-    )
-    my_application = next(
-        (app for app in applications if app.user_id == g.user.id), None
-    )
+    row = _post_rows().filter(TeamPost.id == post_id).first()
+    if row is None:
+        abort(404)
+    my_application = TeamApplication.query.filter_by(
+        post_id=row.id, user_id=g.user.id
+    ).first()
+    applications, next_cursor = fetch_applications(row.id)
+    serialized = _serialize_post(row, has_applied=my_application is not None)
     return render_template(
         "team_detail.html",
         post=serialized,
-        raw_post=post,
         applications=applications,
+        next_cursor=next_cursor,
         my_application=my_application,
         levels=LEVELS,
     )
@@ -400,14 +507,16 @@ def _handle_team_post_submission():
     competition_id = None
     custom_competition = None
     if competition_input:
-        existing = Competition.query.filter_by(title=competition_input).first()
-        if existing:
-            competition_id = existing.id
-        else:
+        competition_id = competition_index.resolve(competition_input)
+        if competition_id is None:
             custom_competition = competition_input
 
     event_start = _normalize_datetime_str(request.form.get("event_start"))
     event_end = _normalize_datetime_str(request.form.get("event_end"))
+    notify_email = (request.form.get("notify_email") or "").strip()
+    if notify_email and ("@" not in notify_email or len(notify_email) > 255):
+        flash("알림 이메일 형식을 확인해 주세요.", "error")
+        return redirect(url_for("research.research"))
 
     post = TeamPost(
         competition_id=competition_id,
@@ -416,6 +525,8 @@ def _handle_team_post_submission():
         event_end=event_end,
         title=title,
         owner=(request.form.get("owner") or "").strip(),
+        owner_id=g.user.id,
+        notify_email=notify_email or None,
         summary=request.form.get("summary"),
         requirements=request.form.get("requirements"),
         tags=request.form.get("tags"),
@@ -425,6 +536,7 @@ def _handle_team_post_submission():
         phase=phase,
     )
     db.session.add(post)
+    team_phases.adjust({phase: 1})
     db.session.commit()
     flash("팀 모집 글이 등록되었습니다.")
     return redirect(url_for("research.research"))
@@ -468,6 +580,7 @@ def _handle_team_application_submission(selected_phase):
         level=request.form.get("level"),
     )
     db.session.add(application)
+    notifications.enqueue_team_application(application, post)
     db.session.commit()
     flash("지원이 접수되었습니다. 팀 리더에게 전달됩니다.")
     if next_url:
@@ -522,4 +635,104 @@ def api_random_match():
         }
         for post in matches
     ]
-    return jsonify({"matches": data})
\ No newline at end of file
+    return jsonify({"matches": data})
+
+
+@research_bp.route("/api/team-matches", methods=["GET"])
+def api_team_matches():
+    if not g.user:
+        return jsonify({"error": "login required"}), 401
+    post_id = request.args.get("post_id", type=int)
+    limit = min(request.args.get("limit", 200, type=int), 1000)
+    return jsonify(team_matching.latest_matches(post_id=post_id, limit=limit))
+
+
+@research_bp.route("/api/team/<int:post_id>/applications", methods=["GET"])
+def api_team_applications(post_id):
+    if not g.user:
+        return jsonify({"error": "login required"}), 401
+    limit = max(1, min(request.args.get("limit", APPLICATIONS_PAGE_SIZE, type=int), 100))
+    items, next_cursor = fetch_applications(post_id, request.args.get("cursor"), limit)
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@research_bp.route("/api/competitions/suggest", methods=["GET"])
+def api_competition_suggest():
+    if not g.user:
+        return jsonify({"error": "login required"}), 401
+    limit = max(1, min(request.args.get("limit", 8, type=int), 20))
+    return jsonify({"items": competition_index.suggest(request.args.get("q", ""), limit=limit)})
+
+
+@research_bp.cli.command("advance-phases")
+@click.option("--rebuild-counts", is_flag=True, help="단계별 글 수 카운터를 GROUP BY 로 다시 만든다")
+@click.option("--batch-size", type=int, default=5000, show_default=True)
+@click.option("--every", type=int, default=0, help="N초마다 반복 실행 (스케줄러 컨테이너용)")
+def advance_phases_command(rebuild_counts, batch_size, every):
+    if rebuild_counts:
+        counts = team_phases.rebuild_counts()
+        click.echo("카운터 재계산: " + ", ".join(f"{phase} {total}" for phase, total in counts.items()))
+    while True:
+        summary = team_phases.advance(batch_size=batch_size)
+        click.echo(
+            f"진행중 전환 {summary['started']}건 / 완료 전환 {summary['finished']}건 "
+            f"({summary['duration_ms']}ms)"
+        )
+        if not every:
+            break
+        db.session.remove()
+        time.sleep(every)
+
+
+@research_bp.cli.command("send-notifications")
+@click.option("--batch-size", type=int, default=100, show_default=True, help="한 번에 처리할 리더 수")
+@click.option("--every", type=int, default=0, help="N초마다 반복 실행 (워커 컨테이너용)")
+def send_notifications_command(batch_size, every):
+    _ensure_team_post_columns()
+    while True:
+        summary = notifications.drain(batch_size=batch_size)
+        if summary["pending_channels"]:
+            click.echo("NOTIFY_WEBHOOK_URL / NOTIFY_SMTP_HOST 가 없어 전송하지 않았습니다.")
+        else:
+            click.echo(
+                f"digest {summary['digests']}통: 전송 {summary['sent']} / 재시도 {summary['retry']} / "
+                f"실패 {summary['dead']} / 채널 없음 {summary['skipped']} ({summary['duration_ms']}ms)"
+            )
+        if not every:
+            break
+        db.session.remove()
+        time.sleep(every)
+
+
+@research_bp.cli.command("notification-sink")
+@click.option("--output", default="instance/notifications.ndjson", show_default=True)
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--http-port", type=int, default=8025, show_default=True)
+@click.option("--smtp-port", type=int, default=2525, show_default=True)
+def notification_sink_command(output, host, http_port, smtp_port):
+    notification_sink.serve(output, host=host, http_port=http_port, smtp_port=smtp_port)
+    click.echo(
+        f"webhook: http://{host}:{http_port}/hook  smtp: {host}:{smtp_port}  → {output} (Ctrl+C 로 종료)"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+@research_bp.cli.command("match-teams")
+@click.option("--method", type=click.Choice(["auto", "hungarian", "greedy"]), default="auto")
+@click.option("--dry-run", is_flag=True, help="배정 결과를 저장하지 않고 요약만 출력")
+@click.option("--every", type=int, default=0, help="N초마다 반복 실행 (스케줄러 컨테이너용)")
+def match_teams_command(method, dry_run, every):
+    while True:
+        summary = team_matching.run_matching(method=method, dry_run=dry_run)
+        click.echo(
+            f"[{summary['method']}] 지원자 {summary['applicants']}명 / 팀 {summary['posts']}개 → "
+            f"{summary['assigned']}명 배정 ({summary['duration_ms']}ms)"
+        )
+        if not every:
+            break
+        db.session.remove()
+        time.sleep(every)
@@ -1,19 +1,41 @@
 import os
+import time
+from datetime import datetime
 from uuid import uuid4
 
-from flask import Blueprint, current_app, flash, g, redirect, render_template, request, url_for
+import click
+from flask import Blueprint, Response, current_app, flash, g, redirect, render_template, request, url_for
 from sqlalchemy import func, or_, inspect, text
 from sqlalchemy.orm import joinedload
 from werkzeug.utils import secure_filename
 
 from extensions import db
 from models.user import User
-from models.wargame import WargameAttempt, WargameChallenge
+from models.wargame import WargameAttempt, WargameChallenge, WargameUserScore
+from services import (
+    attempt_ingest,
+    attempt_rollup,
+    flag_verifier,
+    live_feed,
+    recommendations,
+    scoring,
+    solve_analytics,
+    submission_throttle,
+)
+from services.query_budget import query_budget
+from services.startup import on_warm_up
+from services.views import ChallengeView
 
 wargame_bp = Blueprint("wargame", __name__, url_prefix="/wargame")
 
+# 스키마/시드 확인은 프로세스당 한 번이면 충분하다 (매 요청 inspect/SELECT 쿼리 방지)
+_SCHEMA_READY = {"challenge_columns": False, "seed_challenges": False}
 
+
+@on_warm_up("wargame_seed", order=10)
 def _ensure_seed_challenges():
+    if _SCHEMA_READY["seed_challenges"]:
+        return
     seeds = [
         {
             "title": "Satellite Beacon",
@@ -50,26 +72,46 @@ def _ensure_seed_challenges():
     for seed in seeds:
         if seed["title"] in existing_titles:
             continue
-        challenge = WargameChallenge(**seed, is_community=False, author_name="시스템")
+        challenge = WargameChallenge(
+            **seed,
+            **scoring.scoring_params(seed["reward_points"]),
+            is_community=False,
+            author_name="시스템",
+        )
+        challenge.set_flag(seed["flag_answer"], current_app.config.get("WARGAME_FLAG_HASH_METHOD"))
         db.session.add(challenge)
         created = True
     if created:
         db.session.commit()
+        flag_verifier.invalidate()
+    _SCHEMA_READY["seed_challenges"] = True
 
 
-def _ensure_attachment_column():
+@on_warm_up("wargame_schema", order=0)
+def _ensure_challenge_columns():
+    if _SCHEMA_READY["challenge_columns"]:
+        return
     try:
         inspector = inspect(db.engine)
         columns = {col["name"] for col in inspector.get_columns("wargame_challenges")}
     except Exception:
         return
-    if "attachment_path" in columns:
-        return
-    column_type = "TEXT" if db.engine.url.get_backend_name().startswith("sqlite") else "VARCHAR(255)"
-    with db.engine.begin() as connection:
-        connection.execute(
-            text(f"ALTER TABLE wargame_challenges ADD COLUMN attachment_path {column_type}")
-        )
+    is_sqlite = db.engine.url.get_backend_name().startswith("sqlite")
+    required = {
+        "attachment_path": "TEXT" if is_sqlite else "VARCHAR(255)",
+        "initial_points": "INTEGER",
+        "minimum_points": "INTEGER",
+        "decay_solves": "INTEGER",
+        "solve_count": "INTEGER NOT NULL DEFAULT 0",
+    }
+    missing = [(name, column_type) for name, column_type in required.items() if name not in columns]
+    if missing:
+        with db.engine.begin() as connection:
+            for name, column_type in missing:
+                connection.execute(
+                    text(f"ALTER TABLE wargame_challenges ADD COLUMN {name} {column_type}")
+                )
+    _SCHEMA_READY["challenge_columns"] = True
 
 
 def _allowed_attachment(filename):
@@ -95,40 +137,61 @@ def _save_attachment(file_storage):
     return rel_path
 
 
-def _serialize_challenge(challenge):
-    solved_count = sum(1 for attempt in (challenge.attempts or []) if attempt.is_correct)
-    return {
-        "id": challenge.id,
-        "title": challenge.title,
-        "summary": challenge.summary,
-        "difficulty": challenge.difficulty,
-        "category": challenge.category,
-        "hint": challenge.hint,
-        "reward_points": challenge.reward_points,
-        "is_community": challenge.is_community,
-        "author_name": challenge.author_name or "익명",
-        "created_at": challenge.created_at,
-        "solved_count": solved_count,
-        "attachment_path": challenge.attachment_path,
-    }
+# 목록에 필요한 컬럼만 (플래그 해시 등은 읽지 않는다)
+CHALLENGE_COLUMNS = (
+    WargameChallenge.id,
+    WargameChallenge.title,
+    WargameChallenge.summary,
+    WargameChallenge.difficulty,
+    WargameChallenge.category,
+    WargameChallenge.hint,
+    WargameChallenge.reward_points,
+    WargameChallenge.is_community,
+    WargameChallenge.author_name,
+    WargameChallenge.created_at,
+    WargameChallenge.solve_count,
+    WargameChallenge.attachment_path,
+)
+
+
+def _serialize_challenge(challenge, stats=None):
+    return ChallengeView(
+        id=challenge.id,
+        title=challenge.title,
+        summary=challenge.summary,
+        difficulty=challenge.difficulty,
+        category=challenge.category,
+        hint=challenge.hint,
+        reward_points=challenge.reward_points,
+        is_community=challenge.is_community,
+        author_name=challenge.author_name or "익명",
+        created_at=challenge.created_at,
+        solved_count=challenge.solve_count or 0,
+        calibration=(stats or {}).get(challenge.id),
+        attachment_path=challenge.attachment_path,
+    )
 
 
 def _load_leaderboard(limit=5):
+    # 캐시된 총점 테이블에서 바로 읽는다 (동점이면 먼저 도달한 사용자 우선)
     rows = (
-        db.session.query(User.username, func.count(WargameAttempt.id).label("solves"))
-        .join(User, User.id == WargameAttempt.user_id)
-        .filter(WargameAttempt.is_correct.is_(True))
-        .group_by(User.id, User.username)
-        .order_by(func.count(WargameAttempt.id).desc(), func.min(WargameAttempt.created_at))
+        db.session.query(User.username, WargameUserScore.points, WargameUserScore.solves)
+        .join(User, User.id == WargameUserScore.user_id)
+        .filter(WargameUserScore.solves > 0)
+        .order_by(WargameUserScore.points.desc(), WargameUserScore.last_solve_at)
         .limit(limit)
         .all()
     )
-    return [{"username": username, "solved": solves} for username, solves in rows]
+    return [
+        {"username": username, "points": points, "solved": solves}
+        for username, points, solves in rows
+    ]
 
 
 @wargame_bp.route("/", methods=["GET"])
+@query_budget(20)
 def dashboard():
-    _ensure_attachment_column()
+    _ensure_challenge_columns()
     _ensure_seed_challenges()
 
     filters = {
@@ -138,7 +201,7 @@ def dashboard():
         "sort": request.args.get("sort", "newest"),
     }
 
-    challenge_query = WargameChallenge.query.options(joinedload(WargameChallenge.attempts))
+    challenge_query = WargameChallenge.query
     if filters["difficulty"] != "all":
         challenge_query = challenge_query.filter(
             WargameChallenge.difficulty == filters["difficulty"]
@@ -161,10 +224,12 @@ def dashboard():
     else:
         challenge_query = challenge_query.order_by(WargameChallenge.created_at.desc())
 
-    challenges = challenge_query.all()
-    serialized = [_serialize_challenge(ch) for ch in challenges]
+    challenges = challenge_query.with_entities(*CHALLENGE_COLUMNS).all()
+    # 배치 분석 결과는 워커 메모리 캐시에서 읽는다 (쿼리 없음)
+    challenge_stats = solve_analytics.challenge_stats()
+    serialized = [_serialize_challenge(ch, challenge_stats) for ch in challenges]
     if filters["sort"] == "popular":
-        serialized.sort(key=lambda item: item["solved_count"], reverse=True)
+        serialized.sort(key=lambda item: item.solved_count, reverse=True)
 
     featured = serialized[0] if serialized else None
 
@@ -181,13 +246,13 @@ def dashboard():
     }
 
     recent_creations = (
-        WargameChallenge.query.options(joinedload(WargameChallenge.attempts))
+        db.session.query(*CHALLENGE_COLUMNS)
         .filter(WargameChallenge.is_community.is_(True))
         .order_by(WargameChallenge.created_at.desc())
         .limit(5)
         .all()
     )
-    recent_creations = [_serialize_challenge(ch) for ch in recent_creations]
+    recent_creations = [_serialize_challenge(ch, challenge_stats) for ch in recent_creations]
 
     categories = [
         category
@@ -202,13 +267,12 @@ def dashboard():
 
     user_stats = None
     recent_attempts = []
+    recommended = []
     if g.user:
-        total_attempts = (
-            db.session.query(func.count(WargameAttempt.id))
-            .filter(WargameAttempt.user_id == g.user.id)
-            .scalar()
-            or 0
-        )
+        # 배치로 미리 계산된 top-k (PK 조회 한 번)
+        recommended = recommendations.get_recommendations(g.user.id)
+        # 압축된 오래된 오답은 롤업에서 합산
+        total_attempts = attempt_rollup.user_attempt_total(g.user.id)
         total_solves = (
             db.session.query(func.count(WargameAttempt.id))
             .filter(
@@ -218,17 +282,7 @@ def dashboard():
             .scalar()
             or 0
         )
-        solved_points = (
-            db.session.query(func.coalesce(func.sum(WargameChallenge.reward_points), 0))
-            .select_from(WargameAttempt)
-            .join(WargameChallenge, WargameChallenge.id == WargameAttempt.challenge_id)
-            .filter(
-                WargameAttempt.user_id == g.user.id,
-                WargameAttempt.is_correct.is_(True),
-            )
-            .scalar()
-            or 0
-        )
+        score = db.session.get(WargameUserScore, g.user.id)
         favorite_category = (
             db.session.query(
                 WargameChallenge.category, func.count(WargameChallenge.id).label("cnt")
@@ -248,7 +302,7 @@ def dashboard():
             "total_solves": total_solves,
             "accuracy": round((total_solves / total_attempts) * 100, 1) if total_attempts else 0,
             "favorite_category": favorite_category[0] if favorite_category else None,
-            "reward_points": solved_points,
+            "reward_points": score.points if score else 0,
         }
         recent_attempt_rows = (
             WargameAttempt.query.filter_by(user_id=g.user.id)
@@ -279,6 +333,7 @@ def dashboard():
         categories=categories,
         user_stats=user_stats,
         recent_attempts=recent_attempts,
+        recommended=recommended,
     )
 
 
@@ -289,6 +344,37 @@ def _require_login():
     return redirect(url_for("auth.login", next=url_for("wargame.dashboard")))
 
 
+def _publish_solve(challenge_id, challenge_title, first_blood):
+    live_feed.publish(
+        "first_blood" if first_blood else "solve",
+        {
+            "challenge_id": challenge_id,
+            "challenge": challenge_title,
+            "username": g.user.username,
+            "at": datetime.utcnow().isoformat(),
+        },
+    )
+    # 리더보드는 구독자 큐에서 최신 스냅샷 하나로 합쳐진다.
+    live_feed.publish(
+        "leaderboard",
+        {"changed": g.user.username, "top": _load_leaderboard()},
+        coalesce_key="leaderboard",
+    )
+
+
+@wargame_bp.route("/stream", methods=["GET"])
+def stream():
+    subscriber = live_feed.subscribe()
+    if subscriber is None:
+        return Response("retry: 30000\n\n", status=503, mimetype="text/event-stream")
+    heartbeat = current_app.config["LIVE_FEED_HEARTBEAT_SECONDS"]
+    resp = Response(live_feed.stream(subscriber, heartbeat), mimetype="text/event-stream")
+    # no-transform: 연결마다 압축 컨텍스트를 잡지 않도록 압축 미들웨어를 건너뛴다.
+    resp.headers["Cache-Control"] = "no-cache, no-transform"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
 @wargame_bp.route("/attempt", methods=["POST"])
 def attempt_challenge():
     maybe_redirect = _require_login()
@@ -297,23 +383,26 @@ def attempt_challenge():
 
     challenge_id = request.form.get("challenge_id")
     flag_text = (request.form.get("flag") or "").strip()
-    challenge = WargameChallenge.query.get(challenge_id)
+    # 메모리의 해시 맵으로 판정 (문제 행을 DB에서 읽지 않음)
+    challenge = flag_verifier.lookup(challenge_id)
     if not challenge:
         flash("해당 문제를 찾을 수 없습니다.", "error")
         return redirect(url_for("wargame.dashboard"))
 
-    is_correct = flag_text == challenge.flag_answer
-    attempt = WargameAttempt(
-        challenge_id=challenge.id,
-        user_id=g.user.id,
-        submitted_flag=flag_text,
-        is_correct=is_correct,
-    )
-    db.session.add(attempt)
-    db.session.commit()
+    challenge_title, flag_hash = challenge
+    is_correct = WargameChallenge.flag_matches(flag_hash, flag_text)
+    if not is_correct and submission_throttle.is_duplicate_wrong(g.user.id, challenge_id, flag_text):
+        flash("이미 제출한 오답입니다. 다른 값을 시도해보세요.", "warning")
+        return redirect(url_for("wargame.dashboard"))
+    # 정답은 즉시 커밋, 오답은 배치 INSERT 로 모아서 반영
+    attempt_ingest.record_attempt(challenge_id, g.user.id, flag_text, is_correct)
 
     if is_correct:
-        flash(f"🎉 {challenge.title} 문제를 해결했습니다!", "success")
+        # 첫 풀이일 때만 점수 반영 (문제 점수 감소분은 기존 풀이자 총점에 일괄 적용)
+        solve = scoring.record_solve(challenge_id, g.user.id)
+        if solve:
+            _publish_solve(int(challenge_id), challenge_title, solve["first_blood"])
+        flash(f"🎉 {challenge_title} 문제를 해결했습니다!", "success")
     else:
         flash("아쉽지만 오답입니다. 힌트를 다시 확인해보세요.", "warning")
     return redirect(url_for("wargame.dashboard"))
@@ -325,7 +414,7 @@ def publish_challenge():
     if maybe_redirect:
         return maybe_redirect
 
-    _ensure_attachment_column()
+    _ensure_challenge_columns()
     title = (request.form.get("title") or "").strip()
     summary = (request.form.get("summary") or "").strip()
     difficulty = (request.form.get("difficulty") or "중급").strip()
@@ -353,20 +442,100 @@ def publish_challenge():
             flash("파일 저장 중 문제가 발생했습니다. 잠시 후 다시 시도해주세요.", "error")
             return redirect(url_for("wargame.dashboard"))
 
+    initial_points = scoring.points_for_difficulty(difficulty)
     challenge = WargameChallenge(
         title=title,
         summary=summary,
         difficulty=difficulty,
         category=category or "Misc",
-        flag_answer=flag_answer,
         hint=hint or None,
-        reward_points=80,
+        reward_points=initial_points,
+        **scoring.scoring_params(initial_points),
         attachment_path=attachment_path,
         is_community=True,
         author_id=g.user.id,
         author_name=g.user.username,
     )
+    challenge.set_flag(flag_answer, current_app.config.get("WARGAME_FLAG_HASH_METHOD"))
     db.session.add(challenge)
     db.session.commit()
+    flag_verifier.invalidate()
     flash("커뮤니티 문제를 업로드했습니다. 빠르게 검토 후 전파됩니다.", "success")
     return redirect(url_for("wargame.dashboard"))
+
+
+@wargame_bp.cli.command("hash-flags")
+def hash_flags_command():
+    updated = flag_verifier.hash_legacy_flags()
+    if updated:
+        flag_verifier.invalidate()
+    click.echo(f"평문 FLAG {updated}개를 해시로 변환했습니다.")
+    redacted = flag_verifier.redact_correct_attempts()
+    click.echo(f"정답 제출 기록 {redacted}건의 평문 FLAG 를 지웠습니다.")
+
+
+@wargame_bp.cli.command("drain-attempts")
+def drain_attempts_command():
+    result = attempt_ingest.drain()
+    click.echo(f"스풀 파일 {result['files']}개에서 오답 기록 {result['rows']}건을 반영했습니다.")
+
+
+@wargame_bp.cli.command("compact-attempts")
+@click.option("--days", type=int, default=None, help="이 일수보다 오래된 오답을 압축 (기본 ATTEMPT_RETENTION_DAYS)")
+@click.option("--batch-size", type=int, default=None)
+def compact_attempts_command(days, batch_size):
+    result = attempt_rollup.compact(days=days, batch_size=batch_size)
+    click.echo(f"오답 기록 {result['rows']}건을 롤업으로 압축했습니다 (보관 파일: {result['archive'] or '없음'}).")
+
+
+@wargame_bp.cli.command("recompute-scores")
+@click.option("--check", is_flag=True, help="갱신하지 않고 캐시된 총점만 검증")
+@click.option("--if-needed", is_flag=True, help="풀이 기록이 비어 있을 때만 (업그레이드 직후, 컨테이너 시작 시)")
+def recompute_scores_command(check, if_needed):
+    if if_needed:
+        _ensure_challenge_columns()
+        result = scoring.backfill_if_needed()
+        if result is None:
+            click.echo("풀이 기록이 이미 있어 재계산하지 않았습니다.")
+            return
+    elif check:
+        mismatches = scoring.verify()
+        for item in mismatches[:20]:
+            click.echo(f"user {item['user_id']}: cached={item['cached']} expected={item['expected']}")
+        click.echo(f"불일치 {len(mismatches)}건")
+        raise SystemExit(1 if mismatches else 0)
+    else:
+        result = scoring.recompute_all()
+    click.echo(
+        f"풀이 {result['backfilled']}건 보충, 문제 {result['challenges']}개 / 사용자 {result['users']}명 점수를 다시 계산했습니다."
+    )
+
+
+@wargame_bp.cli.command("refresh-recommendations")
+@click.option("--full", is_flag=True, help="새 풀이가 없는 사용자까지 전부 다시 계산")
+@click.option("--every", type=int, default=0, help="N초마다 반복 실행 (스케줄러 컨테이너용)")
+def refresh_recommendations_command(full, every):
+    while True:
+        result = recommendations.refresh(full=full)
+        click.echo(
+            f"추천 갱신: 사용자 {result['users']}명 / 문제 {result['challenges']}개 ({result['duration_ms']}ms)"
+        )
+        if not every:
+            break
+        db.session.remove()
+        time.sleep(every)
+
+
+@wargame_bp.cli.command("analyze-solves")
+@click.option("--chunk-size", type=int, default=5000)
+@click.option("--every", type=int, default=0, help="N초마다 반복 실행")
+def analyze_solves_command(chunk_size, every):
+    while True:
+        result = solve_analytics.analyze(chunk_size=chunk_size)
+        click.echo(
+            f"시도 {result['attempts']}건 / 문제 {result['challenges']}개 분석 ({result['duration_ms']}ms)"
+        )
+        if not every:
+            break
+        db.session.remove()
+        time.sleep(every)
@@ -0,0 +1,133 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Any, Dict, Optional
+
+import click
+from flask import current_app, url_for
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+MANIFEST_NAME = "manifest.json"
+
+_MANIFEST: Dict[str, Any] = {"path": None, "mtime": 0, "entries": {}}
+
+_STRING_RE = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_COLON_RE = re.compile(r":\s+")
+
+
+def minify_css(source: str) -> str:
+    # 문자열 리터럴은 그대로 두고 나머지 구간만 압축한다.
+    parts = _STRING_RE.split(_COMMENT_RE.sub("", source))
+    minified = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            minified.append(part)
+            continue
+        part = _SPACE_RE.sub(" ", part)
+        part = _PUNCT_RE.sub(r"\1", part)
+        part = _COLON_RE.sub(":", part)
+        minified.append(part.replace(";}", "}"))
+    return "".join(minified).strip()
+
+
+def _content_hash(data: bytes, length: int = 12) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def _write_variants(target: str, data: bytes) -> None:
+    with open(target, "wb") as fh:
+        fh.write(data)
+    # mtime=0 으로 고정해야 같은 입력에서 같은 .gz가 나온다.
+    with open(f"{target}.gz", "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+            gz.write(data)
+    if brotli is not None:
+        with open(f"{target}.br", "wb") as fh:
+            fh.write(brotli.compress(data, quality=11))
+
+
+def build_assets(static_folder: str, output_dir: str, patterns=("css/*.css",)) -> Dict[str, str]:
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest: Dict[str, str] = {}
+    for pattern in patterns:
+        for source_path in sorted(glob.glob(os.path.join(static_folder, pattern))):
+            logical = os.path.relpath(source_path, static_folder).replace("\\", "/")
+            with open(source_path, "r", encoding="utf-8") as fh:
+                source = fh.read()
+            if not source.strip():
+                continue
+            if logical.endswith(".css"):
+                source = minify_css(source)
+            data = source.encode("utf-8")
+            stem, ext = os.path.splitext(logical)
+            hashed = f"{stem}.{_content_hash(data)}{ext}"
+            target = os.path.join(output_dir, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _write_variants(target, data)
+            manifest[logical] = hashed
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    _MANIFEST["path"] = None
+    return manifest
+
+
+def _load_manifest() -> Dict[str, str]:
+    path = os.path.join(current_app.config["ASSET_BUILD_DIR"], MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _MANIFEST["path"] == path and _MANIFEST["mtime"] == mtime:
+        return _MANIFEST["entries"]
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            entries = json.load(fh)
+    except (OSError, ValueError) as exc:
+        current_app.logger.warning("Asset manifest unreadable: %s", exc)
+        entries = {}
+    _MANIFEST.update(path=path, mtime=mtime, entries=entries)
+    return entries
+
+
+def resolve_asset(filename: str) -> Optional[str]:
+    return _load_manifest().get(filename)
+
+
+def asset_url(filename: str) -> str:
+    hashed = resolve_asset(filename)
+    if hashed:
+        return url_for("assets.serve_asset", filename=hashed)
+    # 빌드 전(개발 환경)에는 원본 정적 파일을 그대로 쓴다.
+    return url_for("static", filename=filename)
+
+
+assets_cli = AppGroup("assets", help="정적 자원 빌드")
+
+
+@assets_cli.command("build")
+def build_command():
+    manifest = build_assets(
+        current_app.static_folder,
+        current_app.config["ASSET_BUILD_DIR"],
+        current_app.config.get("ASSET_PATTERNS", ("css/*.css",)),
+    )
+    for logical, hashed in sorted(manifest.items()):
+        click.echo(f"{logical} -> {hashed}")
+    if brotli is None:
+        click.echo("brotli 미설치: .br 파일은 생성되지 않았습니다.")
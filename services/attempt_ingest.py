@@ -0,0 +1,213 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from flask import current_app
+
+from extensions import db
+from models.wargame import WargameAttempt
+
+# 오답 제출은 메모리 버퍼 + 로컬 append-only 스풀 파일에 쌓았다가
+# 크기/시간 기준으로 multi-row INSERT 한 번에 반영한다 (정답은 즉시 커밋).
+#
+# 스풀 파일 상태:
+#   attempts-<pid>.ndjson             현재 워커가 쓰는 중
+#   attempts-<pid>-<n>.flushing       배치 INSERT 진행 중 (성공하면 삭제)
+#   *.draining-<pid>                  drain 이 가져간 파일 (rename 으로 선점)
+
+_STATE: Dict[str, Any] = {"pid": None}
+
+
+def _spool_dir(app) -> str:
+    folder = app.config["ATTEMPT_SPOOL_DIR"]
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _state(app) -> Dict[str, Any]:
+    # fork 이후에는 락/스레드/파일 핸들을 새로 만든다.
+    if _STATE["pid"] == os.getpid():
+        return _STATE
+    _STATE.clear()
+    _STATE.update(
+        pid=os.getpid(),
+        app=app,
+        lock=threading.Lock(),
+        buffer=[],
+        oldest=None,
+        spool=None,
+        sequence=0,
+        thread=None,
+    )
+    return _STATE
+
+
+def _open_spool(state) -> None:
+    path = os.path.join(_spool_dir(state["app"]), f"attempts-{state['pid']}.ndjson")
+    state["spool_path"] = path
+    state["spool"] = open(path, "a", encoding="utf-8")
+
+
+def _row(challenge_id, user_id, submitted_flag, is_correct, created_at=None) -> Dict[str, Any]:
+    return {
+        "challenge_id": int(challenge_id),
+        "user_id": user_id,
+        # 정답 FLAG 는 평문으로 남기지 않는다 (오답만 기록)
+        "submitted_flag": None if is_correct else submitted_flag,
+        "is_correct": bool(is_correct),
+        "created_at": created_at or datetime.utcnow(),
+    }
+
+
+def _serialize(row: Dict[str, Any]) -> str:
+    return json.dumps({**row, "created_at": row["created_at"].isoformat()}, ensure_ascii=False)
+
+
+def _deserialize(line: str) -> Dict[str, Any]:
+    data = json.loads(line)
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return data
+
+
+def _insert_rows(rows: List[Dict[str, Any]], chunk_size: int = 500) -> None:
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(db.insert(WargameAttempt), rows[start:start + chunk_size])
+    db.session.commit()
+
+
+def _ensure_flusher(state) -> None:
+    thread = state.get("thread")
+    if thread is not None and thread.is_alive():
+        return
+    interval = state["app"].config.get("ATTEMPT_FLUSH_SECONDS", 2.0)
+
+    def _run():
+        while True:
+            time.sleep(interval)
+            oldest = state["oldest"]
+            if oldest is not None and time.monotonic() - oldest >= interval:
+                flush(state["app"])
+
+    thread = threading.Thread(target=_run, name="attempt-flusher", daemon=True)
+    thread.start()
+    state["thread"] = thread
+
+
+def record_attempt(challenge_id, user_id, submitted_flag, is_correct) -> None:
+    app = current_app._get_current_object()
+    row = _row(challenge_id, user_id, submitted_flag, is_correct)
+    if is_correct or not app.config.get("ATTEMPT_WRITE_BEHIND", True):
+        # 정답은 사용자에게 바로 보여야 하므로 동기 커밋
+        db.session.add(WargameAttempt(**row))
+        db.session.commit()
+        return
+
+    state = _state(app)
+    with state["lock"]:
+        if state["spool"] is None:
+            _open_spool(state)
+        state["spool"].write(_serialize(row) + "\n")
+        state["spool"].flush()
+        if app.config.get("ATTEMPT_SPOOL_FSYNC"):
+            os.fsync(state["spool"].fileno())
+        state["buffer"].append(row)
+        if state["oldest"] is None:
+            state["oldest"] = time.monotonic()
+        pending = len(state["buffer"])
+    _ensure_flusher(state)
+
+    if pending >= app.config.get("ATTEMPT_BATCH_SIZE", 200):
+        flush(app)
+
+
+def flush(app=None) -> int:
+    app = app or current_app._get_current_object()
+    state = _state(app)
+    with state["lock"]:
+        rows = state["buffer"]
+        if not rows:
+            return 0
+        # 스풀을 회전시킨 뒤 락을 놓는다: 그동안 들어오는 제출은 새 파일로 간다.
+        state["spool"].close()
+        state["sequence"] += 1
+        flushing_path = f"{state['spool_path'][:-len('.ndjson')]}-{state['sequence']}.flushing"
+        os.replace(state["spool_path"], flushing_path)
+        _open_spool(state)
+        state["buffer"] = []
+        state["oldest"] = None
+
+    with app.app_context():
+        try:
+            _insert_rows(rows)
+        except Exception:
+            db.session.rollback()
+            # 파일은 남겨두고 drain 으로 복구한다 (제출한 사용자 요청은 실패시키지 않음).
+            app.logger.exception("Attempt batch insert failed; kept %s", flushing_path)
+            return 0
+    os.remove(flushing_path)
+    return len(rows)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_pid(path: str):
+    name = os.path.basename(path)
+    try:
+        return int(name.split("-")[1].split(".")[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def drain() -> Dict[str, int]:
+    # 죽은 워커가 남긴 스풀/flushing 파일을 DB 로 옮긴다.
+    # 여러 프로세스가 동시에 실행해도 rename 선점 덕분에 한 번씩만 반영된다.
+    folder = _spool_dir(current_app)
+    me = os.getpid()
+    result = {"files": 0, "rows": 0}
+    for path in sorted(glob.glob(os.path.join(folder, "attempts-*"))):
+        if ".draining-" in path:
+            owner = int(path.rsplit("-", 1)[1])
+            if owner != me and _pid_alive(owner):
+                continue
+        else:
+            owner = _owner_pid(path)
+            if owner == me or (owner and _pid_alive(owner)):
+                continue
+        claimed = f"{path.split('.draining-')[0]}.draining-{me}"
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            continue
+        with open(claimed, "r", encoding="utf-8") as fh:
+            rows = [_deserialize(line) for line in fh if line.strip()]
+        if rows:
+            _insert_rows(rows)
+        os.remove(claimed)
+        result["files"] += 1
+        result["rows"] += len(rows)
+    return result
+
+
+@atexit.register
+def _flush_on_exit():
+    if _STATE.get("pid") != os.getpid():
+        return
+    if _STATE["buffer"]:
+        flush(_STATE["app"])
+    if _STATE["spool"] is not None and not _STATE["buffer"]:
+        _STATE["spool"].close()
+        if os.path.getsize(_STATE["spool_path"]) == 0:
+            os.remove(_STATE["spool_path"])
@@ -0,0 +1,197 @@
+import gzip
+import json
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import current_app
+from sqlalchemy import case, func
+
+from extensions import db
+from models.wargame import WargameAttempt, WargameChallengeUserRollup, WargameUserDailyRollup
+
+# 오래된 오답 시도를 카운터로 압축한다.
+# 정답 행은 리더보드 순서(첫 정답 시각)와 풀이 수 계산에 필요하므로 그대로 둔다.
+# 따라서 "시도 수" 통계만 raw 행 수 + 롤업 합계로 계산하면 된다.
+#   사용자별 일별 합계: user_attempt_total
+#   (문제, 사용자) 쌍별 첫 정답 이전 시도 수 + 첫 시도 시각: solve_analytics.analyze
+#   압축 대상은 cutoff 이전 행뿐이라 이후에 들어오는 정답은 항상 압축된 오답보다 늦다.
+
+_ARCHIVE_COLUMNS = (
+    WargameAttempt.id,
+    WargameAttempt.challenge_id,
+    WargameAttempt.user_id,
+    WargameAttempt.submitted_flag,
+    WargameAttempt.created_at,
+)
+
+
+def user_attempt_total(user_id):
+    # 사용자 전체 시도 수 (최근 raw + 압축된 롤업) 를 한 번의 쿼리로
+    raw = (
+        db.session.query(func.count(WargameAttempt.id))
+        .filter(WargameAttempt.user_id == user_id)
+        .scalar_subquery()
+    )
+    rolled = (
+        db.session.query(func.coalesce(func.sum(WargameUserDailyRollup.attempts), 0))
+        .filter(WargameUserDailyRollup.user_id == user_id)
+        .scalar_subquery()
+    )
+    return db.session.query(raw + rolled).scalar() or 0
+
+
+def _merged(table, new):
+    # 같은 키가 이미 있으면 시도 수는 더하고 first_at 은 더 이른 쪽
+    values = {"attempts": table.c.attempts + new.attempts}
+    if "first_at" in table.c:
+        values["first_at"] = case(
+            (table.c.first_at.is_(None), new.first_at),
+            (new.first_at < table.c.first_at, new.first_at),
+            else_=table.c.first_at,
+        )
+    return values
+
+
+def _upsert(model, keys, rows, chunk_size: int = 500) -> None:
+    if not rows:
+        return
+    dialect = db.session.get_bind().dialect.name
+    table = model.__table__
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(index_elements=keys, set_=_merged(table, stmt.excluded))
+        elif dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert
+
+            stmt = insert(table).values(chunk)
+            stmt = stmt.on_duplicate_key_update(**_merged(table, stmt.inserted))
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+
+            stmt = insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(index_elements=keys, set_=_merged(table, stmt.excluded))
+        else:
+            for row in chunk:
+                existing = model.query.filter_by(**{key: row[key] for key in keys}).first()
+                if existing is None:
+                    db.session.add(model(**row))
+                    continue
+                existing.attempts += row["attempts"]
+                if row.get("first_at") and (existing.first_at is None or row["first_at"] < existing.first_at):
+                    existing.first_at = row["first_at"]
+            continue
+        db.session.execute(stmt)
+
+
+def _first_solves(rows) -> Dict[tuple, datetime]:
+    # 배치에 나온 (문제, 사용자) 쌍의 첫 정답 시각 (정답 행은 압축하지 않으므로 raw 에 있다)
+    user_ids = {row[2] for row in rows if row[2] is not None}
+    challenge_ids = {row[1] for row in rows}
+    if not user_ids:
+        return {}
+    solved = (
+        db.session.query(WargameAttempt.challenge_id, WargameAttempt.user_id, func.min(WargameAttempt.created_at))
+        .filter(
+            WargameAttempt.is_correct.is_(True),
+            WargameAttempt.user_id.in_(user_ids),
+            WargameAttempt.challenge_id.in_(challenge_ids),
+        )
+        .group_by(WargameAttempt.challenge_id, WargameAttempt.user_id)
+    )
+    return {(challenge_id, user_id): first for challenge_id, user_id, first in solved}
+
+
+def _archive_path(folder: str, cutoff: datetime) -> str:
+    os.makedirs(folder, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    return os.path.join(folder, f"attempts-before-{cutoff:%Y%m%d}-{stamp}-{uuid.uuid4().hex[:8]}.ndjson.gz")
+
+
+def compact(days: Optional[int] = None, batch_size: Optional[int] = None, archive_dir=None) -> Dict[str, object]:
+    config = current_app.config
+    days = config["ATTEMPT_RETENTION_DAYS"] if days is None else days
+    batch_size = batch_size or config["ATTEMPT_COMPACT_BATCH"]
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    path = _archive_path(archive_dir or config["ATTEMPT_ARCHIVE_DIR"], cutoff)
+
+    result = {"rows": 0, "batches": 0, "archive": None}
+    last_id = 0
+    with gzip.open(path, "wt", encoding="utf-8") as archive:
+        while True:
+            rows = (
+                db.session.query(*_ARCHIVE_COLUMNS)
+                .filter(
+                    WargameAttempt.is_correct.is_(False),
+                    WargameAttempt.created_at < cutoff,
+                    WargameAttempt.id > last_id,
+                )
+                .order_by(WargameAttempt.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            per_user: Counter = Counter()
+            per_pair: Dict[tuple, dict] = {}
+            first_solves = _first_solves(rows)
+            for attempt_id, challenge_id, user_id, submitted_flag, created_at in rows:
+                archive.write(
+                    json.dumps(
+                        {
+                            "id": attempt_id,
+                            "challenge_id": challenge_id,
+                            "user_id": user_id,
+                            "submitted_flag": submitted_flag,
+                            "created_at": created_at.isoformat() if created_at else None,
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+                day = (created_at or cutoff).date()
+                per_user[(user_id, day)] += 1
+                solved_at = first_solves.get((challenge_id, user_id))
+                if user_id is None or (solved_at is not None and (created_at or cutoff) >= solved_at):
+                    continue  # 풀이 이후 오답은 문제별 통계에 쓰이지 않는다
+                pair = per_pair.setdefault(
+                    (challenge_id, user_id),
+                    {"challenge_id": challenge_id, "user_id": user_id, "attempts": 0, "first_at": created_at},
+                )
+                pair["attempts"] += 1
+                if created_at and (pair["first_at"] is None or created_at < pair["first_at"]):
+                    pair["first_at"] = created_at
+            # 보관 파일에 먼저 내려쓴 뒤 DB 를 바꾼다: 중간에 죽으면 보관본이 중복될 뿐 유실되지 않는다.
+            archive.flush()
+            ids = [row[0] for row in rows]
+            try:
+                _upsert(
+                    WargameUserDailyRollup,
+                    ["user_id", "day"],
+                    [
+                        {"user_id": user_id, "day": day, "attempts": count}
+                        for (user_id, day), count in per_user.items()
+                        if user_id is not None
+                    ],
+                )
+                _upsert(WargameChallengeUserRollup, ["challenge_id", "user_id"], list(per_pair.values()))
+                db.session.execute(db.delete(WargameAttempt).where(WargameAttempt.id.in_(ids)))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            last_id = ids[-1]
+            result["rows"] += len(rows)
+            result["batches"] += 1
+
+    if result["rows"]:
+        result["archive"] = path
+    else:
+        os.remove(path)
+    return result
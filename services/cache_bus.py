@@ -0,0 +1,66 @@
+import os
+import time
+import uuid
+from typing import Dict, Tuple
+
+from flask import current_app
+
+from services.shared_state import redis_client
+
+# 워커 간 캐시 무효화용 버전 스탬프.
+# 각 워커는 로컬 캐시와 함께 읽어둔 버전을 들고 있다가, 버전이 바뀌면 다시 적재한다.
+# 스탬프는 CACHE_STAMP_DIR 의 작은 파일이라 확인 비용이 DB 왕복보다 훨씬 싸다.
+# 호스트가 여러 대면 CACHE_BUS_BACKEND=redis: 스탬프를 Redis 키로 두고, 왕복을 줄이려고 읽은 값을
+# CACHE_BUS_REDIS_TTL 초 동안 프로세스에 기억한다 (자기 프로세스의 bump 는 즉시 반영).
+
+_LOCAL: Dict[str, Tuple[float, str]] = {}
+
+
+def _redis_key(name: str) -> str:
+    return f"cache_bus:{name}"
+
+
+def _redis_version(name: str) -> str:
+    now = time.monotonic()
+    cached = _LOCAL.get(name)
+    if cached is not None and now - cached[0] < current_app.config["CACHE_BUS_REDIS_TTL"]:
+        return cached[1]
+    try:
+        raw = redis_client().get(_redis_key(name))
+    except Exception:
+        # Redis 장애 중에는 마지막으로 본 버전을 유지한다 (캐시를 매번 다시 적재하지 않도록)
+        current_app.logger.exception("cache_bus: redis read failed")
+        return cached[1] if cached is not None else ""
+    value = raw.decode("ascii") if raw else ""
+    _LOCAL[name] = (now, value)
+    return value
+
+
+def _stamp_path(name: str) -> str:
+    folder = current_app.config["CACHE_STAMP_DIR"]
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{name}.stamp")
+
+
+def version(name: str) -> str:
+    if current_app.config["CACHE_BUS_BACKEND"] == "redis":
+        return _redis_version(name)
+    try:
+        with open(_stamp_path(name), "r", encoding="ascii") as fh:
+            return fh.read()
+    except OSError:
+        return ""
+
+
+def bump(name: str) -> str:
+    value = uuid.uuid4().hex
+    if current_app.config["CACHE_BUS_BACKEND"] == "redis":
+        redis_client().set(_redis_key(name), value)
+        _LOCAL[name] = (time.monotonic(), value)
+        return value
+    path = _stamp_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="ascii") as fh:
+        fh.write(value)
+    os.replace(tmp_path, path)
+    return value
@@ -0,0 +1,207 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+
+from services import event_sources
+from services.competition_index import normalize
+
+# 대회 카탈로그: 설정된 소스(services/event_sources.py)를 스레드 풀에서 동시에 가져와
+# 하나의 목록으로 정규화/중복 제거한 뒤 프로세스 캐시에 둔다.
+#   - 요청은 캐시만 읽는다. 주기가 지난 소스는 백그라운드에서 갱신하고 직전 결과를 그대로 보여 준다.
+#   - 한 번도 가져오지 못한 소스가 있을 때(콜드 스타트)만 소스별 timeout 과
+#     CATALOG_COLD_WAIT_SECONDS 중 짧은 시간까지 기다린다. 늦게 끝난 소스는 다음 요청부터 반영된다.
+#   - 실패한 소스는 직전 결과를 유지한다.
+
+_CACHE: Dict[str, Any] = {
+    "pid": None,
+    "executor": None,
+    "sources": {},  # name -> {"events", "fetched_at", "stamp", "error", "duration_ms"}
+    "inflight": {},  # name -> Future
+    "names": (),
+    "events": [],
+    "by_key": {},
+}
+_LOCK = threading.Lock()
+
+_TITLE_NOISE = re.compile(r"[^0-9a-z가-힣]+")
+_NUMBERS = re.compile(r"\d+")
+
+
+def _executor() -> ThreadPoolExecutor:
+    pid = os.getpid()
+    if _CACHE["pid"] != pid:
+        with _LOCK:
+            if _CACHE["pid"] != pid:
+                # fork 된 워커는 부모의 스레드를 물려받지 못하므로 새로 만든다
+                _CACHE.update(
+                    pid=pid,
+                    executor=ThreadPoolExecutor(
+                        max_workers=current_app.config["CATALOG_WORKERS"],
+                        thread_name_prefix="catalog",
+                    ),
+                    sources={},
+                    inflight={},
+                    events=[],
+                    by_key={},
+                )
+    return _CACHE["executor"]
+
+
+def _title_key(title: str) -> str:
+    return _TITLE_NOISE.sub("", normalize(title))
+
+
+def _same_event(left: Dict[str, Any], right: Dict[str, Any], threshold: float) -> bool:
+    if left["_title"] == right["_title"]:
+        return True
+    # "Foo CTF 2025" 와 "Foo CTF 2026", "Stub CTF 1" 과 "Stub CTF 11" 은 다른 대회
+    if _NUMBERS.findall(left["_title"]) != _NUMBERS.findall(right["_title"]):
+        return False
+    return SequenceMatcher(None, left["_title"], right["_title"]).ratio() >= threshold
+
+
+def dedupe(events: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    # 우선순위가 높은 소스부터 받아들이고, 시작일이 ±1일 안이면서 제목이 비슷한 이벤트는 하나로 합친다.
+    # 비교는 시작일 버킷 3개 안에서만 하므로 이벤트 수에 거의 선형이다.
+    merged: List[Dict[str, Any]] = []
+    buckets: Dict[Optional[int], List[Dict[str, Any]]] = {}
+    for event in events:
+        event = dict(event, sources=list(event["sources"]), aliases=[event["key"]])
+        event["_title"] = _title_key(event["title"])
+        day = event["start"].toordinal() if event["start"] else None
+        candidates = buckets.get(None, []) if day is None else [
+            other for offset in (-1, 0, 1) for other in buckets.get(day + offset, [])
+        ]
+        match = next((other for other in candidates if _same_event(other, event, threshold)), None)
+        if match is None:
+            buckets.setdefault(day, []).append(event)
+            merged.append(event)
+            continue
+        for field, value in event.items():
+            if field.startswith("_") or field in ("sources", "aliases"):
+                continue
+            if match.get(field) in (None, "") and value not in (None, ""):
+                match[field] = value
+        for label in event["sources"]:
+            if label not in match["sources"]:
+                match["sources"].append(label)
+        match["aliases"].append(event["key"])
+    for event in merged:
+        event.pop("_title", None)
+    return merged
+
+
+def _merge() -> None:
+    priorities = {}
+    events = []
+    for name in _CACHE["names"]:
+        state = _CACHE["sources"].get(name)
+        if state:
+            events.extend(state["events"])
+            priorities[name] = state["priority"]
+    events.sort(key=lambda event: (priorities.get(event["source"], 50), event["start"] is None, event["start"] or 0))
+    merged = dedupe(events, current_app.config["CATALOG_DEDUPE_THRESHOLD"])
+    merged.sort(key=lambda event: (event["start"] is None, event["start"] or 0, event["title"]))
+    by_key = {alias: event for event in merged for alias in event["aliases"]}
+    _CACHE["events"], _CACHE["by_key"] = merged, by_key
+
+
+def _run(app, source: event_sources.EventSource) -> None:
+    started = time.perf_counter()
+    events, error = None, None
+    with app.app_context():
+        try:
+            events = source.fetch()
+        except Exception as exc:  # 소스 하나의 실패가 카탈로그 전체를 막지 않도록
+            error = str(exc)
+            app.logger.warning("Catalog source %s failed: %s", source.name, exc)
+        with _LOCK:
+            state = _CACHE["sources"].get(source.name) or {"events": []}
+            state.update(
+                fetched_at=time.time(),
+                stamp=source.stamp(),
+                error=error,
+                priority=source.priority,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+            if events is not None:
+                state["events"] = events
+            _CACHE["sources"][source.name] = state
+            _CACHE["inflight"].pop(source.name, None)
+            _merge()
+
+
+def _stale(source: event_sources.EventSource, now: float, ttl: float) -> bool:
+    state = _CACHE["sources"].get(source.name)
+    if state is None:
+        return True
+    return now - state["fetched_at"] >= ttl or state["stamp"] != source.stamp()
+
+
+def refresh(wait: Optional[float] = None) -> Dict[str, Any]:
+    # 주기가 지났거나 원본이 바뀐 소스만 제출한다. wait 가 있으면 그 시간까지(소스별 timeout 이 더 짧으면 그만큼) 기다린다.
+    executor = _executor()
+    app = current_app._get_current_object()
+    config = current_app.config
+    sources = event_sources.configured_sources()
+    now = time.time()
+    names = tuple(source.name for source in sources)
+    futures = {}
+    with _LOCK:
+        if names != _CACHE["names"]:
+            _CACHE["names"] = names
+            _merge()
+        for source in sources:
+            if source.name in _CACHE["inflight"] or not _stale(source, now, config["CATALOG_CACHE_SECONDS"]):
+                continue
+            future = executor.submit(_run, app, source)
+            _CACHE["inflight"][source.name] = future
+            futures[source.name] = (source, future)
+    if wait:
+        deadline = time.monotonic() + wait
+        for source, future in futures.values():
+            remaining = min(deadline, time.monotonic() + source.timeout) - time.monotonic()
+            if remaining > 0:
+                wait_futures([future], timeout=remaining)
+    return {"submitted": sorted(futures)}
+
+
+def get_events() -> List[Dict[str, Any]]:
+    cold = any(name not in _CACHE["sources"] for name in _CACHE["names"]) or not _CACHE["names"]
+    refresh(wait=current_app.config["CATALOG_COLD_WAIT_SECONDS"] if cold else None)
+    return _CACHE["events"]
+
+
+def get_event(key: str) -> Optional[Dict[str, Any]]:
+    if key.isdigit():
+        # 예전 /catalog/<ctftime id>/team 링크
+        key = f"ctftime-{key}"
+    event = _CACHE["by_key"].get(key)
+    if event is None:
+        get_events()
+        event = _CACHE["by_key"].get(key)
+    if event is None and key.startswith("ctftime-") and key[8:].isdigit():
+        from services.ctftime import get_ctftime_event
+
+        event = get_ctftime_event(int(key[8:]))
+    return event
+
+
+def status() -> Dict[str, Any]:
+    return {
+        name: {
+            "events": len(state["events"]),
+            "age_seconds": round(time.time() - state["fetched_at"], 1),
+            "error": state["error"],
+            "duration_ms": state["duration_ms"],
+            "refreshing": name in _CACHE["inflight"],
+        }
+        for name, state in sorted(_CACHE["sources"].items())
+    }
@@ -0,0 +1,167 @@
+import bisect
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from extensions import db
+from models.research import Competition
+from services import cache_bus
+from services.startup import on_warm_up
+
+# 대회 자동완성 인덱스.
+# 제목을 정규화(NFKC, 소문자, 공백 정리)해서 세 가지 방식으로 찾는다.
+#   접두어: 정렬된 (제목/단어, id) 목록에서 bisect  -> "def" -> "DEF CON CTF"
+#   초성:  한글 제목의 초성 문자열 접두어            -> "ㅎㅋ" -> "해킹캠프"
+#   n-gram: 공백을 뺀 문자열의 bigram/trigram 겹침  -> 오타, 중간 단어 검색
+# 한글은 한 음절이 정보량이 커서 두 글자 질의도 흔하므로 bigram 도 같이 색인한다.
+# 대회가 추가/수정되면 cache_bus 버전을 올리고, 각 워커는 다음 조회에서 다시 적재한다.
+
+CACHE_NAME = "competitions"
+MIN_GRAM_SCORE = 0.34
+# NFKC 는 호환 자모(ㄱ)를 첫소리 자모(U+1100)로 바꾸므로 초성도 첫소리 자모로 비교한다.
+CHOSEONG = "".join(chr(0x1100 + offset) for offset in range(19))
+
+_CACHE: Dict[str, Any] = {"version": None, "index": None}
+_LOCK = threading.Lock()
+
+
+def normalize(value: Optional[str]) -> str:
+    return " ".join(unicodedata.normalize("NFKC", value or "").lower().split())
+
+
+def _choseong(value: str) -> str:
+    chars = []
+    for char in value:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            chars.append(CHOSEONG[code // 588])
+        elif char != " ":
+            chars.append(char)
+    return "".join(chars)
+
+
+def _grams(value: str) -> set:
+    compact = value.replace(" ", "")
+    grams = set()
+    for size in (2, 3):
+        grams.update(compact[i:i + size] for i in range(len(compact) - size + 1))
+    return grams
+
+
+def _is_choseong_query(value: str) -> bool:
+    return bool(value) and all(char in CHOSEONG or char == " " for char in value)
+
+
+class _Index:
+    def __init__(self, rows):
+        self.titles: Dict[int, str] = {}
+        self.approved = set()
+        self.by_title: Dict[str, int] = {}
+        prefixes = []
+        choseong = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.gram_count: Dict[int, int] = {}
+        for competition_id, title, approved in rows:
+            key = normalize(title)
+            if not key:
+                continue
+            self.titles[competition_id] = title
+            if approved:
+                self.approved.add(competition_id)
+            # 같은 제목이 여러 개면 먼저 생긴(id 가 작은) 대회로 연결
+            if key not in self.by_title or competition_id < self.by_title[key]:
+                self.by_title[key] = competition_id
+            prefixes.append((key, competition_id))
+            for word in key.split(" ")[1:]:
+                prefixes.append((word, competition_id))
+            choseong.append((_choseong(key), competition_id))
+            grams = _grams(key)
+            self.gram_count[competition_id] = len(grams)
+            for gram in grams:
+                self.postings[gram].append(competition_id)
+        self.prefixes = sorted(prefixes)
+        self.choseong = sorted(choseong)
+
+    @staticmethod
+    def _prefix_ids(table, query: str) -> List[int]:
+        start = bisect.bisect_left(table, (query, -1))
+        matched = []
+        for key, competition_id in table[start:]:
+            if not key.startswith(query):
+                break
+            matched.append(competition_id)
+        return matched
+
+    def search(self, query: str, limit: int, approved_only: bool = True) -> List[Dict[str, Any]]:
+        scores: Dict[int, float] = {}
+
+        def _offer(competition_id, score):
+            if approved_only and competition_id not in self.approved:
+                return
+            if score > scores.get(competition_id, 0.0):
+                scores[competition_id] = score
+
+        exact = self.by_title.get(query)
+        if exact is not None:
+            _offer(exact, 3.0)
+        for competition_id in self._prefix_ids(self.prefixes, query):
+            # 제목 전체 접두어가 단어 접두어보다 앞선다
+            whole = normalize(self.titles[competition_id]).startswith(query)
+            _offer(competition_id, 2.0 if whole else 1.5)
+        if _is_choseong_query(query):
+            for competition_id in self._prefix_ids(self.choseong, query.replace(" ", "")):
+                _offer(competition_id, 1.2)
+
+        grams = _grams(query)
+        if grams:
+            overlap = Counter()
+            for gram in grams:
+                overlap.update(self.postings.get(gram, ()))
+            for competition_id, shared in overlap.items():
+                # 질의 n-gram 이 얼마나 들어 있는지 + 제목 길이 보정 (dice 계수)
+                score = 2 * shared / (len(grams) + self.gram_count[competition_id])
+                if score >= MIN_GRAM_SCORE or shared == len(grams):
+                    _offer(competition_id, score)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(self.titles[item[0]]), item[0]))
+        return [
+            {"id": competition_id, "title": self.titles[competition_id], "score": round(score, 3)}
+            for competition_id, score in ranked[:limit]
+        ]
+
+
+def _rebuild(version: str) -> _Index:
+    rows = db.session.query(Competition.id, Competition.title, Competition.approved).all()
+    index = _Index((row.id, row.title, bool(row.approved)) for row in rows)
+    _CACHE["index"] = index
+    _CACHE["version"] = version
+    return index
+
+
+@on_warm_up("competition_index")
+def get_index() -> _Index:
+    version = cache_bus.version(CACHE_NAME)
+    if _CACHE["version"] is not None and _CACHE["version"] == version:
+        return _CACHE["index"]
+    with _LOCK:
+        if _CACHE["version"] is not None and _CACHE["version"] == version:
+            return _CACHE["index"]
+        return _rebuild(version)
+
+
+def suggest(query: str, limit: int = 8) -> List[Dict[str, Any]]:
+    query = normalize(query)
+    if not query:
+        return []
+    return get_index().search(query, limit)
+
+
+def resolve(title: str) -> Optional[int]:
+    # 입력한 제목과 (정규화 기준) 같은 대회 id. 승인 전 대회도 연결한다.
+    return get_index().by_title.get(normalize(title))
+
+
+def invalidate() -> None:
+    _CACHE["version"] = None
+    cache_bus.bump(CACHE_NAME)
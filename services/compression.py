@@ -0,0 +1,206 @@
+import zlib
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/xml",
+    "text/csv",
+    "text/event-stream",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+# 이미 압축되었거나 부분 응답이라 건드리면 안 되는 상태 코드
+_SKIP_STATUS = {204, 206, 304}
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+def _header(headers: List[Tuple[str, str]], name: str) -> Optional[str]:
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _close(app_iter) -> None:
+    close = getattr(app_iter, "close", None)
+    if close is not None:
+        close()
+
+
+# gzip/brotli 응답 압축. Content-Length 가 없는 스트리밍 응답은 청크 단위로 압축한다.
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        level: int = 6,
+        brotli_quality: int = 4,
+        min_size: int = 500,
+        buffer_limit: int = 1024 * 1024,
+        mimetypes: Iterable[str] = DEFAULT_MIMETYPES,
+    ):
+        self.app = app
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.min_size = min_size
+        self.buffer_limit = buffer_limit
+        self.mimetypes = frozenset(mimetypes)
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        offered = {}
+        for item in accept_encoding.split(","):
+            token, _, params = item.strip().partition(";")
+            token = token.strip().lower()
+            if not token:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            offered[token] = quality
+        if brotli is not None and offered.get("br", 0) > 0:
+            return "br"
+        if offered.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.level)
+
+    def _should_compress(self, status: str, headers: List[Tuple[str, str]]) -> bool:
+        try:
+            code = int(status.split(" ", 1)[0])
+        except ValueError:
+            return False
+        if code < 200 or code in _SKIP_STATUS:
+            return False
+        if _header(headers, "Content-Encoding"):
+            return False
+        if "attachment" in (_header(headers, "Content-Disposition") or "").lower():
+            return False
+        if "no-transform" in (_header(headers, "Cache-Control") or "").lower():
+            return False
+        mimetype = (_header(headers, "Content-Type") or "").split(";", 1)[0].strip().lower()
+        if mimetype not in self.mimetypes:
+            return False
+        length = _header(headers, "Content-Length")
+        if length is not None and length.isdigit() and int(length) < self.min_size:
+            return False
+        return True
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+
+        state = {}
+
+        def _start_response(status, headers, exc_info=None):
+            if self._should_compress(status, headers):
+                state.update(status=status, headers=headers, exc_info=exc_info)
+                return state.setdefault("written", []).append
+            return start_response(status, headers, exc_info)
+
+        app_iter = self.app(environ, _start_response)
+        if not state:
+            return app_iter
+        return self._compressed(app_iter, state, encoding, start_response)
+
+    def _compressed(self, app_iter, state, encoding, start_response):
+        headers = [
+            (key, value)
+            for key, value in state["headers"]
+            if key.lower() not in ("content-length", "etag")
+        ]
+        etag = _header(state["headers"], "ETag")
+        if etag:
+            # 인코딩별로 본문이 달라지므로 strong ETag 를 weak 로 바꾼다.
+            headers.append(("ETag", etag if etag.startswith("W/") else f"W/{etag}"))
+        vary = _header(headers, "Vary")
+        if not vary:
+            headers.append(("Vary", "Accept-Encoding"))
+        elif "accept-encoding" not in vary.lower():
+            headers = [(k, v) for k, v in headers if k.lower() != "vary"]
+            headers.append(("Vary", f"{vary}, Accept-Encoding"))
+        headers.append(("Content-Encoding", encoding))
+
+        compressor = self._compressor(encoding)
+        length = _header(state["headers"], "Content-Length")
+        if length is not None and length.isdigit() and int(length) <= self.buffer_limit:
+            try:
+                body = b"".join(state.get("written", [])) + b"".join(app_iter)
+            finally:
+                _close(app_iter)
+            data = compressor.compress(body) + compressor.finish()
+            headers.append(("Content-Length", str(len(data))))
+            start_response(state["status"], headers, state["exc_info"])
+            return [data]
+
+        start_response(state["status"], headers, state["exc_info"])
+        return self._stream(app_iter, compressor, state.get("written", []))
+
+    @staticmethod
+    def _stream(app_iter, compressor, written):
+        try:
+            for chunk in chain(written, app_iter):
+                if chunk:
+                    # 청크마다 flush 해서 SSE/스트리밍 응답이 지연되지 않도록 한다.
+                    yield compressor.compress(chunk) + compressor.flush()
+            yield compressor.finish()
+        finally:
+            _close(app_iter)
+
+
+def init_compression(app):
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        level=app.config.get("COMPRESS_LEVEL", 6),
+        brotli_quality=app.config.get("COMPRESS_BROTLI_QUALITY", 4),
+        min_size=app.config.get("COMPRESS_MIN_SIZE", 500),
+    )
@@ -2,9 +2,10 @@ import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-import requests
 from flask import current_app
 
+from services import http_client
+
 _CACHE: Dict[str, Any] = {"timestamp": 0, "events": [], "by_id": {}}
 
 
@@ -59,10 +60,12 @@ def fetch_ctftime_events(limit: int = 25) -> List[Dict[str, Any]]:
     )
     lookahead = current_app.config.get("CTFTIME_LOOKAHEAD_SECONDS", 60 * 60 * 24 * 90)
     timeout = current_app.config.get("CTFTIME_TIMEOUT", 10)
+    # 시작 시각을 정시로 내려 한 시간 동안은 같은 URL -> ETag/Last-Modified 재검증이 맞아떨어진다
+    start = int(now) // 3600 * 3600
     params = {
         "limit": limit,
-        "start": int(now),
-        "finish": int(now + lookahead),
+        "start": start,
+        "finish": start + lookahead,
     }
 
     headers = {
@@ -72,13 +75,17 @@ def fetch_ctftime_events(limit: int = 25) -> List[Dict[str, Any]]:
     }
 
     try:
-        response = requests.get(api_url, params=params, timeout=timeout, headers=headers)
-        response.raise_for_status()
-        raw_events = response.json()
+        raw_events = http_client.get_json("ctftime", api_url, params=params, headers=headers, timeout=timeout)
     except Exception as exc:  # pragma: no cover - best effort logging
         current_app.logger.warning("CTFtime fetch failed: %s", exc)
+        if _CACHE["events"]:
+            # 직전 목록을 계속 보여 주고, 다음 시도는 캐시 주기 뒤로 미룬다
+            _CACHE["timestamp"] = now
+            return _CACHE["events"]
         raw_events = []
 
+    if not isinstance(raw_events, list):
+        raw_events = []
     events = [_format_event(event) for event in raw_events]
     _CACHE["by_id"] = {event["id"]: event for event in events if event.get("id")}
     _CACHE["timestamp"] = now
@@ -0,0 +1,190 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import func
+
+from extensions import db
+from models.research import Competition, TeamApplication, TeamPost
+from models.user import User
+from models.wargame import WargameAttempt, WargameChallenge, hash_flag
+from services import competition_index, team_phases
+from services.scoring import recompute_all
+
+DEFAULT_SCALE = {
+    "users": 1000,
+    "challenges": 200,
+    "attempts": 20000,
+    "competitions": 100,
+    "posts": 1000,
+    "applications": 5000,
+}
+
+DIFFICULTIES = ["초급", "중급", "고급"]
+CATEGORIES = ["Web", "Pwnable", "Reversing", "Crypto", "Forensics", "Cloud", "Misc"]
+PHASES = ["모집 중", "진행중", "완료"]
+ROLES = ["웹 해킹", "포너블", "리버싱", "암호", "포렌식", "팀 리더"]
+SEED_PASSWORD = "Seed-password-1!"
+
+
+def flag_for(challenge_id: int, prefix: str = "seed") -> str:
+    return f"FLAG{{{prefix.upper()}_{challenge_id}}}"
+
+
+def _insert(model, rows, chunk_size=2000):
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(db.insert(model), rows[start:start + chunk_size])
+
+
+def _iso(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat()
+
+
+def generate(seed: int = 42, prefix: str = "seed", **scale) -> Dict[str, int]:
+    # 같은 seed/scale 이면 항상 같은 데이터셋이 만들어진다 (커밋 간 비교용).
+    counts = {**DEFAULT_SCALE, **{k: v for k, v in scale.items() if v is not None}}
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    def _past(days=90):
+        return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+    user_offset = db.session.query(func.max(User.id)).scalar() or 0
+    # pbkdf2 해시는 느리므로 한 번만 계산해서 모든 사용자에게 재사용한다.
+    probe = User()
+    probe.set_password(SEED_PASSWORD)
+    _insert(
+        User,
+        [
+            {
+                "id": user_offset + index + 1,
+                "username": f"{prefix}_{user_offset + index + 1}"[:20],
+                "password_hash": probe.password_hash,
+                "created_at": _past(),
+            }
+            for index in range(counts["users"])
+        ],
+    )
+    user_ids = list(range(user_offset + 1, user_offset + counts["users"] + 1))
+
+    challenge_offset = db.session.query(func.max(WargameChallenge.id)).scalar() or 0
+    challenge_rows = []
+    for index in range(counts["challenges"]):
+        challenge_id = challenge_offset + index + 1
+        difficulty = rng.choice(DIFFICULTIES)
+        challenge_rows.append(
+            {
+                "id": challenge_id,
+                "title": f"{prefix.title()} Challenge {challenge_id}",
+                "summary": f"합성 데이터 문제 #{challenge_id}. " * rng.randint(1, 6),
+                "difficulty": difficulty,
+                "category": rng.choice(CATEGORIES),
+                "flag_answer": hash_flag(flag_for(challenge_id, prefix)),
+                "hint": rng.choice([None, "힌트 없음", "소스를 잘 읽어보세요"]),
+                "reward_points": {"초급": 50, "중급": 120, "고급": 200}[difficulty],
+                "is_community": rng.random() < 0.4,
+                "author_id": rng.choice(user_ids) if user_ids else None,
+                "author_name": "seed",
+                "created_at": _past(),
+            }
+        )
+    _insert(WargameChallenge, challenge_rows)
+    challenges = [(row["id"], flag_for(row["id"], prefix)) for row in challenge_rows]
+
+    attempt_rows = []
+    if challenges and user_ids:
+        for _ in range(counts["attempts"]):
+            challenge_id, flag = rng.choice(challenges)
+            is_correct = rng.random() < 0.25
+            attempt_rows.append(
+                {
+                    "challenge_id": challenge_id,
+                    "user_id": rng.choice(user_ids),
+                    "submitted_flag": None if is_correct else f"FLAG{{wrong_{rng.randint(0, 9999)}}}",
+                    "is_correct": is_correct,
+                    "created_at": _past(),
+                }
+            )
+    _insert(WargameAttempt, attempt_rows)
+
+    competition_offset = db.session.query(func.max(Competition.id)).scalar() or 0
+    competition_rows = []
+    for index in range(counts["competitions"]):
+        start = now + timedelta(days=rng.randint(-60, 90))
+        competition_rows.append(
+            {
+                "id": competition_offset + index + 1,
+                "title": f"{prefix.title()} CTF {competition_offset + index + 1}",
+                "organizer": rng.choice(["HSpace", "KISA", "CTFtime", None]),
+                "apply_start": _iso(start - timedelta(days=30)),
+                "apply_end": _iso(start - timedelta(days=1)),
+                "event_start": _iso(start),
+                "event_end": _iso(start + timedelta(days=rng.randint(1, 3))),
+                "summary": "합성 대회 데이터",
+                "mode": rng.choice(["Jeopardy", "Attack-Defense"]),
+                "tags": ",".join(rng.sample(CATEGORIES, 2)),
+                "difficulty": rng.choice(DIFFICULTIES),
+                "approved": True,
+                "created_at": _past(),
+            }
+        )
+    _insert(Competition, competition_rows)
+    competition_ids = [row["id"] for row in competition_rows]
+
+    post_offset = db.session.query(func.max(TeamPost.id)).scalar() or 0
+    post_rows = []
+    for index in range(counts["posts"]):
+        use_competition = competition_ids and rng.random() < 0.7
+        post_rows.append(
+            {
+                "id": post_offset + index + 1,
+                "competition_id": rng.choice(competition_ids) if use_competition else None,
+                "custom_competition": None if use_competition else f"{prefix} project {index}",
+                "title": f"{prefix.title()} Team {post_offset + index + 1}",
+                "owner": f"{prefix}_owner_{index}",
+                "summary": "함께 대회를 준비할 팀원을 찾습니다.",
+                "requirements": "주 2회 온라인 회의",
+                "tags": ",".join(rng.sample(CATEGORIES, 3)),
+                "team_size": str(rng.randint(2, 6)),
+                "level": rng.choice(DIFFICULTIES),
+                "use_random_matching": rng.random() < 0.6,
+                "phase": rng.choice(PHASES),
+                "created_at": _past(),
+            }
+        )
+    _insert(TeamPost, post_rows)
+    post_ids = [row["id"] for row in post_rows]
+
+    application_rows = []
+    if post_ids:
+        # 인기 팀에 지원이 몰리는 분포 (앞쪽 게시글일수록 지원자 많음)
+        weights = [1.0 / (rank + 1) for rank in range(len(post_ids))]
+        for target in rng.choices(post_ids, weights=weights, k=counts["applications"]):
+            user_id = rng.choice(user_ids) if user_ids else None
+            application_rows.append(
+                {
+                    "post_id": target,
+                    "user_id": user_id,
+                    "applicant_name": f"{prefix}_applicant_{user_id}",
+                    "contact": f"{prefix}{user_id}@example.com",
+                    "message": "지원합니다!",
+                    "desired_role": rng.choice(ROLES),
+                    "level": rng.choice(DIFFICULTIES),
+                    "created_at": _past(),
+                }
+            )
+    _insert(TeamApplication, application_rows)
+
+    db.session.commit()
+    # 풀이 기록/동적 점수/사용자 총점 캐시를 정답 기록에 맞춘다.
+    recompute_all()
+    competition_index.invalidate()
+    team_phases.rebuild_counts()
+    return {
+        "users": len(user_ids),
+        "challenges": len(challenge_rows),
+        "attempts": len(attempt_rows),
+        "competitions": len(competition_rows),
+        "posts": len(post_rows),
+        "applications": len(application_rows),
+    }
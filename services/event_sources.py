@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import current_app
+
+from extensions import db
+from models.research import Competition
+from services import cache_bus
+
+# 대회 카탈로그 소스 플러그인.
+# 소스는 fetch() 로 공통 스키마(normalize_event) 이벤트 목록을 돌려준다. 실행/병합은 services/catalog.py.
+# 새 소스는 @register("종류") 로 등록하고 CATALOG_SOURCES 에 이름을 넣는다.
+#   CATALOG_SOURCES=ctftime,competitions
+#   CATALOG_FEEDS=instance/feeds/domestic.json,https://example.com/ctf.ics   (확장자 .ics 면 iCalendar, 나머지 JSON)
+# services.ctftime / http_client(requests) 는 실제로 가져올 때 불러온다 (워커 기동 시간).
+
+SOURCE_TYPES: Dict[str, Callable[..., "EventSource"]] = {}
+
+
+def register(kind: str):
+    def decorator(cls):
+        SOURCE_TYPES[kind] = cls
+        return cls
+
+    return decorator
+
+
+def _display(value: Optional[datetime]) -> str:
+    return value.strftime("%Y-%m-%d %H:%M UTC") if value else "TBD"
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, str):
+        from services.ctftime import _parse_dt
+
+        return _parse_dt(value.strip())
+    return None
+
+
+def normalize_event(source: "EventSource", source_id: Any, title: str, **fields) -> Dict[str, Any]:
+    # ctftime._format_event 와 같은 키 + 출처 정보. 템플릿/팀 모집 연결은 이 스키마만 본다.
+    start = _as_utc(fields.get("start"))
+    finish = _as_utc(fields.get("finish"))
+    description = fields.get("description")
+    return {
+        "key": f"{source.name}-{source_id}",
+        "id": fields.get("id"),
+        "title": title,
+        "description": description,
+        "format": fields.get("format"),
+        "onsite": fields.get("onsite"),
+        "weight": fields.get("weight"),
+        "location": fields.get("location"),
+        "participants": fields.get("participants"),
+        "ctftime_url": fields.get("ctftime_url"),
+        "url": fields.get("url"),
+        "logo": fields.get("logo"),
+        "start": start,
+        "finish": finish,
+        "start_display": _display(start),
+        "finish_display": _display(finish),
+        "duration_days": fields.get("duration_days"),
+        "duration_hours": fields.get("duration_hours"),
+        "description_short": (description or "")[:200],
+        "source": source.name,
+        "sources": [source.label],
+    }
+
+
+class EventSource:
+    kind = "base"
+    label = "기타"
+    # 중복 병합 시 값이 작은 소스의 필드를 우선한다 (직접 관리하는 데이터 > 피드 > CTFtime)
+    priority = 50
+
+    def __init__(self, name: str, timeout: float):
+        self.name = name
+        self.timeout = timeout
+
+    def stamp(self) -> Optional[str]:
+        # 값이 바뀌면 캐시 주기와 무관하게 다시 가져온다 (None: 주기만 따름)
+        return None
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+@register("ctftime")
+class CtftimeSource(EventSource):
+    kind = "ctftime"
+    label = "CTFtime"
+    priority = 20
+
+    def __init__(self, name: str, timeout: float, limit: int = 30):
+        super().__init__(name, timeout)
+        self.limit = limit
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        from services.ctftime import fetch_ctftime_events
+
+        events = []
+        for raw in fetch_ctftime_events(limit=self.limit):
+            if not raw.get("title"):
+                continue
+            fields = {key: value for key, value in raw.items() if key != "title"}
+            events.append(normalize_event(self, raw.get("id"), raw["title"], **fields))
+        return events
+
+
+@register("competitions")
+class CompetitionSource(EventSource):
+    # 관리자가 직접 등록한 대회 (승인된 것 중 진행 중이거나 예정된 것)
+    kind = "competitions"
+    label = "직접 등록"
+    priority = 0
+
+    def stamp(self) -> Optional[str]:
+        return cache_bus.version("competitions")
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(seconds=current_app.config.get("CTFTIME_LOOKAHEAD_SECONDS", 60 * 60 * 24 * 90))
+        rows = db.session.query(
+            Competition.id,
+            Competition.title,
+            Competition.event_start,
+            Competition.event_end,
+            Competition.summary,
+            Competition.mode,
+            Competition.cover_image,
+        ).filter(Competition.approved.is_(True))
+        events = []
+        for row in rows:
+            start = _as_utc(row.event_start)
+            finish = _as_utc(row.event_end) or start
+            if not start or finish < now or start > horizon:
+                continue
+            events.append(
+                normalize_event(
+                    self,
+                    row.id,
+                    row.title,
+                    start=start,
+                    finish=finish,
+                    description=row.summary,
+                    format=row.mode,
+                    logo=row.cover_image,
+                )
+            )
+        return events
+
+
+class _FeedSource(EventSource):
+    priority = 10
+
+    def __init__(self, name: str, timeout: float, location: str):
+        super().__init__(name, timeout)
+        self.location = location
+        self.label = os.path.splitext(os.path.basename(location.rstrip("/")))[0] or location
+
+    @property
+    def is_remote(self) -> bool:
+        return self.location.startswith(("http://", "https://"))
+
+    def _path(self) -> str:
+        return os.path.join(current_app.root_path, self.location)
+
+    def stamp(self) -> Optional[str]:
+        if self.is_remote:
+            return None
+        try:
+            return str(os.stat(self._path()).st_mtime_ns)
+        except OSError:
+            return None
+
+    def _read_text(self) -> str:
+        if self.is_remote:
+            from services import http_client
+
+            return http_client.get_text(self.name, self.location, timeout=self.timeout)
+        with open(self._path(), encoding="utf-8") as fh:
+            return fh.read()
+
+    def _id(self, explicit: Any, title: str, start: Any) -> str:
+        if explicit not in (None, ""):
+            return re.sub(r"[^0-9A-Za-z_.-]", "_", str(explicit))
+        return hashlib.sha1(f"{title}|{start}".encode("utf-8")).hexdigest()[:12]
+
+
+@register("json")
+class JsonFeedSource(_FeedSource):
+    # [{"title", "start", "finish"|"end", "url", "description", "location", "format", "onsite", "id"}, ...]
+    # 또는 {"events": [...]}
+    kind = "json"
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        if self.is_remote:
+            from services import http_client
+
+            payload = http_client.get_json(self.name, self.location, timeout=self.timeout)
+        else:
+            payload = json.loads(self._read_text())
+        if isinstance(payload, dict):
+            payload = payload.get("events") or []
+        events = []
+        for raw in payload:
+            if not isinstance(raw, dict) or not raw.get("title"):
+                continue
+            start = raw.get("start")
+            events.append(
+                normalize_event(
+                    self,
+                    self._id(raw.get("id"), raw["title"], start),
+                    raw["title"],
+                    start=start,
+                    finish=raw.get("finish") or raw.get("end"),
+                    description=raw.get("description"),
+                    format=raw.get("format"),
+                    onsite=raw.get("onsite"),
+                    location=raw.get("location"),
+                    url=raw.get("url"),
+                    logo=raw.get("logo"),
+                )
+            )
+        return events
+
+
+def _ics_unescape(value: str) -> str:
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def _ics_datetime(value: str, params: Dict[str, str]) -> Optional[datetime]:
+    value = value.strip()
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value[:8], "%Y%m%d").replace(tzinfo=timezone.utc)
+        parsed = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if value.endswith("Z") or "TZID" not in params:
+        return parsed.replace(tzinfo=timezone.utc)
+    try:
+        from zoneinfo import ZoneInfo
+
+        return parsed.replace(tzinfo=ZoneInfo(params["TZID"])).astimezone(timezone.utc)
+    except (ImportError, KeyError, ValueError):
+        return parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_ics(text: str) -> List[Dict[str, Any]]:
+    # RFC 5545 중 VEVENT 의 일정/제목/설명/링크만 읽는 최소 파서 (접힌 줄 처리 포함)
+    lines: List[str] = []
+    for line in text.splitlines():
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        else:
+            lines.append(line)
+    events, current = [], None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            current = {}
+        elif line == "END:VEVENT":
+            if current is not None:
+                events.append(current)
+            current = None
+        elif current is not None and ":" in line:
+            head, value = line.split(":", 1)
+            name, *raw_params = head.split(";")
+            params = dict(param.split("=", 1) for param in raw_params if "=" in param)
+            name = name.upper()
+            if name in ("DTSTART", "DTEND"):
+                current[name] = _ics_datetime(value, params)
+            else:
+                current[name] = _ics_unescape(value)
+    return events
+
+
+@register("ics")
+class IcsFeedSource(_FeedSource):
+    kind = "ics"
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        events = []
+        for raw in parse_ics(self._read_text()):
+            title = raw.get("SUMMARY")
+            if not title:
+                continue
+            events.append(
+                normalize_event(
+                    self,
+                    self._id(raw.get("UID"), title, raw.get("DTSTART")),
+                    title,
+                    start=raw.get("DTSTART"),
+                    finish=raw.get("DTEND"),
+                    description=raw.get("DESCRIPTION"),
+                    location=raw.get("LOCATION"),
+                    url=raw.get("URL"),
+                )
+            )
+        return events
+
+
+def configured_sources() -> List[EventSource]:
+    config = current_app.config
+    timeout = config["CATALOG_SOURCE_TIMEOUT"]
+    sources: List[EventSource] = []
+    for kind in filter(None, (item.strip() for item in config["CATALOG_SOURCES"].split(","))):
+        factory = SOURCE_TYPES.get(kind)
+        if factory is None:
+            current_app.logger.warning("Unknown catalog source: %s", kind)
+            continue
+        if kind == "ctftime":
+            sources.append(factory(kind, config.get("CTFTIME_TIMEOUT", timeout)))
+        else:
+            sources.append(factory(kind, timeout))
+    for index, location in enumerate(filter(None, (item.strip() for item in config["CATALOG_FEEDS"].split(",")))):
+        kind = "ics" if location.lower().split("?")[0].endswith(".ics") else "json"
+        sources.append(SOURCE_TYPES[kind](f"feed{index}", timeout, location))
+    return sources
@@ -0,0 +1,79 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+
+from extensions import db
+from models.wargame import WargameAttempt, WargameChallenge, hash_flag, is_flag_hashed
+from services import cache_bus
+from services.startup import on_warm_up
+
+CACHE_NAME = "wargame_flags"
+
+# challenge_id -> (title, 해시된 flag). summary 등 큰 컬럼은 올리지 않는다.
+_CACHE: Dict[str, Any] = {"version": None, "entries": {}}
+_LOCK = threading.Lock()
+
+
+def hash_legacy_flags() -> int:
+    # 평문으로 저장된 예전 flag_answer 를 해시로 바꾼다 (한 번만 실제로 갱신됨).
+    method = current_app.config.get("WARGAME_FLAG_HASH_METHOD")
+    rows = db.session.query(WargameChallenge.id, WargameChallenge.flag_answer).all()
+    updates = [
+        {"id": challenge_id, "flag_answer": hash_flag(flag, method)}
+        for challenge_id, flag in rows
+        if flag and not is_flag_hashed(flag)
+    ]
+    if updates:
+        db.session.execute(db.update(WargameChallenge), updates)
+        db.session.commit()
+    return len(updates)
+
+
+def redact_correct_attempts() -> int:
+    # 예전에는 정답 제출도 submitted_flag 에 평문으로 남았다. 정답 행의 값을 지운다.
+    result = db.session.execute(
+        db.update(WargameAttempt)
+        .where(WargameAttempt.is_correct.is_(True), WargameAttempt.submitted_flag.isnot(None))
+        .values(submitted_flag=None)
+    )
+    db.session.commit()
+    return result.rowcount or 0
+
+
+def _rebuild(version: str) -> Dict[int, Tuple[str, str]]:
+    if hash_legacy_flags():
+        version = cache_bus.bump(CACHE_NAME)
+    entries = {
+        challenge_id: (title, flag_hash)
+        for challenge_id, title, flag_hash in db.session.query(
+            WargameChallenge.id, WargameChallenge.title, WargameChallenge.flag_answer
+        )
+    }
+    _CACHE["entries"] = entries
+    _CACHE["version"] = version
+    return entries
+
+
+@on_warm_up("wargame_flags")
+def _entries() -> Dict[int, Tuple[str, str]]:
+    version = cache_bus.version(CACHE_NAME)
+    if _CACHE["version"] is not None and _CACHE["version"] == version:
+        return _CACHE["entries"]
+    with _LOCK:
+        if _CACHE["version"] is not None and _CACHE["version"] == version:
+            return _CACHE["entries"]
+        return _rebuild(version)
+
+
+def lookup(challenge_id) -> Optional[Tuple[str, str]]:
+    try:
+        return _entries().get(int(challenge_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def invalidate() -> None:
+    # 문제 등록/수정 후 호출: 모든 워커가 다음 제출 때 다시 적재한다.
+    _CACHE["version"] = None
+    cache_bus.bump(CACHE_NAME)
@@ -0,0 +1,112 @@
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from flask import current_app
+from sqlalchemy import inspect, text
+
+from extensions import db
+from services import shared_state, startup
+
+# 로드밸런서/오케스트레이터용 상태 확인 (routes/health.py).
+#   /healthz: 프로세스가 응답하는지만 본다. DB 등 외부 의존성 장애로 재시작되지 않도록 아무것도 확인하지 않는다.
+#   /readyz: 트래픽을 받아도 되는지. DB 연결, 스키마(모든 모델 테이블), 워밍업, 공유 저장소. 드레인 중이면 503.
+# 드레인: gunicorn 워커가 SIGTERM 을 받으면 바로 멈추지 않고 DRAIN_SECONDS 동안 /readyz 만 503 으로 바꾼 채
+#   요청을 계속 처리한 뒤 원래 종료 처리로 넘어간다 (로드밸런서가 이 복제본을 빼 갈 시간).
+#   gunicorn 의 graceful_timeout 은 이보다 길어야 한다 (gunicorn.conf.py).
+
+_STATE: Dict[str, Any] = {"draining": False, "drain_started": None, "schema_ready": False}
+
+
+def is_draining() -> bool:
+    return _STATE["draining"]
+
+
+def start_drain() -> None:
+    if not _STATE["draining"]:
+        _STATE.update(draining=True, drain_started=time.time())
+
+
+def install_drain_handler(seconds: float) -> None:
+    # gunicorn post_worker_init 에서 호출: 워커가 설치한 SIGTERM 처리기를 감싼다
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _finish(signum, frame):
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def _handler(signum, frame):
+        if _STATE["draining"]:
+            return
+        start_drain()
+        timer = threading.Timer(seconds, _finish, args=(signum, frame))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, _handler)
+    signal.siginterrupt(signal.SIGTERM, False)
+
+
+def _database() -> bool:
+    db.session.execute(text("SELECT 1"))
+    return True
+
+
+def _schema() -> bool:
+    # 테이블은 한 번 생기면 사라지지 않으므로 통과한 뒤로는 다시 보지 않는다
+    if _STATE["schema_ready"]:
+        return True
+    existing = set(inspect(db.engine).get_table_names())
+    missing = sorted(name for name in db.metadata.tables if name not in existing)
+    if missing:
+        raise RuntimeError(f"missing tables: {', '.join(missing)}")
+    _STATE["schema_ready"] = True
+    return True
+
+
+def _warm_up() -> bool:
+    app = current_app._get_current_object()
+    timings = startup.last_warm_up()
+    if timings is None:
+        # gunicorn 밖(개발 서버 등)에서 워밍업이 아직 없었으면 첫 확인 때 실행한다 (템플릿은 첫 렌더링에 맡긴다)
+        timings = startup.warm_up(app, templates=False)
+    else:
+        # 실패한 단계만, 백오프 간격으로 다시 시도
+        timings = startup.retry_failed(app)
+    failed = [name for name, value in timings.items() if value is None]
+    if failed:
+        raise RuntimeError(f"warm-up failed: {', '.join(failed)}")
+    return True
+
+
+def _timed(name: str, check: Callable[[], bool]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result: Dict[str, Any] = {}
+    try:
+        result["ok"] = bool(check())
+    except Exception:
+        # 공개 엔드포인트라 예외 내용(DSN, 호스트 등)은 응답에 싣지 않고 로그에만 남긴다
+        db.session.rollback()
+        current_app.logger.warning("readiness check failed: %s", name, exc_info=True)
+        result["ok"] = False
+    result["ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def readiness() -> Tuple[bool, Dict[str, Any]]:
+    checks = {"database": _database, "schema": _schema, "warm_up": _warm_up, **shared_state.checks()}
+    results = {name: _timed(name, check) for name, check in checks.items()}
+    ready = all(item["ok"] for item in results.values())
+    if _STATE["draining"]:
+        status = "draining"
+    else:
+        status = "ready" if ready else "not_ready"
+    body = {"status": status, "pid": os.getpid(), "checks": results}
+    if _STATE["draining"]:
+        body["draining_for"] = round(time.time() - _STATE["drain_started"], 1)
+    return ready and not _STATE["draining"], body
@@ -0,0 +1,244 @@
+import codecs
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+import urllib3
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from services.metrics import UPSTREAM_CIRCUIT_OPEN, UPSTREAM_LATENCY, UPSTREAM_TOTAL
+
+# 외부 API 공용 HTTP 클라이언트.
+#   연결 풀: 프로세스당 requests.Session 하나 (fork 후에는 새로 만든다) -> TCP/TLS 재사용
+#   재시도: 연결 오류/타임아웃/5xx/429 만, 지수 백오프 + full jitter, 횟수 제한
+#   서킷 브레이커: 소스별 연속 실패가 쌓이면 일정 시간 호출하지 않고 바로 실패 (느린 업스트림이 워커를 붙잡지 않게)
+#   조건부 GET: ETag/Last-Modified 를 기억했다가 If-None-Match/If-Modified-Since 로 보내고, 304 면 직전 결과 재사용
+#   응답은 stream=True 로 받아 크기 제한을 걸며 바로 JSON 으로 파싱한다.
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_STATE: Dict[str, Any] = {"pid": None, "session": None, "breakers": {}, "validators": {}}
+_LOCK = threading.Lock()
+
+
+class UpstreamError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class CircuitBreaker:
+    # closed -> (연속 실패 threshold 회) -> open -> (reset_seconds 후) half-open 한 번 시도 -> 성공 시 closed
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+def _state() -> Dict[str, Any]:
+    pid = os.getpid()
+    if _STATE["pid"] != pid:
+        with _LOCK:
+            if _STATE["pid"] != pid:
+                config = current_app.config
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=config["HTTP_POOL_CONNECTIONS"],
+                    pool_maxsize=config["HTTP_POOL_SIZE"],
+                    max_retries=0,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _STATE.update(pid=pid, session=session, breakers={}, validators={})
+    return _STATE
+
+
+def breaker(source: str) -> CircuitBreaker:
+    state = _state()
+    found = state["breakers"].get(source)
+    if found is None:
+        config = current_app.config
+        found = state["breakers"].setdefault(
+            source,
+            CircuitBreaker(config["HTTP_BREAKER_THRESHOLD"], config["HTTP_BREAKER_RESET_SECONDS"]),
+        )
+    return found
+
+
+def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+    config = current_app.config
+    cap = config["HTTP_BACKOFF_MAX_SECONDS"]
+    if retry_after and retry_after.isdigit():
+        return min(cap, float(retry_after))
+    return random.uniform(0, min(cap, config["HTTP_BACKOFF_SECONDS"] * 2 ** attempt))
+
+
+class _LimitedReader:
+    # 응답 본문을 읽으면서 크기 제한을 건다 (Content-Length 가 없거나 거짓이어도)
+    def __init__(self, raw, limit: int):
+        self.raw = raw
+        self.limit = limit
+        self.read_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size if size and size > 0 else 64 * 1024)
+        self.read_bytes += len(chunk)
+        if self.read_bytes > self.limit:
+            raise UpstreamError(f"response larger than {self.limit} bytes")
+        return chunk
+
+
+def _parse_json(response, limit: int) -> Any:
+    response.raw.decode_content = True
+    reader = codecs.getreader(response.encoding or "utf-8")(_LimitedReader(response.raw, limit))
+    return json.load(reader)
+
+
+def _parse_text(response, limit: int) -> str:
+    response.raw.decode_content = True
+    reader = _LimitedReader(response.raw, limit)
+    chunks = []
+    while True:
+        chunk = reader.read()
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks).decode(response.encoding or "utf-8", "replace")
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]], accept: str) -> Tuple:
+    return (url, tuple(sorted((params or {}).items())), accept)
+
+
+def get_json(
+    source: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    return _get(source, url, params, headers, timeout, "application/json", _parse_json)
+
+
+def get_text(
+    source: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    return _get(source, url, params, headers, timeout, "text/*", _parse_text)
+
+
+def _get(source, url, params, headers, timeout, accept, parse) -> Any:
+    config = current_app.config
+    state = _state()
+    circuit = breaker(source)
+    if not circuit.allow():
+        UPSTREAM_CIRCUIT_OPEN.labels(source).inc()
+        raise CircuitOpenError(f"{source}: circuit open")
+
+    key = _cache_key(url, params, accept)
+    cached = state["validators"].get(key)
+    request_headers = dict(headers or {})
+    request_headers.setdefault("Accept", accept)
+    if cached:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    started = time.perf_counter()
+    retries = config["HTTP_RETRIES"]
+    last_error: Optional[str] = None
+    # 어떤 경로로 끝나든 (예상 못 한 예외 포함) 브레이커에 결과를 남긴다: half-open 시도가 probing 으로 남지 않게
+    outcome = "error"
+    try:
+        for attempt in range(retries + 1):
+            retry_after = None
+            try:
+                # 본문은 response.raw 로 직접 읽으므로 urllib3 예외(ReadTimeoutError, ProtocolError)가 그대로 올라온다
+                with state["session"].get(
+                    url,
+                    params=params,
+                    headers=request_headers,
+                    timeout=timeout or config["HTTP_TIMEOUT"],
+                    stream=True,
+                ) as response:
+                    UPSTREAM_TOTAL.labels(source, str(response.status_code)).inc()
+                    if response.status_code == 304 and cached:
+                        outcome = "not_modified"
+                        return cached["value"]
+                    if response.status_code in RETRY_STATUSES:
+                        last_error = f"HTTP {response.status_code}"
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        response.raise_for_status()
+                        value = parse(response, config["HTTP_MAX_BYTES"])
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if etag or last_modified:
+                            state["validators"][key] = {
+                                "etag": etag,
+                                "last_modified": last_modified,
+                                "value": value,
+                            }
+                        outcome = "ok"
+                        return value
+            except (requests.HTTPError, UpstreamError, ValueError) as exc:
+                # 4xx, 크기 초과, 깨진 JSON 은 재시도해도 같다
+                raise UpstreamError(f"{source}: {exc}") from exc
+            except (requests.RequestException, urllib3.exceptions.HTTPError) as exc:
+                # 연결 오류/타임아웃 (본문을 읽다 끊긴 경우 포함)
+                UPSTREAM_TOTAL.labels(source, "error").inc()
+                last_error = str(exc)
+            if attempt < retries:
+                time.sleep(_backoff(attempt, retry_after))
+        raise UpstreamError(f"{source}: {last_error} after {retries + 1} attempts")
+    finally:
+        if outcome == "error":
+            circuit.record_failure()
+        else:
+            circuit.record_success()
+        UPSTREAM_LATENCY.labels(source, outcome).observe(time.perf_counter() - started)
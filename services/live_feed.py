@@ -0,0 +1,203 @@
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from flask import current_app
+
+# 워게임 실시간 피드 (SSE) 용 pub/sub.
+# - 같은 워커의 구독자에게는 publish 즉시 전달한다.
+# - 다른 워커/프로세스로는 공유 이벤트 로그(LIVE_FEED_DIR/events.ndjson)를 거친다.
+#   각 워커는 구독자가 있을 때만 폴러 스레드 하나로 로그 끝을 따라가며 로컬에 다시 뿌린다.
+#   마지막 구독자가 나가면 폴러는 끝나고, 다음 구독 때 로그 끝에서 다시 시작한다.
+# - coalesce_key 가 같은 이벤트는 구독자 큐에서 최신 것 하나만 남긴다 (리더보드 등).
+
+_STATE: Dict[str, Any] = {"pid": None}
+_SEQUENCE = itertools.count()
+
+
+class Subscriber:
+    def __init__(self, max_pending: int):
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[Any, Tuple[str, Any]]" = OrderedDict()
+        self._max_pending = max_pending
+
+    def push(self, event: str, data: Any, coalesce_key: Optional[str] = None) -> None:
+        key = coalesce_key if coalesce_key is not None else next(_SEQUENCE)
+        with self._cond:
+            # 같은 키는 지우고 다시 넣어 최신 값이 뒤로 가게 한다.
+            self._pending.pop(key, None)
+            self._pending[key] = (event, data)
+            while len(self._pending) > self._max_pending:
+                # 느린 클라이언트: 오래된 이벤트부터 버린다.
+                self._pending.popitem(last=False)
+            self._cond.notify()
+
+    def wait(self, timeout: float) -> List[Tuple[str, Any]]:
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            items = list(self._pending.values())
+            self._pending.clear()
+        return items
+
+
+def _feed_path(app) -> str:
+    folder = app.config["LIVE_FEED_DIR"]
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, "events.ndjson")
+
+
+def _state(app) -> Dict[str, Any]:
+    # fork 이후에는 구독자/폴러를 새로 만든다.
+    if _STATE["pid"] == os.getpid():
+        return _STATE
+    _STATE.clear()
+    _STATE.update(
+        pid=os.getpid(),
+        origin=f"{socket.gethostname()}:{os.getpid()}",
+        app=app,
+        lock=threading.Lock(),
+        subscribers=set(),
+        poller=None,
+    )
+    return _STATE
+
+
+def _dispatch(state, event: str, data: Any, coalesce_key: Optional[str]) -> None:
+    with state["lock"]:
+        subscribers = list(state["subscribers"])
+    for subscriber in subscribers:
+        subscriber.push(event, data, coalesce_key)
+
+
+def _append(app, message: Dict[str, Any]) -> None:
+    path = _feed_path(app)
+    line = json.dumps(message, ensure_ascii=False, default=str) + "\n"
+    # O_APPEND 한 번의 write 라 워커끼리 줄이 섞이지 않는다.
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(line)
+        size = fh.tell()
+    if size > app.config["LIVE_FEED_MAX_BYTES"]:
+        # 읽는 쪽은 열린 핸들로 이전 파일을 끝까지 읽은 뒤 새 파일로 넘어간다.
+        try:
+            os.replace(path, f"{path}.1")
+        except OSError:
+            pass
+
+
+def publish(event: str, data: Any, coalesce_key: Optional[str] = None) -> None:
+    app = current_app._get_current_object()
+    state = _state(app)
+    _dispatch(state, event, data, coalesce_key)
+    try:
+        _append(app, {"origin": state["origin"], "event": event, "data": data, "key": coalesce_key})
+    except OSError:
+        # 피드 전파 실패가 제출 처리를 막으면 안 된다.
+        app.logger.exception("Live feed publish failed")
+
+
+def _open_tail(path: str, from_end: bool):
+    try:
+        fh = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    if from_end:
+        fh.seek(0, os.SEEK_END)
+    return fh
+
+
+def _poll_loop(state) -> None:
+    app = state["app"]
+    path = _feed_path(app)
+    interval = app.config["LIVE_FEED_POLL_SECONDS"]
+    handle = _open_tail(path, from_end=True)
+    partial = ""
+    while True:
+        time.sleep(interval)
+        with state["lock"]:
+            # subscribe() 와 같은 락 안에서 정해야 폴러가 끝나는 사이에 들어온 구독자가 버려지지 않는다
+            if not state["subscribers"]:
+                state["poller"] = None
+                if handle is not None:
+                    handle.close()
+                return
+        if handle is not None:
+            chunk = handle.read()
+            if chunk:
+                lines = (partial + chunk).split("\n")
+                partial = lines.pop()
+                for line in lines:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if message.get("origin") == state["origin"]:
+                        continue
+                    _dispatch(state, message["event"], message["data"], message.get("key"))
+        # 로그가 회전됐으면 (inode 변경) 새 파일을 처음부터 읽는다.
+        try:
+            current_inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            continue
+        if handle is None or os.fstat(handle.fileno()).st_ino != current_inode:
+            if handle is not None:
+                handle.close()
+            handle = _open_tail(path, from_end=False)
+            partial = ""
+
+
+def _ensure_poller(state) -> None:
+    # state["lock"] 을 잡은 채로 호출한다
+    poller = state.get("poller")
+    if poller is not None and poller.is_alive():
+        return
+    poller = threading.Thread(target=_poll_loop, args=(state,), name="live-feed-poller", daemon=True)
+    poller.start()
+    state["poller"] = poller
+
+
+def subscribe() -> Optional[Subscriber]:
+    app = current_app._get_current_object()
+    state = _state(app)
+    with state["lock"]:
+        if len(state["subscribers"]) >= app.config["LIVE_FEED_MAX_CLIENTS"]:
+            return None
+        subscriber = Subscriber(app.config["LIVE_FEED_MAX_PENDING"])
+        state["subscribers"].add(subscriber)
+        _ensure_poller(state)
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber) -> None:
+    state = _STATE
+    if state.get("pid") != os.getpid():
+        return
+    with state["lock"]:
+        state["subscribers"].discard(subscriber)
+
+
+def subscriber_count() -> int:
+    if _STATE.get("pid") != os.getpid():
+        return 0
+    return len(_STATE["subscribers"])
+
+
+def stream(subscriber: Subscriber, heartbeat: float) -> Iterator[str]:
+    # 앱/DB 컨텍스트를 잡지 않는 순수 제너레이터: 유휴 연결은 대기 중인 Condition 하나뿐이다.
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            items = subscriber.wait(heartbeat)
+            if not items:
+                # 하트비트: 프록시 idle timeout 방지 + 끊긴 클라이언트 감지
+                yield ": ping\n\n"
+                continue
+            for event, data in items:
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    finally:
+        unsubscribe(subscriber)
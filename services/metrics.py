@@ -0,0 +1,210 @@
+import os
+import time
+from typing import Any, Dict, Optional
+
+from flask import before_render_template, current_app, g, has_request_context, request, template_rendered
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Total request latency",
+    ["endpoint", "method"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUEST_TOTAL = Counter(
+    "http_requests_total",
+    "Requests by endpoint and status",
+    ["endpoint", "method", "status"],
+)
+SQL_QUERIES = Histogram(
+    "http_request_sql_queries",
+    "SQL statements executed per request",
+    ["endpoint"],
+    buckets=_QUERY_BUCKETS,
+)
+SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent in SQL per request",
+    ["endpoint"],
+    buckets=_LATENCY_BUCKETS,
+)
+RENDER_DURATION = Histogram(
+    "http_request_render_duration_seconds",
+    "Time spent rendering templates per request",
+    ["endpoint"],
+    buckets=_LATENCY_BUCKETS,
+)
+SLOW_QUERIES = Counter(
+    "sql_slow_queries_total",
+    "Queries slower than SLOW_QUERY_THRESHOLD_MS",
+    ["endpoint"],
+)
+# 플래그 제출 제한 (services/submission_throttle.py)
+# 레이블 없는 Counter 는 멀티프로세스 모드에서 import 시점에 값 파일을 만들므로 다른 메트릭처럼 레이블을 둔다
+SUBMISSIONS_THROTTLED = Counter(
+    "wargame_submissions_throttled_total",
+    "Flag submissions rejected by the token bucket before touching the database",
+    ["backend"],
+)
+SUBMISSIONS_DEDUPED = Counter(
+    "wargame_submissions_deduped_total",
+    "Repeated identical wrong flags that were not recorded again",
+    ["backend"],
+)
+# 외부 API 호출 (services/http_client.py)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Upstream HTTP call latency including retries",
+    ["source", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+UPSTREAM_TOTAL = Counter(
+    "upstream_requests_total",
+    "Upstream HTTP attempts by status (304 = not modified, error = connection/timeout)",
+    ["source", "status"],
+)
+UPSTREAM_CIRCUIT_OPEN = Counter(
+    "upstream_circuit_open_total",
+    "Calls rejected because the source circuit breaker was open",
+    ["source"],
+)
+
+_LISTENERS_INSTALLED = False
+
+
+def request_stats() -> Optional[Dict[str, Any]]:
+    if not has_request_context():
+        return None
+    stats = g.get("_perf")
+    if stats is None:
+        stats = {
+            "start": time.perf_counter(),
+            "sql_count": 0,
+            "sql_time": 0.0,
+            "render_time": 0.0,
+            "render_start": None,
+            "statements": [] if current_app.config.get("SQL_RECORD_STATEMENTS", current_app.testing) else None,
+        }
+        g._perf = stats
+    return stats
+
+
+def _endpoint_label() -> str:
+    return request.endpoint or "unmatched"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = request_stats()
+    if stats is None:
+        return
+    stats["sql_count"] += 1
+    stats["sql_time"] += elapsed
+    if stats["statements"] is not None:
+        stats["statements"].append(statement)
+    threshold_ms = current_app.config.get("SLOW_QUERY_THRESHOLD_MS", 200)
+    if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+        endpoint = _endpoint_label()
+        SLOW_QUERIES.labels(endpoint).inc()
+        # 파라미터에는 FLAG/비밀번호가 들어갈 수 있으므로 statement 만 남긴다.
+        current_app.logger.warning(
+            "Slow query (%.1f ms) on %s %s [%s]: %s",
+            elapsed * 1000,
+            request.method,
+            request.path,
+            endpoint,
+            " ".join(statement.split())[:1000],
+        )
+
+
+def _on_before_render(sender, template, context, **extra):
+    stats = request_stats()
+    if stats is not None:
+        stats["render_start"] = time.perf_counter()
+
+
+def _on_rendered(sender, template, context, **extra):
+    stats = request_stats()
+    if stats is not None and stats["render_start"] is not None:
+        stats["render_time"] += time.perf_counter() - stats["render_start"]
+        stats["render_start"] = None
+
+
+def _install_listeners():
+    global _LISTENERS_INSTALLED
+    if _LISTENERS_INSTALLED:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _LISTENERS_INSTALLED = True
+
+
+def _server_timing(stats: Dict[str, Any], total: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={stats["sql_time"] * 1000:.1f};desc="{stats["sql_count"]} queries"',
+            f'render;dur={stats["render_time"] * 1000:.1f}',
+            f"total;dur={total * 1000:.1f}",
+        ]
+    )
+
+
+def init_metrics(app):
+    # 쿼리 카운트는 query_budget 에서도 쓰므로 METRICS_ENABLED 와 무관하게 설치한다.
+    _install_listeners()
+    before_render_template.connect(_on_before_render, app)
+    template_rendered.connect(_on_rendered, app)
+
+    # 다른 before_request 의 쿼리(g.user 로딩 등)까지 잡히도록 가장 먼저 등록한다.
+    @app.before_request
+    def _start_request_timer():
+        # CLI 등에서 app context 를 공유하는 경우를 대비해 요청마다 새로 시작한다.
+        g.pop("_perf", None)
+        request_stats()
+
+    @app.after_request
+    def _record_request_metrics(resp):
+        if not app.config.get("METRICS_ENABLED", True):
+            return resp
+        stats = request_stats()
+        total = time.perf_counter() - stats["start"]
+        endpoint = _endpoint_label()
+        REQUEST_LATENCY.labels(endpoint, request.method).observe(total)
+        REQUEST_TOTAL.labels(endpoint, request.method, str(resp.status_code)).inc()
+        SQL_QUERIES.labels(endpoint).observe(stats["sql_count"])
+        SQL_DURATION.labels(endpoint).observe(stats["sql_time"])
+        if stats["render_time"]:
+            RENDER_DURATION.labels(endpoint).observe(stats["render_time"])
+        if app.config.get("METRICS_SERVER_TIMING", True):
+            resp.headers["Server-Timing"] = _server_timing(stats, total)
+        return resp
+
+
+def render_metrics():
+    # gunicorn 멀티 워커: PROMETHEUS_MULTIPROC_DIR 의 워커별 파일을 합산한다.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,136 @@
+import json
+import os
+import socketserver
+import threading
+from datetime import datetime
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Set
+
+# 로컬 개발/테스트용 알림 수신기 (웹훅 + SMTP 대역).
+# 받은 알림을 NDJSON 파일에 한 줄씩 남기고, 같은 멱등 키(Idempotency-Key / Message-ID)는 한 번만 기록한다.
+#   flask --app app:create_app research notification-sink --output instance/notifications.ndjson
+#   NOTIFY_WEBHOOK_URL=http://127.0.0.1:8025/hook NOTIFY_SMTP_HOST=127.0.0.1 NOTIFY_SMTP_PORT=2525
+
+
+class _Recorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.seen: Set[str] = set()
+        self.lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def record(self, channel: str, key: str, body) -> bool:
+        with self.lock:
+            duplicate = key in self.seen
+            self.seen.add(key)
+            entry = {
+                "channel": channel,
+                "key": key,
+                "duplicate": duplicate,
+                "received_at": datetime.utcnow().isoformat(),
+                "body": body,
+            }
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return not duplicate
+
+
+def _webhook_handler(recorder: _Recorder):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self.send_response(400)
+                self.end_headers()
+                return
+            key = self.headers.get("Idempotency-Key") or ""
+            fresh = recorder.record("webhook", key, body)
+            self.send_response(200 if fresh else 208)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _smtp_handler(recorder: _Recorder):
+    # 전송 테스트에 필요한 만큼만 구현한 SMTP 서버 (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line: str):
+            self.wfile.write((line + "\r\n").encode("ascii"))
+
+        def handle(self):
+            self.reply("220 notification-sink ESMTP")
+            recipients = []
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                command = line.decode("utf-8", "replace").strip()
+                verb = command[:4].upper()
+                if verb in ("EHLO", "HELO"):
+                    self.reply("250 notification-sink")
+                elif verb == "MAIL":
+                    recipients = []
+                    self.reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[-1].strip(" <>"))
+                    self.reply("250 OK")
+                elif verb == "DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    self._receive(recipients)
+                    self.reply("250 OK")
+                elif verb in ("RSET", "NOOP"):
+                    self.reply("250 OK")
+                elif verb == "QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+        def _receive(self, recipients):
+            chunks = []
+            while True:
+                line = self.rfile.readline()
+                if not line or line in (b".\r\n", b".\n"):
+                    break
+                chunks.append(line[1:] if line.startswith(b"..") else line)
+            message = message_from_bytes(b"".join(chunks))
+            body = message.get_payload(decode=True) or b""
+            recorder.record(
+                "smtp",
+                message.get("Message-ID", ""),
+                {
+                    "to": recipients,
+                    "subject": str(make_header(decode_header(message.get("Subject", "")))),
+                    "text": body.decode(message.get_content_charset() or "utf-8", "replace"),
+                },
+            )
+
+    return Handler
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def serve(output: str, host: str = "127.0.0.1", http_port: int = 8025, smtp_port: int = 2525):
+    recorder = _Recorder(output)
+    http_server = ThreadingHTTPServer((host, http_port), _webhook_handler(recorder))
+    smtp_server = _SMTPServer((host, smtp_port), _smtp_handler(recorder))
+    threads = [
+        threading.Thread(target=server.serve_forever, daemon=True)
+        for server in (http_server, smtp_server)
+    ]
+    for thread in threads:
+        thread.start()
+    return http_server, smtp_server
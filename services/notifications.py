@@ -0,0 +1,308 @@
+import hashlib
+import json
+import random
+import smtplib
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import func
+
+from extensions import db
+from models.research import NotificationOutbox
+
+# 팀 리더 알림 (transactional outbox).
+#   요청 경로: 지원서와 같은 트랜잭션에 outbox 행만 추가한다. 네트워크 I/O 없음.
+#   워커: 대기 중인 행을 리더별로 모아 digest 한 통으로 보내고, 실패하면 지수 백오프로 재시도한다.
+# 보내기 전에 묶음 구성원을 digest_key 로 먼저 커밋해 두고, 재시도는 같은 digest_key 의 행만 다시 보낸다.
+# 그래서 전송 후 커밋 전에 워커가 죽어도 같은 키로 다시 나가 수신 측(Idempotency-Key / Message-ID)에서 걸러지고,
+# 성공한 채널은 sent_channels 에 바로 기록해 다른 채널 실패로 재시도할 때 다시 보내지 않는다.
+
+KIND_TEAM_APPLICATION = "team_application"
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+SKIPPED = "skipped"
+
+
+class DeliveryError(RuntimeError):
+    pass
+
+
+def leader_key(post) -> str:
+    return f"user:{post.owner_id}" if post.owner_id else f"post:{post.id}"
+
+
+def enqueue_team_application(application, post) -> NotificationOutbox:
+    # 커밋은 호출한 쪽에서: 지원서가 저장될 때만 알림도 남는다.
+    row = NotificationOutbox(
+        kind=KIND_TEAM_APPLICATION,
+        idempotency_key=uuid.uuid4().hex,
+        leader_key=leader_key(post),
+        recipient_email=post.notify_email,
+        payload=json.dumps(
+            {
+                "post_id": post.id,
+                "post_title": post.title,
+                "applicant_name": application.applicant_name,
+                "desired_role": application.desired_role,
+                "level": application.level,
+                "contact": application.contact,
+                "message": (application.message or "")[:500],
+                "applied_at": datetime.utcnow().replace(microsecond=0).isoformat(),
+            },
+            ensure_ascii=False,
+        ),
+    )
+    db.session.add(row)
+    return row
+
+
+# ---------------------------------------------------------------------------
+# 전송 채널
+# ---------------------------------------------------------------------------
+class WebhookTransport:
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self.timeout = timeout
+
+    def accepts(self, digest: Dict[str, Any]) -> bool:
+        return True
+
+    def send(self, digest: Dict[str, Any]) -> None:
+        import requests  # 알림 워커에서만 쓰므로 웹 워커 기동 시 불러오지 않는다
+
+        try:
+            resp = requests.post(
+                self.url,
+                json=digest,
+                headers={"Idempotency-Key": digest["key"]},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            raise DeliveryError(f"webhook: {exc}") from exc
+        if resp.status_code >= 300:
+            raise DeliveryError(f"webhook: HTTP {resp.status_code}")
+
+
+class SmtpTransport:
+    name = "smtp"
+
+    def __init__(self, host: str, port: int, sender: str, timeout: float):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    def accepts(self, digest: Dict[str, Any]) -> bool:
+        return bool(digest.get("recipient_email"))
+
+    def send(self, digest: Dict[str, Any]) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = digest["recipient_email"]
+        message["Subject"] = digest["subject"]
+        message["Date"] = formatdate(localtime=False)
+        message["Message-ID"] = f"<{digest['key']}@{self.sender.split('@')[-1]}>"
+        message.set_content(digest["text"])
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                smtp.send_message(message)
+        except (OSError, smtplib.SMTPException) as exc:
+            raise DeliveryError(f"smtp: {exc}") from exc
+
+
+def transports() -> List[Any]:
+    config = current_app.config
+    channels = []
+    if config.get("NOTIFY_WEBHOOK_URL"):
+        channels.append(WebhookTransport(config["NOTIFY_WEBHOOK_URL"], config["NOTIFY_TIMEOUT"]))
+    if config.get("NOTIFY_SMTP_HOST"):
+        channels.append(
+            SmtpTransport(
+                config["NOTIFY_SMTP_HOST"],
+                config["NOTIFY_SMTP_PORT"],
+                config["NOTIFY_MAIL_FROM"],
+                config["NOTIFY_TIMEOUT"],
+            )
+        )
+    return channels
+
+
+# ---------------------------------------------------------------------------
+# 워커
+# ---------------------------------------------------------------------------
+def digest_key(rows: List[NotificationOutbox]) -> str:
+    return hashlib.sha256(
+        ",".join(sorted(row.idempotency_key for row in rows)).encode("ascii")
+    ).hexdigest()[:40]
+
+
+def build_digest(rows: List[NotificationOutbox]) -> Dict[str, Any]:
+    items = [{**json.loads(row.payload), "idempotency_key": row.idempotency_key} for row in rows]
+    titles = []
+    for item in items:
+        if item["post_title"] not in titles:
+            titles.append(item["post_title"])
+    subject = f"[HSpace] '{titles[0]}'"
+    if len(titles) > 1:
+        subject += f" 외 {len(titles) - 1}개 팀"
+    subject += f"에 새 지원 {len(items)}건"
+    lines = []
+    for item in items:
+        role = item.get("desired_role") or "역할 미입력"
+        level = item.get("level") or "레벨 미입력"
+        lines.append(f"- [{item['post_title']}] {item['applicant_name']} ({role}, {level})")
+        if item.get("contact"):
+            lines.append(f"  연락처: {item['contact']}")
+        if item.get("message"):
+            lines.append(f"  메시지: {item['message']}")
+    return {
+        "key": rows[0].digest_key or digest_key(rows),
+        "leader": rows[0].leader_key,
+        "recipient_email": next((row.recipient_email for row in rows if row.recipient_email), None),
+        "subject": subject,
+        "text": "\n".join(lines),
+        "applications": items,
+    }
+
+
+def _backoff(attempts: int) -> timedelta:
+    config = current_app.config
+    delay = min(
+        config["NOTIFY_BACKOFF_MAX_SECONDS"],
+        config["NOTIFY_BACKOFF_SECONDS"] * 2 ** (attempts - 1),
+    )
+    # 같은 시각에 실패한 묶음들이 동시에 재시도하지 않도록 절반까지 흔든다
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def _sent_channels(rows: List[NotificationOutbox]) -> List[str]:
+    return [name for name in (rows[0].sent_channels or "").split(",") if name]
+
+
+def _claim(key: str, now: datetime) -> List[NotificationOutbox]:
+    # 여러 워커가 돌아도 같은 행을 동시에 보내지 않도록 잠근 행만 처리 (SQLite 는 무시)
+    due = (
+        NotificationOutbox.query.filter(
+            NotificationOutbox.leader_key == key,
+            NotificationOutbox.status == PENDING,
+            NotificationOutbox.next_attempt_at <= now,
+        )
+        .order_by(NotificationOutbox.id)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not due:
+        db.session.rollback()
+        return []
+    # 이미 한 번 나간(또는 나가다 멈춘) 묶음이 있으면 그 구성 그대로 다시 보낸다. 새 지원은 다음 묶음으로.
+    pinned = next((row.digest_key for row in due if row.digest_key), None)
+    if pinned:
+        rows = [row for row in due if row.digest_key == pinned]
+    else:
+        rows = due
+        pinned = digest_key(rows)
+        for row in rows:
+            row.digest_key = pinned
+    # 구성원과 임대 시각을 먼저 커밋한다. 전송 중 워커가 죽으면 첫 백오프만큼 뒤에 다른 워커가 이어받는다.
+    lease = now + timedelta(seconds=current_app.config["NOTIFY_BACKOFF_SECONDS"])
+    for row in rows:
+        row.next_attempt_at = lease
+    db.session.commit()
+    return rows
+
+
+def _deliver(rows: List[NotificationOutbox], channels, now: datetime) -> str:
+    digest = build_digest(rows)
+    targets = [channel for channel in channels if channel.accepts(digest)]
+    if not targets:
+        for row in rows:
+            row.status = SKIPPED
+            row.last_error = "전달 가능한 채널 없음"
+        return SKIPPED
+
+    errors = []
+    done = _sent_channels(rows)
+    for channel in targets:
+        if channel.name in done:
+            continue
+        try:
+            channel.send(digest)
+        except DeliveryError as exc:
+            errors.append(str(exc))
+            continue
+        # 채널마다 바로 커밋: 다음 채널이 실패하거나 워커가 죽어도 이 채널로는 다시 보내지 않는다
+        done.append(channel.name)
+        for row in rows:
+            row.sent_channels = ",".join(done)
+        db.session.commit()
+    if not errors:
+        for row in rows:
+            row.status = SENT
+            row.sent_at = now
+            row.last_error = None
+        return SENT
+
+    max_attempts = current_app.config["NOTIFY_MAX_ATTEMPTS"]
+    for row in rows:
+        row.attempts += 1
+        row.last_error = "; ".join(errors)[:1000]
+        if row.attempts >= max_attempts:
+            row.status = DEAD
+        else:
+            row.next_attempt_at = now + _backoff(row.attempts)
+    return "retry"
+
+
+def drain(batch_size: int = 100, now: Optional[datetime] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    summary = {"digests": 0, "sent": 0, "retry": 0, "dead": 0, "skipped": 0, "pending_channels": False}
+    channels = transports()
+    if not channels:
+        # 채널이 없으면 그대로 쌓아 둔다 (설정 후 다음 실행에서 전송)
+        summary["pending_channels"] = True
+        return summary
+
+    # 리더별 첫 알림이 NOTIFY_DIGEST_SECONDS 만큼 지난 뒤에 보내 그 사이 지원을 한 통으로 묶는다.
+    window = now - timedelta(seconds=current_app.config["NOTIFY_DIGEST_SECONDS"])
+    leaders = [
+        key
+        for (key,) in db.session.query(NotificationOutbox.leader_key)
+        .filter(NotificationOutbox.status == PENDING, NotificationOutbox.next_attempt_at <= now)
+        .group_by(NotificationOutbox.leader_key)
+        .having(func.min(NotificationOutbox.created_at) <= window)
+        .limit(batch_size)
+    ]
+    for key in leaders:
+        rows = _claim(key, now)
+        if not rows:
+            continue
+        result = _deliver(rows, channels, now)
+        summary["digests"] += 1
+        if result == SENT:
+            summary["sent"] += len(rows)
+        elif result == SKIPPED:
+            summary["skipped"] += len(rows)
+        else:
+            dead = sum(1 for row in rows if row.status == DEAD)
+            summary["dead"] += dead
+            summary["retry"] += len(rows) - dead
+        db.session.commit()
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
+
+
+def backlog() -> Dict[str, int]:
+    return dict(
+        db.session.query(NotificationOutbox.status, func.count(NotificationOutbox.id)).group_by(
+            NotificationOutbox.status
+        )
+    )
@@ -0,0 +1,463 @@
+import cProfile
+import glob
+import hashlib
+import hmac
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import click
+from flask import current_app, g, has_request_context, request
+from flask.cli import AppGroup
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 운영 중 프로파일링 (재배포 없이).
+#   요청 단위: ADMIN_TOKEN 으로 서명한 토큰을 X-Profile-Token 헤더나 ?_profile= 로 붙이면
+#     그 요청 하나만 cProfile(기본) 또는 샘플링 프로파일러로 실행하고 PROFILE_DIR 에 저장한다.
+#       <id>.json    요약 (상위 함수, SQL 타임라인)
+#       <id>.prof    cProfile pstats (snakeviz 등)
+#       <id>.folded  샘플링 모드의 접힌 스택 (flamegraph.pl / speedscope)
+#     응답에는 X-Profile-Id 가 붙고, X-Profile-Output: report (또는 ?_profile_output=report) 면 요약 JSON 을 대신 돌려준다.
+#     토큰은 경로와 만료 시각에 묶여 있어 URL 로 공유해도 다른 페이지에는 쓸 수 없다.
+#   전체 워커 샘플링: PROFILE_DIR/sample-request.json 을 쓰면 각 워커의 감시 스레드가 보고
+#     N초 동안 모든 스레드 스택을 샘플링해 sample-<id>-<pid>.folded 로 남긴다. merge_samples 로 합친다.
+#   gevent 워커: threading 이 greenlet 으로 패치되어 있으므로 샘플러는 패치 전 원본으로 만든 OS 스레드에서 돈다
+#     (CPU 를 잡고 있는 요청이 허브를 놓지 않아도 GIL 전환으로 샘플링된다). 요청 단위 모드는 그 요청의 greenlet 을
+#     따라간다: 실행 중이면 OS 스레드의 현재 프레임, 대기 중이면 greenlet 의 gr_frame.
+
+SAMPLE_REQUEST = "sample-request.json"
+_STATE: Dict[str, Any] = {"pid": None, "watcher": None}
+_LISTENERS_INSTALLED = False
+
+
+# ---------------------------------------------------------------------------
+# 토큰
+# ---------------------------------------------------------------------------
+def _signature(secret: str, path: str, expires: int) -> str:
+    message = f"profile|{path}|{expires}".encode("utf-8")
+    return hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+
+def make_token(path: str, ttl: Optional[int] = None) -> str:
+    # path 가 "*" 면 모든 경로
+    secret = current_app.config.get("ADMIN_TOKEN")
+    if not secret:
+        raise ValueError("ADMIN_TOKEN 이 설정되지 않았습니다.")
+    expires = int(time.time()) + (ttl or current_app.config["PROFILE_TOKEN_TTL"])
+    return f"{expires}.{'*' if path == '*' else ''}{_signature(secret, path, expires)}"
+
+
+def verify_token(token: str, path: str) -> bool:
+    secret = current_app.config.get("ADMIN_TOKEN")
+    if not secret or "." not in token:
+        return False
+    expires, signature = token.split(".", 1)
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    scope = "*" if signature.startswith("*") else path
+    return hmac.compare_digest(signature.lstrip("*"), _signature(secret, scope, int(expires)))
+
+
+# ---------------------------------------------------------------------------
+# 스택 샘플링
+# ---------------------------------------------------------------------------
+def _folded(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _original(module: str, name: str):
+    # gevent 가 패치했으면 패치 전 원본 (OS 스레드/락/sleep), 아니면 표준 함수
+    if "gevent" in sys.modules:
+        from gevent import monkey
+
+        if monkey.is_module_patched(module):
+            return monkey.get_original(module, name)
+    return getattr(sys.modules.get(module) or __import__(module), name)
+
+
+def current_target() -> Dict[str, Any]:
+    # 요청을 처리 중인 실행 단위: OS 스레드 id (+ gevent 면 greenlet)
+    target: Dict[str, Any] = {"thread_id": _original("_thread", "get_ident")(), "greenlet": None}
+    if "gevent" in sys.modules:
+        from gevent import monkey
+
+        if monkey.is_module_patched("threading"):
+            import greenlet
+
+            target["greenlet"] = greenlet.getcurrent()
+    return target
+
+
+class StackSampler:
+    # interval 마다 sys._current_frames() 로 스택을 읽어 접힌 스택 횟수를 센다.
+    # target 이 없으면 (샘플러 자신을 뺀) 모든 OS 스레드, 있으면 그 스레드/greenlet 하나.
+    def __init__(self, interval: float, target: Optional[Dict[str, Any]] = None):
+        self.interval = interval
+        self.target = target
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._running = False
+        self._done = _original("_thread", "allocate_lock")()
+
+    def _frame(self, frames):
+        glet = self.target["greenlet"]
+        if glet is not None and glet.gr_frame is not None:
+            return glet.gr_frame  # 다른 greenlet 에 양보하고 대기 중
+        return frames.get(self.target["thread_id"])
+
+    def _run(self):
+        sleep = _original("time", "sleep")
+        own = _original("_thread", "get_ident")()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        try:
+            while self._running:
+                sleep(self.interval)
+                frames = sys._current_frames()
+                if self.target is not None:
+                    frame = self._frame(frames)
+                    if frame is not None:
+                        self.counts[_folded(frame)] += 1
+                else:
+                    for ident, frame in frames.items():
+                        if ident == own:
+                            continue
+                        if ident not in names:
+                            names = {thread.ident: thread.name for thread in threading.enumerate()}
+                        self.counts[f"{names.get(ident, ident)};{_folded(frame)}"] += 1
+                self.samples += 1
+        finally:
+            self._done.release()
+
+    def start(self) -> "StackSampler":
+        self._running = True
+        self._done.acquire()
+        _original("_thread", "start_new_thread")(self._run, ())
+        return self
+
+    def stop(self) -> Counter:
+        self._running = False
+        # 네이티브 락: gevent 허브를 최대 interval 만큼 막지만 greenlet 기반 join 은 OS 스레드를 기다리지 못한다
+        self._done.acquire()
+        self._done.release()
+        return self.counts
+
+
+def _write_folded(path: str, counts: Counter) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, count in counts.most_common():
+            fh.write(f"{stack} {count}\n")
+
+
+def _top_frames(counts: Counter, limit: int = 20) -> List[Dict[str, Any]]:
+    # 가장 안쪽 프레임 기준 (self 시간에 해당)
+    leaves: Counter = Counter()
+    total = sum(counts.values()) or 1
+    for stack, count in counts.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    return [
+        {"function": name, "samples": count, "share": round(count / total, 3)}
+        for name, count in leaves.most_common(limit)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# 요청 단위 프로파일
+# ---------------------------------------------------------------------------
+def _profile_dir() -> str:
+    folder = current_app.config["PROFILE_DIR"]
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _prune(folder: str) -> None:
+    keep = current_app.config["PROFILE_KEEP"]
+    reports = sorted(glob.glob(os.path.join(folder, "req-*.json")), key=os.path.getmtime)
+    for report in reports[:-keep] if keep else []:
+        stem = report[: -len(".json")]
+        for path in (report, f"{stem}.prof", f"{stem}.folded"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and g.get("_profile") is not None:
+        conn.info.setdefault("_profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    profile = g.get("_profile")
+    starts = conn.info.get("_profile_query_start")
+    if profile is None or not starts:
+        return
+    started = starts.pop()
+    # 파라미터에는 FLAG/비밀번호가 들어갈 수 있으므로 statement 만 남긴다
+    profile["sql"].append(
+        {
+            "start_ms": round((started - profile["start"]) * 1000, 3),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "statement": " ".join(statement.split())[:2000],
+        }
+    )
+
+
+def _install_listeners() -> None:
+    global _LISTENERS_INSTALLED
+    if _LISTENERS_INSTALLED:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _LISTENERS_INSTALLED = True
+
+
+def _start_profile() -> None:
+    _ensure_watcher()
+    token = request.headers.get("X-Profile-Token") or request.args.get("_profile")
+    if not token or not verify_token(token, request.path):
+        return
+    mode = request.headers.get("X-Profile-Mode") or request.args.get("_profile_mode") or "cprofile"
+    profile = {
+        "id": f"req-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+        "mode": "sample" if mode == "sample" else "cprofile",
+        "start": time.perf_counter(),
+        "started_at": datetime.utcnow().isoformat(),
+        "sql": [],
+        "inline": (request.headers.get("X-Profile-Output") or request.args.get("_profile_output")) == "report",
+    }
+    if profile["mode"] == "sample":
+        interval = current_app.config["PROFILE_SAMPLE_INTERVAL_MS"] / 1000
+        profile["sampler"] = StackSampler(interval, current_target()).start()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # 이미 다른 프로파일러가 돌고 있음
+            return
+        profile["profiler"] = profiler
+    g._profile = profile
+
+
+def _stop_profile() -> Optional[Dict[str, Any]]:
+    profile = g.pop("_profile", None)
+    if profile is None:
+        return None
+    total = time.perf_counter() - profile["start"]
+    if "profiler" in profile:
+        profile["profiler"].disable()
+    counts = profile["sampler"].stop() if "sampler" in profile else None
+    profile["total_ms"] = round(total * 1000, 3)
+    profile["counts"] = counts
+    return profile
+
+
+def _save(profile: Dict[str, Any], status: int) -> Dict[str, Any]:
+    folder = _profile_dir()
+    stem = os.path.join(folder, profile["id"])
+    report = {
+        "id": profile["id"],
+        "mode": profile["mode"],
+        "method": request.method,
+        "path": request.full_path.rstrip("?"),
+        "endpoint": request.endpoint,
+        "status": status,
+        "pid": os.getpid(),
+        "started_at": profile["started_at"],
+        "total_ms": profile["total_ms"],
+        "sql": {
+            "count": len(profile["sql"]),
+            "total_ms": round(sum(item["duration_ms"] for item in profile["sql"]), 3),
+            "timeline": profile["sql"],
+        },
+        "files": {},
+    }
+    if "profiler" in profile:
+        profile["profiler"].dump_stats(f"{stem}.prof")
+        report["files"]["pstats"] = f"{profile['id']}.prof"
+        stats = pstats.Stats(profile["profiler"], stream=io.StringIO()).sort_stats("cumulative")
+        report["top"] = [
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in sorted(
+                stats.stats.items(), key=lambda item: item[1][3], reverse=True
+            )[:30]
+        ]
+    else:
+        _write_folded(f"{stem}.folded", profile["counts"])
+        report["files"]["folded"] = f"{profile['id']}.folded"
+        report["top"] = _top_frames(profile["counts"])
+    with open(f"{stem}.json", "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    _prune(folder)
+    return report
+
+
+def _finish_profile(resp):
+    profile = _stop_profile()
+    if profile is None:
+        return resp
+    report = _save(profile, resp.status_code)
+    if profile["inline"]:
+        resp = current_app.response_class(
+            json.dumps(report, ensure_ascii=False), status=200, mimetype="application/json"
+        )
+    resp.headers["X-Profile-Id"] = report["id"]
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+def _teardown_profile(exc):
+    # 예외로 after_request 를 건너뛴 경우에도 프로파일러는 꺼야 한다
+    if g.get("_profile") is not None:
+        _stop_profile()
+
+
+# ---------------------------------------------------------------------------
+# 전체 워커 샘플링
+# ---------------------------------------------------------------------------
+def request_sample(seconds: float, interval_ms: Optional[float] = None) -> Dict[str, Any]:
+    config = current_app.config
+    seconds = max(1.0, min(float(seconds), config["PROFILE_MAX_SAMPLE_SECONDS"]))
+    sample = {
+        "id": f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}",
+        "until": time.time() + seconds,
+        "interval_ms": interval_ms or config["PROFILE_SAMPLE_INTERVAL_MS"],
+    }
+    path = os.path.join(_profile_dir(), SAMPLE_REQUEST)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(sample, fh)
+    os.replace(tmp_path, path)
+    return sample
+
+
+def merge_samples(sample_id: str) -> Optional[Dict[str, Any]]:
+    folder = _profile_dir()
+    counts: Counter = Counter()
+    parts = sorted(glob.glob(os.path.join(folder, f"sample-{sample_id}-*.folded")))
+    for part in parts:
+        pid = part.rsplit("-", 1)[-1].split(".")[0]
+        with open(part, encoding="utf-8") as fh:
+            for line in fh:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack and count.isdigit():
+                    counts[f"pid {pid};{stack}"] += int(count)
+    if not parts:
+        return None
+    merged = os.path.join(folder, f"sample-{sample_id}.folded")
+    _write_folded(merged, counts)
+    return {
+        "id": sample_id,
+        "workers": len(parts),
+        "samples": sum(counts.values()),
+        "file": os.path.basename(merged),
+        "top": _top_frames(counts),
+    }
+
+
+def _watch(folder: str, poll: float) -> None:
+    path = os.path.join(folder, SAMPLE_REQUEST)
+    seen = None
+    try:
+        # 감시 시작 전에 있던 요청은 무시한다 (재시작한 워커가 지난 요청을 다시 실행하지 않도록)
+        with open(path, encoding="utf-8") as fh:
+            seen = json.load(fh).get("id")
+    except (OSError, ValueError):
+        pass
+    while True:
+        time.sleep(poll)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                sample = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        if sample.get("id") == seen:
+            continue
+        seen = sample.get("id")
+        remaining = sample["until"] - time.time()
+        if remaining <= 0:
+            continue
+        sampler = StackSampler(sample["interval_ms"] / 1000).start()
+        time.sleep(remaining)
+        counts = sampler.stop()
+        part = os.path.join(folder, f"sample-{seen}-{os.getpid()}.folded")
+        _write_folded(f"{part}.tmp", counts)
+        os.replace(f"{part}.tmp", part)
+
+
+def _ensure_watcher() -> None:
+    if _STATE["pid"] == os.getpid():
+        return
+    _STATE["pid"] = os.getpid()
+    if not current_app.config.get("ADMIN_TOKEN") or not current_app.config["PROFILE_SAMPLER_ENABLED"]:
+        return
+    thread = threading.Thread(
+        target=_watch,
+        args=(_profile_dir(), current_app.config["PROFILE_SAMPLER_POLL_SECONDS"]),
+        name="profile-watcher",
+        daemon=True,
+    )
+    thread.start()
+    _STATE["watcher"] = thread
+
+
+def init_profiling(app) -> None:
+    _install_listeners()
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_teardown_profile)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+profile_cli = AppGroup("profile", help="운영 프로파일링 (요청 단위 토큰, 전체 워커 샘플링)")
+
+
+@profile_cli.command("token")
+@click.option("--path", default="*", show_default=True, help="프로파일할 경로 (예: /research, * 는 전체)")
+@click.option("--ttl", type=int, default=None, help="유효 시간(초), 기본 PROFILE_TOKEN_TTL")
+def token_command(path, ttl):
+    try:
+        token = make_token(path, ttl)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(token)
+    example = "/" if path == "*" else path
+    click.echo(
+        f"예: curl -H 'X-Profile-Token: {token}' -H 'X-Profile-Output: report' http://localhost:5000{example}",
+        err=True,
+    )
+
+
+@profile_cli.command("sample")
+@click.option("--seconds", type=float, default=10, show_default=True)
+@click.option("--interval-ms", type=float, default=None, help="샘플 간격, 기본 PROFILE_SAMPLE_INTERVAL_MS")
+def sample_command(seconds, interval_ms):
+    # 같은 PROFILE_DIR 을 보는 모든 워커가 샘플링한 뒤 결과를 합친다
+    sample = request_sample(seconds, interval_ms)
+    wait = sample["until"] - time.time() + current_app.config["PROFILE_SAMPLER_POLL_SECONDS"] * 2 + 1
+    click.echo(f"샘플링 {sample['id']}: {wait:.0f}초 대기 중...", err=True)
+    time.sleep(max(0.0, wait))
+    result = merge_samples(sample["id"])
+    if result is None:
+        raise click.ClickException("응답한 워커가 없습니다 (ADMIN_TOKEN, PROFILE_DIR 공유 여부를 확인하세요).")
+    click.echo(json.dumps(result, ensure_ascii=False, indent=2))
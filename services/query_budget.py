@@ -0,0 +1,158 @@
+import functools
+import re
+import sys
+from collections import Counter
+
+import click
+from flask import current_app, make_response, url_for
+from flask.cli import AppGroup
+from sqlalchemy import func
+
+from extensions import db
+from services.metrics import request_stats
+
+_LITERAL_RE = re.compile(r"\b\d+\b|'[^']*'")
+_IN_LIST_RE = re.compile(r"IN \((?:\?|%s|__\[POSTCOMPILE_\w+\])(?:, ?(?:\?|%s))*\)")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def _enforcing() -> bool:
+    return current_app.config.get("QUERY_BUDGET_ENFORCE", current_app.testing)
+
+
+def _normalize(statement: str) -> str:
+    statement = " ".join(statement.split())
+    statement = _IN_LIST_RE.sub("IN (?)", statement)
+    return _LITERAL_RE.sub("?", statement)
+
+
+def _repeated_statement(statements):
+    if not statements:
+        return None, 0
+    statement, count = Counter(_normalize(s) for s in statements).most_common(1)[0]
+    return statement, count
+
+
+def _report(message: str) -> None:
+    if _enforcing():
+        raise QueryBudgetExceeded(message)
+    current_app.logger.warning(message)
+
+
+def query_budget(limit: int):
+    # 뷰 함수(템플릿 렌더링 포함)가 실행하는 SQL 수를 제한한다.
+    # 테스트 모드에서는 예외, 운영에서는 경고 로그만 남긴다.
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            stats = request_stats()
+            start_count = stats["sql_count"]
+            recorded = stats["statements"]
+            start_index = len(recorded) if recorded is not None else 0
+
+            resp = make_response(view(*args, **kwargs))
+
+            used = stats["sql_count"] - start_count
+            endpoint = view.__name__
+            if used > limit:
+                _report(f"Query budget exceeded in {endpoint}: {used} > {limit}")
+            if recorded is not None:
+                statement, count = _repeated_statement(recorded[start_index:])
+                threshold = current_app.config.get("NPLUSONE_THRESHOLD", 3)
+                if count > threshold:
+                    _report(
+                        f"Possible N+1 in {endpoint}: same statement ran {count} times: {statement[:300]}"
+                    )
+            if _enforcing():
+                resp.headers["X-Query-Budget"] = f"{used}/{limit}"
+            return resp
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorator
+
+
+perf_cli = AppGroup("perf", help="성능 점검용 데이터/쿼리 예산 도구")
+
+
+@perf_cli.command("seed")
+@click.option("--users", type=int, default=None)
+@click.option("--challenges", type=int, default=None)
+@click.option("--attempts", type=int, default=None)
+@click.option("--competitions", type=int, default=None)
+@click.option("--posts", type=int, default=None)
+@click.option("--applications", type=int, default=None)
+@click.option("--seed", "seed_value", type=int, default=42, show_default=True)
+@click.option("--prefix", default="seed", show_default=True)
+def seed_command(seed_value, prefix, **scale):
+    from services.datagen import generate
+
+    db.create_all()
+    created = generate(seed=seed_value, prefix=prefix, **scale)
+    for name, count in created.items():
+        click.echo(f"{name}: {count}")
+
+
+def _sample_url_args(arguments):
+    from models.research import TeamApplication, TeamPost
+
+    values = {}
+    for name in arguments:
+        if name == "post_id":
+            # 지원자가 가장 많은 팀 = 최악의 경우
+            busiest = (
+                db.session.query(TeamApplication.post_id)
+                .group_by(TeamApplication.post_id)
+                .order_by(func.count(TeamApplication.id).desc())
+                .first()
+            )
+            values[name] = busiest[0] if busiest else db.session.query(func.min(TeamPost.id)).scalar()
+        else:
+            values[name] = 1
+    return values
+
+
+@perf_cli.command("check-budgets")
+@click.option("--cold", is_flag=True, help="워밍업 없이 (스키마/시드 확인, 캐시 적재를 첫 요청이 떠안는 상태) 측정")
+def check_budgets_command(cold):
+    from models.user import User
+    from services.startup import warm_up
+
+    app = current_app._get_current_object()
+    if not cold:
+        # gunicorn 은 요청을 받기 전에 워밍업한다 (gunicorn.conf.py) -> 같은 상태에서 잰다
+        warm_up(app)
+    app.config.update(TESTING=True, QUERY_BUDGET_ENFORCE=True, SQL_RECORD_STATEMENTS=True)
+    user = User.query.order_by(User.id).first()
+    if user is None:
+        raise click.ClickException("사용자가 없습니다. 먼저 `flask perf seed` 를 실행하세요.")
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+
+    failures = 0
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        limit = getattr(app.view_functions[rule.endpoint], "query_budget", None)
+        if limit is None or "GET" not in rule.methods:
+            continue
+        with app.test_request_context():
+            url = url_for(rule.endpoint, **_sample_url_args(rule.arguments))
+        try:
+            resp = client.get(url)
+        except QueryBudgetExceeded as exc:
+            failures += 1
+            click.echo(f"FAIL {url}: {exc}")
+            continue
+        if not 200 <= resp.status_code < 300:
+            # 에러 페이지/리다이렉트는 쿼리를 거의 안 쓰므로 예산 안이라도 통과시키면 안 된다
+            failures += 1
+            click.echo(f"FAIL {url}: status {resp.status_code}")
+            continue
+        click.echo(f"ok   {url}: {resp.status_code} queries {resp.headers.get('X-Query-Budget', '?')}")
+    if failures:
+        sys.exit(1)
@@ -0,0 +1,276 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app
+from sqlalchemy import func
+
+from extensions import db
+from models.wargame import WargameChallenge, WargameRecommendation, WargameSolve
+
+# numpy/scipy.sparse 는 배치 계산(refresh)에서만 쓰므로 처음 쓸 때 불러온다. 요청 경로는 저장된 행만 읽는다.
+np = None
+sparse = None
+_NUMERIC_LOADED = False
+
+# "다음에 풀 문제" 추천.
+#   협업 필터링: 사용자 x 문제 풀이 행렬로 문제-문제 코사인 유사도를 구하고,
+#               사용자가 푼 문제들과 비슷한 문제에 점수를 준다.
+#   카테고리 선호: 사용자가 푼 문제의 카테고리 비율
+#   난이도 진행: 현재 단계(초급→중급→고급) 에 가까운 난이도 우대
+# 결과는 사용자별 top-k 를 한 행(JSON)으로 저장하므로 조회는 PK 한 번이다.
+
+DIFFICULTIES = ["초급", "중급", "고급"]
+WEIGHTS = {"similar": 0.5, "category": 0.25, "difficulty": 0.25}
+REASONS = {
+    "similar": "비슷한 문제를 푼 사용자들이 풀었어요",
+    "category": "자주 푸는 카테고리예요",
+    "difficulty": "다음 단계 난이도예요",
+}
+COLD_START_USER = 0
+
+
+def _load_numeric() -> None:
+    global np, sparse, _NUMERIC_LOADED
+    if _NUMERIC_LOADED:
+        return
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - requirements.txt 에 포함
+        pass
+    try:
+        from scipy import sparse
+    except ImportError:  # scipy 가 없으면 dense 행렬로 계산
+        pass
+    _NUMERIC_LOADED = True
+
+
+def _require_numpy():
+    _load_numeric()
+    if np is None:
+        raise RuntimeError("추천 계산에는 numpy 가 필요합니다 (pip install numpy).")
+
+
+def get_recommendations(user_id: Optional[int]) -> List[Dict[str, Any]]:
+    # 요청 경로: PK 조회 한 번 (본인 행 + 기본 추천 행). 아직 계산 전이면 기본 추천을 쓴다.
+    rows = {
+        row_user_id: items
+        for row_user_id, items in db.session.query(
+            WargameRecommendation.user_id, WargameRecommendation.items
+        ).filter(WargameRecommendation.user_id.in_([user_id or COLD_START_USER, COLD_START_USER]))
+    }
+    items = rows.get(user_id) or rows.get(COLD_START_USER)
+    return json.loads(items) if items else []
+
+
+def _load_challenges():
+    rows = db.session.query(
+        WargameChallenge.id,
+        WargameChallenge.title,
+        WargameChallenge.difficulty,
+        WargameChallenge.category,
+        WargameChallenge.solve_count,
+    ).order_by(WargameChallenge.id)
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "difficulty": row.difficulty,
+            "category": row.category or "Misc",
+            "solve_count": row.solve_count or 0,
+        }
+        for row in rows
+    ]
+
+
+class _Model:
+    # 한 번의 갱신 동안 쓰는 전체 풀이 행렬과 문제 유사도
+    def __init__(self, challenges, solves):
+        self.challenges = challenges
+        self.column = {item["id"]: index for index, item in enumerate(challenges)}
+        user_ids = sorted({user_id for user_id, _ in solves})
+        self.row = {user_id: index for index, user_id in enumerate(user_ids)}
+
+        pairs = [
+            (self.row[user_id], self.column[challenge_id])
+            for user_id, challenge_id in solves
+            if challenge_id in self.column
+        ]
+        rows = np.array([row for row, _ in pairs], dtype=np.int64)
+        cols = np.array([col for _, col in pairs], dtype=np.int64)
+        shape = (len(user_ids), len(challenges))
+        data = np.ones(len(rows), dtype=np.float32)
+        if sparse is not None:
+            self.matrix = sparse.csr_matrix((data, (rows, cols)), shape=shape)
+            co = (self.matrix.T @ self.matrix).toarray()
+        else:
+            self.matrix = np.zeros(shape, dtype=np.float32)
+            self.matrix[rows, cols] = 1.0
+            co = self.matrix.T @ self.matrix
+        norms = np.sqrt(np.diag(co))
+        denom = np.outer(norms, norms)
+        self.similarity = np.divide(co, denom, out=np.zeros_like(co, dtype=np.float32), where=denom > 0)
+        np.fill_diagonal(self.similarity, 0.0)
+
+        categories = sorted({item["category"] for item in challenges})
+        category_index = {name: index for index, name in enumerate(categories)}
+        self.category_of = np.array(
+            [category_index[item["category"]] for item in challenges], dtype=np.int64
+        )
+        self.category_onehot = np.zeros((len(challenges), len(categories)), dtype=np.float32)
+        self.category_onehot[np.arange(len(challenges)), self.category_of] = 1.0
+        self.difficulty_of = np.array(
+            [
+                DIFFICULTIES.index(item["difficulty"]) if item["difficulty"] in DIFFICULTIES else 1
+                for item in challenges
+            ],
+            dtype=np.float32,
+        )
+        popularity = np.array([item["solve_count"] for item in challenges], dtype=np.float32)
+        peak = popularity.max() if popularity.size else 0
+        self.popularity = popularity / peak if peak > 0 else popularity
+
+    def _solved(self, user_ids):
+        rows = [self.row[user_id] for user_id in user_ids]
+        solved = self.matrix[rows]
+        return solved.toarray() if sparse is not None else solved
+
+    def score(self, user_ids: List[int], progress_solves: int):
+        solved = self._solved(user_ids)
+        counts = solved.sum(axis=1, keepdims=True)
+
+        similar = solved @ self.similarity
+        peak = similar.max(axis=1, keepdims=True)
+        similar = np.divide(similar, peak, out=np.zeros_like(similar), where=peak > 0)
+
+        per_category = solved @ self.category_onehot
+        category_share = np.divide(
+            per_category,
+            counts,
+            out=np.zeros(per_category.shape, dtype=np.float32),
+            where=counts > 0,
+        )
+        category = category_share[:, self.category_of]
+
+        # 가장 높은 난이도에서 progress_solves 문제 이상 풀었으면 한 단계 위를 목표로 한다.
+        top_level = len(DIFFICULTIES) - 1
+        per_level = np.stack(
+            [(solved * (self.difficulty_of == level)).sum(axis=1) for level in range(top_level + 1)],
+            axis=1,
+        )
+        reached = np.where(per_level > 0, np.arange(top_level + 1), -1).max(axis=1)
+        reached_count = np.take_along_axis(per_level, np.clip(reached, 0, None)[:, None], axis=1)[:, 0]
+        target = np.where(
+            reached < 0, 0, np.minimum(reached + (reached_count >= progress_solves), top_level)
+        )
+        difficulty = 1.0 - np.abs(self.difficulty_of[None, :] - target[:, None]) / top_level
+
+        parts = {"similar": similar, "category": category, "difficulty": difficulty}
+        total = sum(WEIGHTS[name] * value for name, value in parts.items())
+        total = np.where(solved > 0, -np.inf, total)
+        return total, parts
+
+    def top_k(self, total, parts, k: int) -> List[List[Dict[str, Any]]]:
+        k = min(k, total.shape[1])
+        if k <= 0:
+            return [[] for _ in range(total.shape[0])]
+        candidates = np.argpartition(-total, k - 1, axis=1)[:, :k]
+        results = []
+        for row_index, columns in enumerate(candidates):
+            columns = columns[np.argsort(-total[row_index, columns], kind="stable")]
+            items = []
+            for column in columns:
+                value = float(total[row_index, column])
+                if not np.isfinite(value):
+                    continue
+                reason = max(parts, key=lambda name: WEIGHTS[name] * parts[name][row_index, column])
+                items.append(self._item(column, value, reason))
+            results.append(items)
+        return results
+
+    def cold_start(self, k: int) -> List[Dict[str, Any]]:
+        # 풀이 기록이 없으면 초급 위주 + 많이 풀린 문제
+        score = 0.5 * (1.0 - self.difficulty_of / (len(DIFFICULTIES) - 1)) + 0.5 * self.popularity
+        columns = np.argsort(-score, kind="stable")[:k]
+        return [self._item(column, float(score[column]), "difficulty") for column in columns]
+
+    def _item(self, column, value, reason) -> Dict[str, Any]:
+        challenge = self.challenges[int(column)]
+        return {
+            "id": challenge["id"],
+            "title": challenge["title"],
+            "difficulty": challenge["difficulty"],
+            "category": challenge["category"],
+            "score": round(value, 4),
+            "reason": REASONS[reason],
+        }
+
+
+def _stale_users(full: bool) -> Dict[int, int]:
+    # user_id -> 최신 풀이 id. 저장된 last_solve_id 보다 새 풀이가 있는 사용자만 다시 계산한다.
+    latest = dict(
+        db.session.query(WargameSolve.user_id, func.max(WargameSolve.id)).group_by(WargameSolve.user_id)
+    )
+    if full:
+        return latest
+    seen = dict(
+        db.session.query(WargameRecommendation.user_id, WargameRecommendation.last_solve_id)
+    )
+    return {user_id: solve_id for user_id, solve_id in latest.items() if seen.get(user_id, 0) < solve_id}
+
+
+def _save(rows: Iterable[Dict[str, Any]]) -> None:
+    rows = list(rows)
+    if not rows:
+        return
+    user_ids = [row["user_id"] for row in rows]
+    db.session.execute(
+        db.delete(WargameRecommendation).where(WargameRecommendation.user_id.in_(user_ids))
+    )
+    db.session.execute(db.insert(WargameRecommendation), rows)
+
+
+def refresh(full: bool = False, k: Optional[int] = None, chunk_size: int = 2000) -> Dict[str, Any]:
+    _require_numpy()
+    started = time.perf_counter()
+    config = current_app.config
+    k = k or config["RECOMMENDATION_TOP_K"]
+    progress_solves = config["RECOMMENDATION_PROGRESS_SOLVES"]
+
+    stale = _stale_users(full)
+    challenges = _load_challenges()
+    solves = db.session.query(WargameSolve.user_id, WargameSolve.challenge_id).all()
+    model = _Model(challenges, solves)
+    now = datetime.utcnow()
+
+    _save(
+        [
+            {
+                "user_id": COLD_START_USER,
+                "items": json.dumps(model.cold_start(k), ensure_ascii=False),
+                "last_solve_id": 0,
+                "computed_at": now,
+            }
+        ]
+    )
+    user_ids = sorted(user_id for user_id in stale if user_id in model.row)
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        total, parts = model.score(chunk, progress_solves)
+        _save(
+            {
+                "user_id": user_id,
+                "items": json.dumps(items, ensure_ascii=False),
+                "last_solve_id": stale[user_id],
+                "computed_at": now,
+            }
+            for user_id, items in zip(chunk, model.top_k(total, parts, k))
+        )
+    db.session.commit()
+    return {
+        "users": len(user_ids),
+        "challenges": len(challenges),
+        "solves": len(solves),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
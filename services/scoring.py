@@ -0,0 +1,240 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.wargame import WargameAttempt, WargameChallenge, WargameSolve, WargameUserScore
+from services.startup import on_warm_up
+
+# CTFd 방식 동적 점수.
+#   value(n) = initial + (minimum - initial) / decay^2 * (n - 1)^2   (n = 풀이한 사용자 수)
+# 첫 풀이자는 initial 을 받고, decay 명째 풀이부터는 minimum 으로 고정된다.
+# 풀이가 생기면 문제 점수가 바뀐 만큼(delta)을 기존 풀이자 총점에 UPDATE 한 번으로 반영한다.
+
+
+def challenge_value(initial: int, minimum: int, decay: int, solves: int) -> int:
+    if not decay or solves <= 1:
+        return initial
+    value = initial + (minimum - initial) / (decay ** 2) * ((solves - 1) ** 2)
+    return max(minimum, math.ceil(value))
+
+
+def points_for_difficulty(difficulty: str) -> int:
+    table = current_app.config["WARGAME_DIFFICULTY_POINTS"]
+    return table.get(difficulty, table.get("중급", 100))
+
+
+def scoring_params(initial: int) -> Dict[str, int]:
+    config = current_app.config
+    return {
+        "initial_points": initial,
+        "minimum_points": max(1, math.ceil(initial * config["WARGAME_SCORE_MINIMUM_RATIO"])),
+        "decay_solves": config["WARGAME_SCORE_DECAY"],
+    }
+
+
+def _params(row) -> Dict[str, int]:
+    # 마이그레이션 전 문제는 현재 reward_points 를 시작 점수로 본다.
+    if row.initial_points is None:
+        params = scoring_params(row.reward_points or 0)
+    else:
+        params = {
+            "initial_points": row.initial_points,
+            "minimum_points": row.minimum_points if row.minimum_points is not None else row.initial_points,
+            "decay_solves": row.decay_solves or 0,
+        }
+    return params
+
+
+def _add_user_points(user_id: int, points: int, solved_at: datetime) -> None:
+    updated = db.session.execute(
+        db.update(WargameUserScore)
+        .where(WargameUserScore.user_id == user_id)
+        .values(
+            points=WargameUserScore.points + points,
+            solves=WargameUserScore.solves + 1,
+            last_solve_at=solved_at,
+        )
+    ).rowcount
+    if not updated:
+        db.session.add(
+            WargameUserScore(user_id=user_id, points=points, solves=1, last_solve_at=solved_at)
+        )
+
+
+def _record_solve_once(challenge_id: int, user_id: int, solved_at: datetime) -> Optional[Dict[str, Any]]:
+    # 문제 행을 잠가 같은 문제의 동시 풀이가 같은 solve_count 를 읽지 않게 한다.
+    row = (
+        db.session.query(
+            WargameChallenge.reward_points,
+            WargameChallenge.initial_points,
+            WargameChallenge.minimum_points,
+            WargameChallenge.decay_solves,
+            WargameChallenge.solve_count,
+        )
+        .filter(WargameChallenge.id == challenge_id)
+        .with_for_update()
+        .first()
+    )
+    if row is None:
+        return None
+    already = (
+        db.session.query(WargameSolve.id)
+        .filter(WargameSolve.challenge_id == challenge_id, WargameSolve.user_id == user_id)
+        .first()
+    )
+    if already:
+        return None
+
+    params = _params(row)
+    solves = (row.solve_count or 0) + 1
+    old_value = row.reward_points if row.reward_points is not None else params["initial_points"]
+    new_value = challenge_value(
+        params["initial_points"], params["minimum_points"], params["decay_solves"], solves
+    )
+    delta = new_value - old_value
+    if delta and solves > 1:
+        # 기존 풀이자 전원의 총점을 한 번에 보정 (새 풀이 행을 넣기 전이라 본인은 제외됨)
+        db.session.execute(
+            db.update(WargameUserScore)
+            .where(
+                WargameUserScore.user_id.in_(
+                    select(WargameSolve.user_id).where(WargameSolve.challenge_id == challenge_id)
+                )
+            )
+            .values(points=WargameUserScore.points + delta)
+            .execution_options(synchronize_session=False)
+        )
+    db.session.add(WargameSolve(challenge_id=challenge_id, user_id=user_id, created_at=solved_at))
+    db.session.execute(
+        db.update(WargameChallenge)
+        .where(WargameChallenge.id == challenge_id)
+        .values(reward_points=new_value, solve_count=solves, **params)
+    )
+    _add_user_points(user_id, new_value, solved_at)
+    db.session.commit()
+    return {"value": new_value, "delta": delta, "solves": solves, "first_blood": solves == 1}
+
+
+def record_solve(challenge_id: int, user_id: int, solved_at: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    # 새 풀이면 {"value", "delta", "solves", "first_blood"}, 이미 푼 문제면 None
+    solved_at = solved_at or datetime.utcnow()
+    for _ in range(2):
+        try:
+            return _record_solve_once(int(challenge_id), user_id, solved_at)
+        except IntegrityError:
+            # 같은 사용자의 동시 제출: 다시 읽으면 이미 푼 문제이거나 점수 행이 생겨 있다.
+            db.session.rollback()
+    return None
+
+
+def _expected_totals():
+    return (
+        db.session.query(
+            WargameSolve.user_id,
+            func.sum(WargameChallenge.reward_points),
+            func.count(WargameSolve.id),
+            func.max(WargameSolve.created_at),
+        )
+        .join(WargameChallenge, WargameChallenge.id == WargameSolve.challenge_id)
+        .group_by(WargameSolve.user_id)
+    )
+
+
+def backfill_solves() -> int:
+    # 예전 정답 기록 중 wargame_solves 에 없는 (사용자, 문제) 의 첫 정답을 채운다.
+    missing = (
+        select(
+            WargameAttempt.challenge_id,
+            WargameAttempt.user_id,
+            func.min(WargameAttempt.created_at),
+        )
+        .where(
+            WargameAttempt.is_correct.is_(True),
+            WargameAttempt.user_id.is_not(None),
+            ~select(WargameSolve.id)
+            .where(
+                WargameSolve.challenge_id == WargameAttempt.challenge_id,
+                WargameSolve.user_id == WargameAttempt.user_id,
+            )
+            .exists(),
+        )
+        .group_by(WargameAttempt.challenge_id, WargameAttempt.user_id)
+    )
+    result = db.session.execute(
+        db.insert(WargameSolve).from_select(["challenge_id", "user_id", "created_at"], missing)
+    )
+    return result.rowcount or 0
+
+
+def recompute_all() -> Dict[str, int]:
+    # 검증/복구용 전체 재계산: 풀이 기록에서 문제 점수와 사용자 총점을 새로 만든다.
+    backfilled = backfill_solves()
+    counts = dict(
+        db.session.query(WargameSolve.challenge_id, func.count(WargameSolve.id)).group_by(
+            WargameSolve.challenge_id
+        )
+    )
+    updates = []
+    for row in db.session.query(
+        WargameChallenge.id,
+        WargameChallenge.reward_points,
+        WargameChallenge.initial_points,
+        WargameChallenge.minimum_points,
+        WargameChallenge.decay_solves,
+    ):
+        params = _params(row)
+        solves = counts.get(row.id, 0)
+        value = challenge_value(
+            params["initial_points"], params["minimum_points"], params["decay_solves"], solves
+        )
+        updates.append({"id": row.id, "reward_points": value, "solve_count": solves, **params})
+    if updates:
+        db.session.execute(db.update(WargameChallenge), updates)
+
+    db.session.execute(db.delete(WargameUserScore))
+    db.session.execute(
+        db.insert(WargameUserScore).from_select(
+            ["user_id", "points", "solves", "last_solve_at"], _expected_totals()
+        )
+    )
+    db.session.commit()
+    users = db.session.query(func.count(WargameUserScore.user_id)).scalar() or 0
+    return {"backfilled": backfilled, "challenges": len(updates), "users": users}
+
+
+@on_warm_up("wargame_scores", order=5)
+def backfill_if_needed() -> Optional[Dict[str, int]]:
+    # 동적 점수 도입 전 DB: 정답 기록은 있는데 풀이 기록이 비어 있으면 한 번 전체 재계산한다.
+    # (안 하면 solve_count/총점이 0 이고, 예전에 푼 사용자의 재제출이 새 풀이로 처리된다)
+    if db.session.query(WargameSolve.id).first() is not None:
+        return None
+    if db.session.query(WargameAttempt.id).filter(WargameAttempt.is_correct.is_(True)).first() is None:
+        return None
+    result = recompute_all()
+    current_app.logger.info("scores backfilled from existing attempts: %s", result)
+    return result
+
+
+def verify() -> List[Dict[str, Any]]:
+    # 캐시된 총점과 풀이 기록으로 계산한 총점이 다른 사용자 목록
+    cached = {
+        user_id: (points, solves)
+        for user_id, points, solves in db.session.query(
+            WargameUserScore.user_id, WargameUserScore.points, WargameUserScore.solves
+        )
+    }
+    mismatches = []
+    for user_id, points, solves, _ in _expected_totals():
+        expected = (int(points or 0), int(solves))
+        actual = cached.pop(user_id, None)
+        if actual != expected:
+            mismatches.append({"user_id": user_id, "cached": actual, "expected": expected})
+    for user_id, actual in cached.items():
+        if actual != (0, 0):
+            mismatches.append({"user_id": user_id, "cached": actual, "expected": None})
+    return mismatches
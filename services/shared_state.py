@@ -0,0 +1,73 @@
+import os
+from typing import Any, Callable, Dict
+
+from flask import current_app
+
+from extensions import limiter
+
+# 복제본(컨테이너/노드) 사이에 공유해야 하는 상태와 그 저장소.
+#   파일 (SHARED_STATE_DIR): 캐시 버전 스탬프, 실시간 피드 로그, 제출 제한 mmap 테이블.
+#     같은 호스트의 복제본끼리는 공유 볼륨 하나로 충분하다 (mmap/flock 은 네트워크 파일시스템에서는 쓰지 말 것).
+#   Redis (REDIS_URL): 호스트가 여러 대면 CACHE_BUS_BACKEND=redis, SUBMIT_THROTTLE_BACKEND=redis.
+#   요청 제한: RATELIMIT_STORAGE_URI (memory:// 는 워커마다 따로 센다)
+#   세션: 서명 쿠키라 서버 쪽 상태가 없다. 모든 복제본이 같은 SECRET_KEY 를 써야 한다.
+#   업로드: RESEARCH_UPLOAD_FOLDER / WARGAME_UPLOAD_FOLDER 를 모든 복제본이 같은 볼륨으로 마운트한다.
+
+_STATE: Dict[str, Any] = {"pid": None, "client": None}
+
+
+def redis_client():
+    # 프로세스당 연결 풀 하나 (fork 후에는 새로 만든다). redis 패키지는 쓸 때만 불러온다.
+    pid = os.getpid()
+    if _STATE["pid"] != pid:
+        url = current_app.config.get("REDIS_URL")
+        if not url:
+            raise RuntimeError("REDIS_URL 이 설정되지 않았습니다.")
+        import redis
+
+        _STATE.update(
+            pid=pid,
+            client=redis.Redis.from_url(
+                url,
+                socket_timeout=current_app.config["REDIS_TIMEOUT"],
+                socket_connect_timeout=current_app.config["REDIS_TIMEOUT"],
+                health_check_interval=30,
+            ),
+        )
+    return _STATE["client"]
+
+
+def _dir_writable() -> bool:
+    folder = current_app.config["SHARED_STATE_DIR"]
+    os.makedirs(folder, exist_ok=True)
+    return os.access(folder, os.W_OK)
+
+
+def replicated() -> bool:
+    # 공유 백엔드를 하나라도 켰으면 여러 복제본으로 돌리는 설정으로 본다
+    config = current_app.config
+    return bool(
+        config.get("REDIS_URL")
+        or config["CACHE_BUS_BACKEND"] == "redis"
+        or config["SUBMIT_THROTTLE_BACKEND"] == "redis"
+        or not config["RATELIMIT_STORAGE_URI"].startswith("memory://")
+    )
+
+
+def _secret_key_shared() -> bool:
+    if current_app.config.get("SECRET_KEY_GENERATED"):
+        raise RuntimeError("SECRET_KEY is not set; every process signs sessions with its own random key")
+    return True
+
+
+def checks() -> Dict[str, Callable[[], bool]]:
+    # /readyz 용: 설정된 공유 저장소에 실제로 닿는지 (이름 -> 확인 함수)
+    config = current_app.config
+    found: Dict[str, Callable[[], bool]] = {"shared_dir": _dir_writable}
+    if replicated():
+        found["secret_key"] = _secret_key_shared
+    if config.get("REDIS_URL"):
+        found["redis"] = lambda: redis_client().ping()
+    if not config["RATELIMIT_STORAGE_URI"].startswith("memory://"):
+        found["rate_limit_storage"] = lambda: limiter.storage.check()
+    return found
@@ -0,0 +1,251 @@
+import json
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import false, literal, select, union_all
+
+from extensions import db
+from models.wargame import WargameAttempt, WargameChallengeStats, WargameChallengeUserRollup, WargameUserScore
+from services import cache_bus
+from services.startup import on_warm_up
+
+# 문제별 실제 난이도 분석.
+# 시도 기록을 (문제, 사용자, 시각) 순으로 yield_per 스트리밍하며 (사용자, 문제) 쌍 하나씩만 상태로 들고,
+# 문제별로는 분포 스케치와 카운터만 유지한다 -> 메모리는 테이블 크기가 아니라 문제 수에 비례.
+# 보존 기간이 지나 압축된 오답은 (문제, 사용자) 롤업 행 하나로 스트림에 끼워 넣는다 (weight = 압축된 시도 수).
+
+CACHE_NAME = "challenge_stats"
+TIERS = [("상위 10%", 0.9), ("상위 50%", 0.5), ("하위 50%", 0.0)]
+DIFFICULTY_BY_SOLVE_RATE = [(0.6, "초급"), (0.3, "중급"), (0.0, "고급")]
+
+_CACHE: Dict[str, Any] = {"version": None, "entries": {}}
+_LOCK = threading.Lock()
+
+
+class QuantileSketch:
+    # 상대 오차 보장 로그 버킷 스케치 (DDSketch 방식). 값 개수와 무관하게 버킷 수만큼만 메모리를 쓴다.
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Counter = Counter()
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.bins[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.bins.update(other.bins)
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class _ChallengeAccumulator:
+    __slots__ = ("tried", "solved", "attempts", "seconds", "tier_tried", "tier_solved")
+
+    def __init__(self):
+        self.tried = 0
+        self.solved = 0
+        self.attempts = QuantileSketch()
+        self.seconds = QuantileSketch()
+        self.tier_tried: Counter = Counter()
+        self.tier_solved: Counter = Counter()
+
+
+def _user_tiers() -> Dict[int, str]:
+    # 총점 분위로 사용자 등급을 나눈다. 점수 행이 없는 사용자는 하위 등급.
+    points = sorted(
+        db.session.query(WargameUserScore.user_id, WargameUserScore.points), key=lambda row: row[1]
+    )
+    tiers = {}
+    total = len(points)
+    for index, (user_id, _) in enumerate(points):
+        share = index / total
+        tiers[user_id] = next(name for name, floor in TIERS if share >= floor)
+    return tiers
+
+
+def calibrate(solve_rate: Optional[float]) -> Optional[str]:
+    if solve_rate is None:
+        return None
+    return next(name for floor, name in DIFFICULTY_BY_SOLVE_RATE if solve_rate >= floor)
+
+
+def analyze(chunk_size: int = 5000) -> Dict[str, Any]:
+    started = time.perf_counter()
+    min_users = current_app.config["ANALYTICS_MIN_USERS"]
+    tiers = _user_tiers()
+    bottom_tier = TIERS[-1][0]
+    challenges: Dict[int, _ChallengeAccumulator] = {}
+
+    raw = select(
+        WargameAttempt.challenge_id,
+        WargameAttempt.user_id,
+        WargameAttempt.is_correct,
+        WargameAttempt.created_at,
+        WargameAttempt.id,
+        literal(1).label("weight"),
+    ).where(WargameAttempt.user_id.is_not(None))
+    # 롤업은 첫 정답 이전 오답만 담고 가장 이른 시각을 가지므로 쌍의 맨 앞에 온다 (id 0)
+    rolled = select(
+        WargameChallengeUserRollup.challenge_id,
+        WargameChallengeUserRollup.user_id,
+        false(),
+        WargameChallengeUserRollup.first_at,
+        literal(0),
+        WargameChallengeUserRollup.attempts,
+    )
+    combined = union_all(raw, rolled).subquery()
+    stmt = (
+        select(
+            combined.c.challenge_id,
+            combined.c.user_id,
+            combined.c.is_correct,
+            combined.c.created_at,
+            combined.c.weight,
+        )
+        .order_by(combined.c.challenge_id, combined.c.user_id, combined.c.created_at, combined.c.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    pair = None
+    first_at = solved_at = None
+    attempts = 0
+    rows = 0
+
+    def _finish():
+        if pair is None:
+            return
+        acc = challenges.setdefault(pair[0], _ChallengeAccumulator())
+        tier = tiers.get(pair[1], bottom_tier)
+        acc.tried += 1
+        acc.tier_tried[tier] += 1
+        if solved_at is not None:
+            acc.solved += 1
+            acc.tier_solved[tier] += 1
+            acc.attempts.add(attempts)
+            if first_at and solved_at:
+                acc.seconds.add(max(0.0, (solved_at - first_at).total_seconds()))
+
+    for challenge_id, user_id, is_correct, created_at, weight in db.session.execute(stmt):
+        rows += 1
+        if (challenge_id, user_id) != pair:
+            _finish()
+            pair = (challenge_id, user_id)
+            first_at, solved_at, attempts = created_at, None, 0
+        if solved_at is not None:
+            continue  # 첫 정답 이후 제출은 무시
+        attempts += weight
+        if is_correct:
+            solved_at = created_at or first_at
+    _finish()
+
+    now = datetime.utcnow()
+    summary_rows = []
+    for challenge_id, acc in challenges.items():
+        solve_rate = acc.solved / acc.tried if acc.tried >= min_users else None
+        summary_rows.append(
+            {
+                "challenge_id": challenge_id,
+                "tried_users": acc.tried,
+                "solved_users": acc.solved,
+                "solve_rate": round(solve_rate, 4) if solve_rate is not None else None,
+                "attempts_p50": acc.attempts.quantile(0.5),
+                "attempts_p90": acc.attempts.quantile(0.9),
+                "solve_seconds_p50": acc.seconds.quantile(0.5),
+                "solve_seconds_p90": acc.seconds.quantile(0.9),
+                "tier_solve_rates": json.dumps(
+                    {
+                        tier: round(acc.tier_solved[tier] / tried, 4)
+                        for tier, tried in acc.tier_tried.items()
+                    },
+                    ensure_ascii=False,
+                ),
+                "calibrated_difficulty": calibrate(solve_rate),
+                "computed_at": now,
+            }
+        )
+    db.session.execute(db.delete(WargameChallengeStats))
+    for start in range(0, len(summary_rows), 500):
+        db.session.execute(db.insert(WargameChallengeStats), summary_rows[start:start + 500])
+    db.session.commit()
+    invalidate()
+    return {
+        "attempts": rows,
+        "challenges": len(summary_rows),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def format_duration(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None:
+        return None
+    if seconds < 60:
+        return f"{int(seconds)}초"
+    if seconds < 3600:
+        return f"{round(seconds / 60)}분"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}시간"
+    return f"{seconds / 86400:.1f}일"
+
+
+def _rebuild(version: str) -> Dict[int, Dict[str, Any]]:
+    entries = {}
+    for row in WargameChallengeStats.query:
+        entries[row.challenge_id] = {
+            "calibrated_difficulty": row.calibrated_difficulty,
+            "solve_rate": row.solve_rate,
+            "attempts_p50": round(row.attempts_p50) if row.attempts_p50 is not None else None,
+            "attempts_p90": round(row.attempts_p90) if row.attempts_p90 is not None else None,
+            "solve_time_p50": format_duration(row.solve_seconds_p50),
+            "solve_time_p90": format_duration(row.solve_seconds_p90),
+        }
+    _CACHE["entries"] = entries
+    _CACHE["version"] = version
+    return entries
+
+
+@on_warm_up("solve_analytics")
+def challenge_stats() -> Dict[int, Dict[str, Any]]:
+    # 대시보드용: 배치가 끝날 때만 버전이 바뀌므로 평소에는 쿼리 없이 메모리에서 읽는다.
+    version = cache_bus.version(CACHE_NAME)
+    if _CACHE["version"] is not None and _CACHE["version"] == version:
+        return _CACHE["entries"]
+    with _LOCK:
+        if _CACHE["version"] is not None and _CACHE["version"] == version:
+            return _CACHE["entries"]
+        return _rebuild(version)
+
+
+def invalidate() -> None:
+    _CACHE["version"] = None
+    cache_bus.bump(CACHE_NAME)
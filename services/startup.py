@@ -0,0 +1,148 @@
+import json
+import os
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from jinja2 import FileSystemBytecodeCache
+
+from extensions import db
+
+# 워커 기동 최적화 (배포/재시작 직후 지연 튐 방지).
+#   Jinja 바이트코드 캐시: 템플릿 컴파일 결과를 JINJA_BYTECODE_CACHE_DIR 에 저장한다. 이미지 빌드 때
+#     `flask startup compile-templates` 로 채워 두면 워커는 첫 렌더링에서 파싱/컴파일 없이 marshal 로드만 한다.
+#     (원본이 바뀌면 checksum 이 달라 자동으로 다시 컴파일)
+#   preload_app: 마스터가 앱을 한 번 로드한 뒤 fork 한다. 부모의 DB 연결을 자식이 같이 쓰면 안 되므로
+#     fork 직후 자식에서 엔진 풀을 버린다 (dispose(close=False): 부모 소켓은 닫지 않음).
+#   warm_up: 트래픽을 받기 전에 스키마 확인/시드, 버전 캐시, 템플릿을 채운다. 각 모듈이 @on_warm_up 으로 단계를 등록한다.
+#     preload 면 마스터에서 한 번 (fork 로 모든 워커가 공유), 아니면 워커마다 (gunicorn.conf.py).
+# 드물게 쓰는 무거운 모듈(numpy/scipy, requests, services.ctftime)은 각 모듈에서 처음 쓸 때 불러온다.
+
+# (순서, 이름, 함수). 스키마(0) -> 시드(10) -> 캐시(20), 템플릿은 마지막에 항상
+WARMUP_STEPS: List[Tuple[int, str, Callable[[], Any]]] = []
+# 마지막 워밍업 결과 (preload 면 마스터의 결과가 fork 로 워커에 넘어온다). /readyz 가 본다
+_STATE: Dict[str, Any] = {"last": None, "retries": 0, "retry_at": 0.0}
+# 실패한 단계 재시도 간격 (초): 1, 2, 4, ... 최대 60
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_BACKOFF_MAX_SECONDS = 60.0
+
+
+def on_warm_up(name: str, order: int = 20):
+    def decorator(func):
+        WARMUP_STEPS.append((order, name, func))
+        return func
+
+    return decorator
+
+
+def _dispose_engines(app_ref) -> None:
+    app = app_ref()
+    if app is None:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def init_startup(app) -> None:
+    folder = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if folder:
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError:
+            pass
+        # 쓰기 못 하는 위치면 렌더링 중 저장이 실패하므로 끈다
+        if os.access(folder, os.W_OK):
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(folder)
+        else:
+            app.logger.warning("JINJA_BYTECODE_CACHE_DIR is not writable: %s", folder)
+    app_ref = weakref.ref(app)
+    os.register_at_fork(after_in_child=lambda: _dispose_engines(app_ref))
+
+
+def compile_templates(app) -> int:
+    env = app.jinja_env
+    names = env.list_templates(filter_func=lambda name: name.endswith((".html", ".txt", ".xml")))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def _run_step(app, name: str, func: Callable[[], Any], retry: bool = False) -> Optional[float]:
+    step_started = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:
+        # 워밍업 실패가 기동을 막으면 안 된다 (첫 요청에서 원래 경로로 다시 시도)
+        db.session.rollback()
+        if retry:
+            app.logger.warning("warm-up step failed again: %s (%s)", name, exc)
+        else:
+            app.logger.exception("warm-up step failed: %s", name)
+        return None
+    return round((time.perf_counter() - step_started) * 1000, 2)
+
+
+def warm_up(app, templates: bool = True) -> Dict[str, Any]:
+    timings: Dict[str, Any] = {}
+    _STATE.update(retries=0, retry_at=0.0)
+    if not app.config.get("STARTUP_WARMUP", True):
+        _STATE["last"] = timings
+        return timings
+    started = time.perf_counter()
+    with app.app_context():
+        for _, name, func in sorted(WARMUP_STEPS, key=lambda item: item[0]):
+            timings[name] = _run_step(app, name, func)
+        if templates:
+            step_started = time.perf_counter()
+            compile_templates(app)
+            timings["templates"] = round((time.perf_counter() - step_started) * 1000, 2)
+        db.session.remove()
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    app.logger.info("warm-up finished in %.1f ms", timings["total"])
+    _STATE["last"] = timings
+    return timings
+
+
+def retry_failed(app) -> Dict[str, Any]:
+    # 실패한 단계만 지수 백오프로 다시 실행한다 (/readyz 가 확인할 때마다 전체 워밍업을 돌리지 않도록)
+    timings = _STATE["last"]
+    failed = {name for name, value in timings.items() if value is None}
+    if not failed or time.monotonic() < _STATE["retry_at"]:
+        return timings
+    with app.app_context():
+        for _, name, func in sorted(WARMUP_STEPS, key=lambda item: item[0]):
+            if name in failed:
+                timings[name] = _run_step(app, name, func, retry=True)
+        db.session.remove()
+    if any(value is None for value in timings.values()):
+        _STATE["retries"] += 1
+        delay = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** (_STATE["retries"] - 1))
+        _STATE["retry_at"] = time.monotonic() + delay
+    else:
+        _STATE.update(retries=0, retry_at=0.0)
+    return timings
+
+
+def last_warm_up() -> Optional[Dict[str, Any]]:
+    return _STATE["last"]
+
+
+startup_cli = AppGroup("startup", help="워커 기동 최적화 (템플릿 사전 컴파일, 워밍업)")
+
+
+@startup_cli.command("compile-templates")
+def compile_templates_command():
+    # 이미지 빌드 단계에서 실행: JINJA_BYTECODE_CACHE_DIR 에 바이트코드를 채운다
+    if current_app.jinja_env.bytecode_cache is None:
+        raise click.ClickException("JINJA_BYTECODE_CACHE_DIR 가 설정되지 않았습니다.")
+    count = compile_templates(current_app._get_current_object())
+    click.echo(f"{count} templates -> {current_app.config['JINJA_BYTECODE_CACHE_DIR']}")
+
+
+@startup_cli.command("warmup")
+def warmup_command():
+    click.echo(json.dumps(warm_up(current_app._get_current_object()), ensure_ascii=False, indent=2))
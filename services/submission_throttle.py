@@ -0,0 +1,285 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from flask import current_app, request, session
+from werkzeug.exceptions import TooManyRequests
+
+from services.metrics import SUBMISSIONS_DEDUPED, SUBMISSIONS_THROTTLED
+from services.shared_state import redis_client
+
+# 플래그 제출 제한 (token bucket).
+#   (user, challenge) 버킷: 한 문제 무차별 대입 방지
+#   user 버킷: 여러 문제를 돌아가며 찍는 스크립트 방지
+# 요청 초입(before_request, 로그인 사용자 로딩 전)에서 판정하므로 거절된 요청은 DB 에 닿지 않는다.
+#
+# 저장소
+#   memory: 워커 프로세스 메모리 (워커마다 따로 센다)
+#   shared: memory 를 1차 필터로 두고, 같은 호스트의 워커가 공유하는 mmap 파일 테이블로 최종 판정
+#           슬롯 = (키 해시 u64, 토큰 f64, 갱신 시각 f64) 24바이트, 선형 탐사, 자리가 없으면 가장 오래된 슬롯을 재사용
+#           (오래 쉰 버킷은 가득 찬 새 버킷과 같으므로 밀려나도 제한이 느슨해지지 않는다)
+#   redis:  memory 1차 필터 + Redis (호스트가 여러 대일 때). 여러 버킷 확인/차감을 Lua 스크립트 하나로 원자 실행,
+#           시각은 Redis 서버 시계를 쓴다 (노드 간 시계 차이 무관)
+# 같은 오답을 반복 제출하면 SUBMIT_DEDUPE_SECONDS 동안은 기록하지 않는다 (같은 테이블에 표시만 남김).
+
+_SLOT = struct.Struct("<Qdd")
+_PROBES = 8
+_STATE: Dict[str, Any] = {"pid": None}
+
+
+def _key(*parts: Any) -> int:
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 은 빈 슬롯
+
+
+def _refill(tokens: float, updated: float, capacity: float, rate: float, now: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryBuckets:
+    # key -> (tokens, updated). 키 수가 max_keys 를 넘으면 이미 가득 찼을 버킷부터 지운다.
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.entries: Dict[int, Tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def _sweep(self, now: float, idle: float) -> None:
+        stale = [key for key, (_, updated) in self.entries.items() if now - updated >= idle]
+        for key in stale:
+            del self.entries[key]
+        if len(self.entries) >= self.max_keys:
+            for key in sorted(self.entries, key=lambda item: self.entries[item][1])[: len(self.entries) // 2]:
+                del self.entries[key]
+
+    def take(self, buckets: Iterable[Tuple[int, float, float]], now: float) -> float:
+        # 모든 버킷에 토큰이 있을 때만 하나씩 차감. 반환값은 재시도까지 남은 초 (0 이면 허용)
+        buckets = list(buckets)
+        with self.lock:
+            if len(self.entries) >= self.max_keys:
+                self._sweep(now, max(capacity / rate for _, capacity, rate in buckets))
+            levels = []
+            wait = 0.0
+            for key, capacity, rate in buckets:
+                tokens, updated = self.entries.get(key, (capacity, now))
+                tokens = _refill(tokens, updated, capacity, rate, now)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if wait:
+                return wait
+            for (key, _, _), tokens in zip(buckets, levels):
+                self.entries[key] = (tokens - 1, now)
+            return 0.0
+
+    def mark(self, key: int, ttl: float, now: float) -> bool:
+        # 최근 ttl 초 안에 같은 키가 있었으면 True
+        with self.lock:
+            seen = self.entries.get(key)
+            self.entries[key] = (0.0, now)
+            return seen is not None and now - seen[1] < ttl
+
+
+class SharedBuckets:
+    def __init__(self, path: str, slots: int):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.slots = slots
+        size = slots * _SLOT.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)
+        self.map = mmap.mmap(self.fd, size)
+        self.lock = threading.Lock()  # flock 은 같은 프로세스의 스레드끼리는 배타적이지 않다
+
+    @contextmanager
+    def _locked(self):
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def _find(self, key: int) -> Tuple[int, Optional[Tuple[float, float]]]:
+        start = key % self.slots
+        victim, victim_updated = start, None
+        for probe in range(_PROBES):
+            index = (start + probe) % self.slots
+            slot_key, tokens, updated = _SLOT.unpack_from(self.map, index * _SLOT.size)
+            if slot_key == key:
+                return index, (tokens, updated)
+            if slot_key == 0:
+                return index, None
+            if victim_updated is None or updated < victim_updated:
+                victim, victim_updated = index, updated
+        return victim, None
+
+    def take(self, buckets: Iterable[Tuple[int, float, float]], now: float) -> float:
+        buckets = list(buckets)
+        with self._locked():
+            found = []
+            wait = 0.0
+            for key, capacity, rate in buckets:
+                index, entry = self._find(key)
+                tokens = _refill(*(entry or (capacity, now)), capacity, rate, now)
+                found.append((index, key, tokens))
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if wait:
+                return wait
+            for index, key, tokens in found:
+                _SLOT.pack_into(self.map, index * _SLOT.size, key, tokens - 1, now)
+            return 0.0
+
+    def mark(self, key: int, ttl: float, now: float) -> bool:
+        with self._locked():
+            index, entry = self._find(key)
+            _SLOT.pack_into(self.map, index * _SLOT.size, key, 0.0, now)
+            return entry is not None and now - entry[1] < ttl
+
+
+# KEYS = 버킷 키들, ARGV = capacity1, rate1, capacity2, rate2, ...
+# 반환: 재시도까지 남은 초 (문자열, "0" 이면 허용). Lua 숫자는 정수로 잘리므로 문자열로 돌려준다.
+_TAKE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+  local capacity = tonumber(ARGV[i * 2 - 1])
+  local rate = tonumber(ARGV[i * 2])
+  local entry = redis.call('HMGET', key, 't', 'u')
+  local tokens = tonumber(entry[1]) or capacity
+  local updated = tonumber(entry[2]) or now
+  tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+  levels[i] = tokens
+  if tokens < 1 then
+    wait = math.max(wait, (1 - tokens) / rate)
+  end
+end
+if wait > 0 then
+  return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+  local capacity = tonumber(ARGV[i * 2 - 1])
+  local rate = tonumber(ARGV[i * 2])
+  redis.call('HSET', key, 't', tostring(levels[i] - 1), 'u', tostring(now))
+  -- 가득 찰 때까지의 시간이 지나면 키가 없는 것과 같다
+  redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return '0'
+"""
+
+
+class RedisBuckets:
+    def __init__(self, client):
+        self.client = client
+        self.take_script = client.register_script(_TAKE_SCRIPT)
+
+    def take(self, buckets: Iterable[Tuple[int, float, float]], now: float) -> float:
+        buckets = list(buckets)
+        keys = [f"throttle:{key:x}" for key, _, _ in buckets]
+        args = [value for _, capacity, rate in buckets for value in (capacity, rate)]
+        return float(self.take_script(keys=keys, args=args))
+
+    def mark(self, key: int, ttl: float, now: float) -> bool:
+        # SET ... GET: 이전 값이 있으면 ttl 안에 본 키 (만료 시각은 매번 연장)
+        previous = self.client.set(f"throttle:{key:x}", 1, ex=max(1, int(ttl)), get=True)
+        return previous is not None
+
+
+def _state() -> Dict[str, Any]:
+    pid = os.getpid()
+    if _STATE["pid"] != pid:
+        config = current_app.config
+        shared = None
+        if config["SUBMIT_THROTTLE_BACKEND"] == "shared":
+            shared = SharedBuckets(config["SUBMIT_THROTTLE_PATH"], config["SUBMIT_THROTTLE_SLOTS"])
+        elif config["SUBMIT_THROTTLE_BACKEND"] == "redis":
+            shared = RedisBuckets(redis_client())
+        _STATE.update(pid=pid, memory=MemoryBuckets(config["SUBMIT_THROTTLE_SLOTS"]), shared=shared)
+    return _STATE
+
+
+def _buckets(user_id: int, challenge_id: Optional[int]):
+    config = current_app.config
+    buckets = [
+        (_key("user", user_id), config["SUBMIT_USER_BURST"], config["SUBMIT_USER_PER_MINUTE"] / 60.0),
+    ]
+    if challenge_id is not None:
+        buckets.append(
+            (
+                _key("challenge", user_id, challenge_id),
+                config["SUBMIT_CHALLENGE_BURST"],
+                config["SUBMIT_CHALLENGE_PER_MINUTE"] / 60.0,
+            )
+        )
+    return buckets
+
+
+def check(user_id: int, challenge_id: Optional[int], now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+    state = _state()
+    buckets = _buckets(user_id, challenge_id)
+    # 이 워커에서만 봐도 이미 초과면 공유 테이블까지 갈 필요가 없다
+    wait = state["memory"].take(buckets, now)
+    if wait or state["shared"] is None:
+        return wait
+    try:
+        return state["shared"].take(buckets, now)
+    except Exception:
+        # 공유 저장소(Redis) 장애 중에는 워커별 제한만으로 계속 받는다
+        current_app.logger.exception("Submission throttle backend failed")
+        return 0.0
+
+
+def is_duplicate_wrong(user_id: int, challenge_id: Any, flag_text: str) -> bool:
+    config = current_app.config
+    if not config["SUBMIT_THROTTLE_ENABLED"]:
+        return False
+    state = _state()
+    key = _key("wrong", user_id, str(challenge_id), hashlib.sha256(flag_text.encode("utf-8")).digest())
+    store = state["shared"] or state["memory"]
+    try:
+        duplicate = store.mark(key, config["SUBMIT_DEDUPE_SECONDS"], time.time())
+    except Exception:
+        current_app.logger.exception("Submission throttle backend failed")
+        return False
+    if duplicate:
+        SUBMISSIONS_DEDUPED.labels(config["SUBMIT_THROTTLE_BACKEND"]).inc()
+    return duplicate
+
+
+def _before_request():
+    if request.endpoint != "wargame.attempt_challenge" or request.method != "POST":
+        return None
+    if not current_app.config["SUBMIT_THROTTLE_ENABLED"]:
+        return None
+    user_id = session.get("user_id")
+    if not user_id:
+        return None  # 로그인 리다이렉트는 라우트가 처리
+    try:
+        challenge_id = int(request.form.get("challenge_id", ""))
+    except ValueError:
+        challenge_id = None
+    wait = check(user_id, challenge_id)
+    if not wait:
+        return None
+    SUBMISSIONS_THROTTLED.labels(current_app.config["SUBMIT_THROTTLE_BACKEND"]).inc()
+    retry_after = max(1, int(wait + 0.999))
+    raise TooManyRequests(
+        description=f"플래그 제출이 너무 잦습니다. {retry_after}초 후 다시 시도해 주세요.",
+        retry_after=retry_after,
+    )
+
+
+def init_submission_throttle(app) -> None:
+    # 로그인 사용자 로딩(User 조회)보다 먼저 등록해야 거절된 요청이 DB 를 건드리지 않는다
+    app.before_request(_before_request)
@@ -0,0 +1,347 @@
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.research import TeamApplication, TeamMatch, TeamMatchRun, TeamPost
+
+# numpy/scipy.optimize 는 import 에만 0.6초 넘게 걸리고 매칭 실행에서만 쓰므로 처음 쓸 때 불러온다 (워커 기동 시간)
+np = None
+linear_sum_assignment = None
+_NUMERIC_LOADED = False
+
+# 랜덤 매칭을 켠 모집 중 팀과 아직 배정되지 않은 지원자를 한 번에 배정한다.
+# 호환도 = 레벨 근접도 + 역할 충족도 + 같은 대회 + 원래 지원한 팀 가산점 (모두 0~1, 가중합)
+# 팀 정원은 team_size ("4명 / 현재 2명") 에서 남은 자리만큼 슬롯으로 펼쳐 배정한다.
+
+LEVELS = ["초급", "중급", "고급"]
+OPEN_PHASE = "모집 중"
+DEFAULT_TEAM_SIZE = 4
+WEIGHTS = {"level": 0.35, "role": 0.35, "competition": 0.2, "applied": 0.1}
+
+# 자유 입력인 희망 역할/태그를 공통 역할 축으로 묶는다.
+ROLE_KEYWORDS = {
+    "web": ("web", "웹"),
+    "pwn": ("pwn", "포너블", "시스템"),
+    "reversing": ("reversing", "rev", "리버싱"),
+    "crypto": ("crypto", "암호"),
+    "forensics": ("forensic", "포렌식"),
+    "cloud": ("cloud", "클라우드"),
+    "misc": ("misc", "기타"),
+    "lead": ("leader", "리더", "팀장"),
+}
+ROLE_AXES = list(ROLE_KEYWORDS)
+
+
+def _load_numeric() -> None:
+    global np, linear_sum_assignment, _NUMERIC_LOADED
+    if _NUMERIC_LOADED:
+        return
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - requirements.txt 에 포함
+        pass
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:  # scipy 가 없으면 greedy 로만 배정
+        pass
+    _NUMERIC_LOADED = True
+
+
+def _require_numpy():
+    _load_numeric()
+    if np is None:
+        raise RuntimeError("팀 매칭에는 numpy 가 필요합니다 (pip install numpy).")
+
+
+def role_flags(text: Optional[str]) -> List[int]:
+    lowered = (text or "").lower()
+    return [int(any(keyword in lowered for keyword in ROLE_KEYWORDS[axis])) for axis in ROLE_AXES]
+
+
+def open_slots(team_size: Optional[str]) -> int:
+    # "4명 / 현재 2명" -> 2, "5" -> 4 (팀장 1명 제외), 해석 불가 -> 기본값
+    numbers = [int(value) for value in re.findall(r"\d+", team_size or "")]
+    total = numbers[0] if numbers else DEFAULT_TEAM_SIZE
+    current = 1
+    match = re.search(r"현재\s*(\d+)", team_size or "")
+    if match:
+        current = int(match.group(1))
+    return max(0, total - current)
+
+
+def _level_index(value: Optional[str]) -> float:
+    return float(LEVELS.index(value)) if value in LEVELS else float("nan")
+
+
+def _competition_key(competition_id, custom_competition) -> str:
+    if competition_id:
+        return f"id:{competition_id}"
+    return f"custom:{(custom_competition or '').strip().lower()}" if custom_competition else ""
+
+
+def _load_pool() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    matched_per_post = dict(
+        db.session.query(TeamMatch.post_id, func.count(TeamMatch.id)).group_by(TeamMatch.post_id)
+    )
+    posts = []
+    for row in db.session.query(
+        TeamPost.id,
+        TeamPost.level,
+        TeamPost.team_size,
+        TeamPost.tags,
+        TeamPost.requirements,
+        TeamPost.competition_id,
+        TeamPost.custom_competition,
+    ).filter(TeamPost.use_random_matching.is_(True), TeamPost.phase == OPEN_PHASE):
+        slots = open_slots(row.team_size) - matched_per_post.get(row.id, 0)
+        if slots <= 0:
+            continue
+        posts.append(
+            {
+                "id": row.id,
+                "level": row.level,
+                "slots": slots,
+                "roles": role_flags(f"{row.tags or ''} {row.requirements or ''}"),
+                "competition": _competition_key(row.competition_id, row.custom_competition),
+            }
+        )
+
+    already_matched = select(TeamMatch.id).where(TeamMatch.application_id == TeamApplication.id).exists()
+    matched_users = {
+        user_id
+        for (user_id,) in db.session.query(TeamApplication.user_id)
+        .join(TeamMatch, TeamMatch.application_id == TeamApplication.id)
+        .filter(TeamApplication.user_id.is_not(None))
+        .distinct()
+    }
+    applicants = []
+    for row in (
+        db.session.query(
+            TeamApplication.id,
+            TeamApplication.user_id,
+            TeamApplication.post_id,
+            TeamApplication.level,
+            TeamApplication.desired_role,
+            TeamPost.competition_id,
+            TeamPost.custom_competition,
+        )
+        .join(TeamPost, TeamPost.id == TeamApplication.post_id)
+        # 모집이 끝난 글의 지원서는 후보에서 뺀다 (지원자 풀이 시간이 갈수록 커지지 않도록)
+        .filter(TeamPost.use_random_matching.is_(True), TeamPost.phase == OPEN_PHASE, ~already_matched)
+        .order_by(TeamApplication.id)
+    ):
+        # 한 사용자는 한 팀에만 배정: 가장 먼저 낸 지원서 하나만 후보로 쓴다.
+        if row.user_id is not None:
+            if row.user_id in matched_users:
+                continue
+            matched_users.add(row.user_id)
+        applicants.append(
+            {
+                "id": row.id,
+                "post_id": row.post_id,
+                "level": row.level,
+                "roles": role_flags(row.desired_role),
+                "competition": _competition_key(row.competition_id, row.custom_competition),
+            }
+        )
+    return applicants, posts
+
+
+def compatibility(applicants: Sequence[Dict[str, Any]], posts: Sequence[Dict[str, Any]]):
+    # (지원자 수 x 팀 수) 호환도 행렬. 파이썬 루프 없이 브로드캐스팅으로 계산한다.
+    _require_numpy()
+    a_level = np.array([_level_index(item["level"]) for item in applicants])
+    p_level = np.array([_level_index(item["level"]) for item in posts])
+    level = 1.0 - np.abs(a_level[:, None] - p_level[None, :]) / (len(LEVELS) - 1)
+    level = np.where(np.isnan(level), 0.5, level)  # 레벨 미입력은 중립
+
+    a_roles = np.array([item["roles"] for item in applicants], dtype=np.float32)
+    p_roles = np.array([item["roles"] for item in posts], dtype=np.float32)
+    wanted = a_roles.sum(axis=1, keepdims=True)
+    # 원하는 역할 중 팀 태그/요구사항이 다루는 비율. 역할 미입력은 중립(0.5)
+    role = np.divide(
+        a_roles @ p_roles.T,
+        wanted,
+        out=np.full((len(applicants), len(posts)), 0.5, dtype=np.float32),
+        where=wanted > 0,
+    )
+
+    # 대회는 문자열 키를 정수 코드로 바꿔 비교한다 (-1 = 대회 없음).
+    codes: Dict[str, int] = {}
+
+    def _encode(items):
+        return np.array(
+            [codes.setdefault(item["competition"], len(codes)) if item["competition"] else -1 for item in items]
+        )
+
+    a_comp = _encode(applicants)
+    p_comp = _encode(posts)
+    competition = (a_comp[:, None] == p_comp[None, :]) & (a_comp[:, None] >= 0)
+
+    applied_post = np.array([item["post_id"] for item in applicants])
+    post_ids = np.array([item["id"] for item in posts])
+    applied = applied_post[:, None] == post_ids[None, :]
+
+    return (
+        WEIGHTS["level"] * level
+        + WEIGHTS["role"] * role
+        + WEIGHTS["competition"] * competition
+        + WEIGHTS["applied"] * applied
+    ).astype(np.float64)
+
+
+def _assign_hungarian(scores, slots) -> List[Tuple[int, int]]:
+    columns = np.repeat(np.arange(len(slots)), slots)
+    rows, cols = linear_sum_assignment(scores[:, columns], maximize=True)
+    return list(zip(rows.tolist(), columns[cols].tolist()))
+
+
+def _assign_greedy(scores, slots, min_score) -> List[Tuple[int, int]]:
+    # 점수 높은 (지원자, 팀) 쌍부터 채운다. 정원이 다 차거나 최소 점수 미만이면 종료.
+    remaining = np.array(slots)
+    taken = np.zeros(scores.shape[0], dtype=bool)
+    limit = min(scores.shape[0], int(remaining.sum()))
+    order = np.argsort(-scores, axis=None, kind="stable")
+    pairs = []
+    width = scores.shape[1]
+    for flat_index in order.tolist():
+        row, col = divmod(flat_index, width)
+        if scores[row, col] < min_score or len(pairs) >= limit:
+            break
+        if taken[row] or remaining[col] <= 0:
+            continue
+        taken[row] = True
+        remaining[col] -= 1
+        pairs.append((row, col))
+    return pairs
+
+
+def assign(
+    scores, slots: Sequence[int], min_score: float = 0.0, method: str = "auto"
+) -> Tuple[str, List[Tuple[int, int]]]:
+    _require_numpy()
+    if scores.size == 0 or not sum(slots):
+        return "none", []
+    cells = scores.shape[0] * int(sum(slots))
+    if method == "auto":
+        max_cells = current_app.config.get("MATCHING_HUNGARIAN_MAX_CELLS", 4_000_000)
+        method = "hungarian" if linear_sum_assignment is not None and cells <= max_cells else "greedy"
+    if method == "hungarian":
+        if linear_sum_assignment is None:
+            raise RuntimeError("hungarian 배정에는 scipy 가 필요합니다.")
+        pairs = [(row, col) for row, col in _assign_hungarian(scores, slots) if scores[row, col] >= min_score]
+    else:
+        pairs = _assign_greedy(scores, slots, min_score)
+    return method, pairs
+
+
+def run_matching(method: str = "auto", dry_run: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    applicants, posts = _load_pool()
+    scores = compatibility(applicants, posts) if applicants and posts else None
+    used_method, pairs = ("none", [])
+    if scores is not None:
+        used_method, pairs = assign(
+            scores,
+            [post["slots"] for post in posts],
+            current_app.config.get("MATCHING_MIN_SCORE", 0.3),
+            method,
+        )
+    duration_ms = (time.perf_counter() - started) * 1000
+    summary = {
+        "method": used_method,
+        "applicants": len(applicants),
+        "posts": len(posts),
+        "assigned": len(pairs),
+        "mean_score": round(float(np.mean([scores[row, col] for row, col in pairs])), 4) if pairs else None,
+        "duration_ms": round(duration_ms, 2),
+        "run_id": None,
+    }
+    if dry_run or not pairs:
+        return summary
+
+    run = TeamMatchRun(
+        method=used_method,
+        applicants=summary["applicants"],
+        posts=summary["posts"],
+        assigned=summary["assigned"],
+        mean_score=summary["mean_score"],
+        duration_ms=summary["duration_ms"],
+    )
+    db.session.add(run)
+    try:
+        db.session.flush()
+        db.session.execute(
+            db.insert(TeamMatch),
+            [
+                {
+                    "run_id": run.id,
+                    "application_id": applicants[row]["id"],
+                    "post_id": posts[col]["id"],
+                    "score": round(float(scores[row, col]), 4),
+                }
+                for row, col in pairs
+            ],
+        )
+        db.session.commit()
+    except IntegrityError:
+        # 다른 배치가 먼저 배정함: 이번 결과는 버리고 다음 주기에 다시 계산한다.
+        db.session.rollback()
+        summary["assigned"] = 0
+        summary["conflict"] = True
+        return summary
+    summary["run_id"] = run.id
+    return summary
+
+
+def latest_matches(post_id: Optional[int] = None, limit: int = 200) -> Dict[str, Any]:
+    run = TeamMatchRun.query.order_by(TeamMatchRun.id.desc()).first()
+    query = (
+        db.session.query(
+            TeamMatch.application_id,
+            TeamMatch.post_id,
+            TeamMatch.score,
+            TeamMatch.run_id,
+            TeamApplication.applicant_name,
+            TeamApplication.desired_role,
+            TeamApplication.level,
+            TeamPost.title,
+        )
+        .join(TeamApplication, TeamApplication.id == TeamMatch.application_id)
+        .join(TeamPost, TeamPost.id == TeamMatch.post_id)
+        .order_by(TeamMatch.id.desc())
+    )
+    if post_id:
+        query = query.filter(TeamMatch.post_id == post_id)
+    return {
+        "run": {
+            "id": run.id,
+            "method": run.method,
+            "applicants": run.applicants,
+            "posts": run.posts,
+            "assigned": run.assigned,
+            "mean_score": run.mean_score,
+            "duration_ms": run.duration_ms,
+            "created_at": run.created_at.isoformat() if run.created_at else None,
+        }
+        if run
+        else None,
+        "matches": [
+            {
+                "application_id": row.application_id,
+                "post_id": row.post_id,
+                "post_title": row.title,
+                "applicant_name": row.applicant_name,
+                "desired_role": row.desired_role,
+                "level": row.level,
+                "score": row.score,
+                "run_id": row.run_id,
+            }
+            for row in query.limit(limit)
+        ],
+    }
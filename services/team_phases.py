@@ -0,0 +1,119 @@
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.research import Competition, TeamPhaseCount, TeamPost
+
+# 모집글 단계 자동 전환 + 단계별 글 수 카운터.
+#   모집 중 -> 진행중 : 일정 시작 시각이 지남
+#   모집 중/진행중 -> 완료 : 일정 종료 시각이 지남
+# 일정은 글의 event_start/event_end, 없으면 연결된 대회의 일정을 쓴다.
+# 날짜는 ISO 문자열로 저장되므로 같은 형식의 현재 시각과 문자열 비교로 UPDATE 한 번에 처리하고,
+# UPDATE 의 rowcount 만큼 같은 트랜잭션에서 카운터를 옮긴다.
+
+RECRUITING = "모집 중"
+RUNNING = "진행중"
+DONE = "완료"
+ISO_PATTERN = "____-__-__%"
+
+
+def _effective(post_column, competition_column):
+    competition_value = (
+        select(competition_column)
+        .where(Competition.id == TeamPost.competition_id)
+        .scalar_subquery()
+    )
+    return func.coalesce(post_column, competition_value)
+
+
+def _reached(column, now: str):
+    return and_(column.like(ISO_PATTERN), column <= now)
+
+
+def adjust(deltas: Dict[str, int]) -> None:
+    # 호출한 쪽의 트랜잭션 안에서 카운터만 증감한다 (커밋은 호출한 쪽에서)
+    for phase, delta in deltas.items():
+        if not delta:
+            continue
+        updated = db.session.execute(
+            db.update(TeamPhaseCount)
+            .where(TeamPhaseCount.phase == phase)
+            .values(total=TeamPhaseCount.total + delta, updated_at=datetime.utcnow())
+        ).rowcount
+        if not updated:
+            db.session.add(TeamPhaseCount(phase=phase, total=delta))
+            db.session.flush()
+
+
+def rebuild_counts() -> Dict[str, int]:
+    counts = dict(
+        db.session.query(TeamPost.phase, func.count(TeamPost.id)).group_by(TeamPost.phase)
+    )
+    db.session.execute(db.delete(TeamPhaseCount))
+    now = datetime.utcnow()
+    rows = [
+        {"phase": phase, "total": total, "updated_at": now}
+        for phase, total in counts.items()
+        if phase is not None
+    ]
+    if rows:
+        db.session.execute(db.insert(TeamPhaseCount), rows)
+    db.session.commit()
+    return counts
+
+
+def ensure_counts() -> None:
+    # 카운터 테이블이 비어 있는데 글이 있으면(첫 배포) 한 번 집계해서 채운다.
+    if db.session.query(TeamPhaseCount.phase).first() is not None:
+        return
+    if db.session.query(TeamPost.id).first() is None:
+        return
+    try:
+        rebuild_counts()
+    except IntegrityError:
+        # 다른 워커가 동시에 채웠다
+        db.session.rollback()
+
+
+def phase_counts() -> Dict[str, int]:
+    # 탭 배지용: 카운터 테이블 한 번 읽기
+    return dict(db.session.query(TeamPhaseCount.phase, TeamPhaseCount.total))
+
+
+def _move(source: str, target: str, condition, start_id: int, end_id: int) -> int:
+    moved = db.session.execute(
+        db.update(TeamPost)
+        .where(TeamPost.id >= start_id, TeamPost.id < end_id, TeamPost.phase == source, condition)
+        .values(phase=target)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if moved:
+        adjust({source: -moved, target: moved})
+    return moved
+
+
+def advance(now: Optional[datetime] = None, batch_size: int = 5000) -> Dict[str, int]:
+    # id 범위별로 나눠 커밋해 큰 테이블에서도 한 번에 잡는 락을 짧게 유지한다.
+    started = time.perf_counter()
+    stamp = (now or datetime.utcnow()).replace(microsecond=0).isoformat()
+    start_at = _effective(TeamPost.event_start, Competition.event_start)
+    end_at = _effective(TeamPost.event_end, Competition.event_end)
+    finished = _reached(end_at, stamp)
+    started_only = and_(_reached(start_at, stamp), or_(end_at.is_(None), ~finished))
+
+    summary = {"started": 0, "finished": 0}
+    low, high = db.session.query(func.min(TeamPost.id), func.max(TeamPost.id)).one()
+    if low is None:
+        return {**summary, "duration_ms": 0.0}
+    for start_id in range(low, high + 1, batch_size):
+        end_id = start_id + batch_size
+        summary["finished"] += _move(RECRUITING, DONE, finished, start_id, end_id)
+        summary["finished"] += _move(RUNNING, DONE, finished, start_id, end_id)
+        summary["started"] += _move(RECRUITING, RUNNING, started_only, start_id, end_id)
+        db.session.commit()
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
@@ -0,0 +1,329 @@
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, func, inspect, select
+
+from extensions import db
+from models.research import Competition, TeamApplication, TeamPost
+from models.transfer import TransferIdMap
+from models.user import User
+from models.wargame import WargameAttempt, WargameChallenge
+
+# 스테이징(SQLite) <-> 운영(MySQL) 데이터 이동.
+#   내보내기: yield_per 서버 측 커서로 PK 순서대로 흘려보내며 NDJSON/CSV 한 줄씩 만든다.
+#   가져오기: 청크 단위 bulk INSERT. 새 id 는 대상 테이블의 max(id) 뒤로 이어 붙이고(datagen 과 같은 방식),
+#            원본 id -> 새 id 는 transfer_id_map 에 적어 두었다가 다음 테이블의 FK 를 청크별로 바꾼다.
+# 사용자는 username 이 같으면 기존 계정에 연결한다. 비밀번호 해시는 요청할 때만 내보내고,
+# 해시 없이 가져온 계정은 로그인할 수 없는 값("!" 로 시작, 어떤 비밀번호와도 맞지 않음)으로 만든다.
+# 제출한 FLAG 문자열은 내보내지도 가져오지도 않는다 (예전 DB 에는 정답이 평문으로 남아 있을 수 있다).
+
+FORMATS = ("ndjson", "csv")
+SECRET_COLUMNS = {"users": ("password_hash",)}
+EXCLUDED_COLUMNS = {"attempts": ("submitted_flag",)}
+
+# 가져오기 순서 = FK 의존 순서
+TABLES: Dict[str, Dict[str, Any]] = {
+    "users": {"model": User, "fks": {}},
+    "competitions": {"model": Competition, "fks": {}},
+    "challenges": {"model": WargameChallenge, "fks": {"author_id": "users"}},
+    "attempts": {"model": WargameAttempt, "fks": {"challenge_id": "challenges", "user_id": "users"}},
+    "team_posts": {"model": TeamPost, "fks": {"competition_id": "competitions", "owner_id": "users"}},
+    "team_applications": {"model": TeamApplication, "fks": {"post_id": "team_posts", "user_id": "users"}},
+}
+
+
+class TransferError(ValueError):
+    pass
+
+
+def _spec(table: str) -> Dict[str, Any]:
+    if table not in TABLES:
+        raise TransferError(f"알 수 없는 테이블: {table} (가능: {', '.join(TABLES)})")
+    return TABLES[table]
+
+
+def columns(table: str, include_secrets: bool = False) -> List[str]:
+    # 마이그레이션 전 DB 에는 모델보다 컬럼이 적을 수 있으므로 실제로 있는 컬럼만 쓴다
+    model = _spec(table)["model"]
+    present = {column["name"] for column in inspect(db.engine).get_columns(model.__tablename__)}
+    hidden = EXCLUDED_COLUMNS.get(table, ()) + (() if include_secrets else SECRET_COLUMNS.get(table, ()))
+    return [
+        column.name
+        for column in model.__table__.columns
+        if column.name in present and column.name not in hidden
+    ]
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+# ---------------------------------------------------------------------------
+# 내보내기
+# ---------------------------------------------------------------------------
+def iter_rows(table: str, include_secrets: bool = False, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    model = _spec(table)["model"]
+    names = columns(table, include_secrets)
+    stmt = (
+        select(*[model.__table__.c[name] for name in names])
+        .order_by(model.__table__.c.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for row in db.session.execute(stmt):
+        yield {name: _encode(value) for name, value in zip(names, row)}
+
+
+def export_lines(table: str, fmt: str = "ndjson", include_secrets: bool = False,
+                 chunk_size: int = 2000) -> Iterator[str]:
+    if fmt not in FORMATS:
+        raise TransferError(f"지원하지 않는 형식: {fmt}")
+    rows = iter_rows(table, include_secrets, chunk_size)
+    if fmt == "ndjson":
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns(table, include_secrets), lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({key: "" if value is None else value for key, value in row.items()})
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# 가져오기
+# ---------------------------------------------------------------------------
+def read_records(stream: Iterable[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "ndjson":
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    elif fmt == "csv":
+        for row in csv.DictReader(stream):
+            # CSV 는 NULL 과 빈 문자열을 구분하지 못하므로 빈 값은 NULL 로 본다
+            yield {key: (None if value == "" else value) for key, value in row.items()}
+    else:
+        raise TransferError(f"지원하지 않는 형식: {fmt}")
+
+
+def _coerce(column, value):
+    if value is None:
+        return None
+    kind = column.type
+    if isinstance(kind, Boolean):
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "t", "yes")
+        return bool(value)
+    if isinstance(kind, Integer):
+        return int(value)
+    if isinstance(kind, Float):
+        return float(value)
+    if isinstance(kind, DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if isinstance(kind, Date):
+        return value if isinstance(value, date) else date.fromisoformat(value)
+    return value
+
+
+class Importer:
+    def __init__(self, chunk_size: int = 1000):
+        self.run_id = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.summary: Dict[str, Dict[str, int]] = {}
+
+    def _lookup(self, table: str, source_ids) -> Dict[int, int]:
+        if not source_ids:
+            return {}
+        return dict(
+            db.session.query(TransferIdMap.source_id, TransferIdMap.target_id).filter(
+                TransferIdMap.run_id == self.run_id,
+                TransferIdMap.table_name == table,
+                TransferIdMap.source_id.in_(source_ids),
+            )
+        )
+
+    def import_records(self, table: str, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        spec = _spec(table)
+        model = spec["model"]
+        table_columns = model.__table__.c
+        counts = self.summary.setdefault(table, {"inserted": 0, "linked": 0, "skipped": 0})
+        present = set(columns(table, include_secrets=True))
+        next_id = (db.session.query(func.max(table_columns.id)).scalar() or 0) + 1
+
+        chunk: List[Dict[str, Any]] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                next_id = self._flush(table, spec, chunk, next_id, counts, present)
+                chunk = []
+        if chunk:
+            self._flush(table, spec, chunk, next_id, counts, present)
+        return counts
+
+    def _flush(self, table, spec, chunk, next_id, counts, present) -> int:
+        model = spec["model"]
+        table_columns = model.__table__.c
+
+        # FK: 이번 실행에서 가져온 행이면 새 id 로, 아니면 NULL(허용 시) 또는 행을 건너뛴다.
+        fk_maps = {
+            column: self._lookup(
+                target, {int(record[column]) for record in chunk if record.get(column) is not None}
+            )
+            for column, target in spec["fks"].items()
+        }
+
+        existing_users = {}
+        if table == "users":
+            names = [record.get("username") for record in chunk if record.get("username")]
+            existing_users = dict(db.session.query(User.username, User.id).filter(User.username.in_(names)))
+
+        rows, mappings = [], []
+        for record in chunk:
+            source_id = int(record["id"])
+            if table == "users" and record.get("username") in existing_users:
+                mappings.append({"source_id": source_id, "target_id": existing_users[record["username"]]})
+                counts["linked"] += 1
+                continue
+            row = {}
+            skip = False
+            for name, value in record.items():
+                if name == "id" or name not in present:
+                    continue
+                value = _coerce(table_columns[name], value)
+                if name in fk_maps and value is not None:
+                    value = fk_maps[name].get(value)
+                    if value is None and not table_columns[name].nullable:
+                        skip = True
+                        break
+                row[name] = value
+            if skip:
+                counts["skipped"] += 1
+                continue
+            if table == "users" and not row.get("password_hash"):
+                row["password_hash"] = "!" + uuid.uuid4().hex
+            row["id"] = next_id
+            mappings.append({"source_id": source_id, "target_id": next_id})
+            next_id += 1
+            rows.append(row)
+
+        if rows:
+            db.session.execute(db.insert(model), rows)
+        if mappings:
+            db.session.execute(
+                db.insert(TransferIdMap),
+                [{"run_id": self.run_id, "table_name": table, **mapping} for mapping in mappings],
+            )
+        db.session.commit()
+        counts["inserted"] += len(rows)
+        return next_id
+
+    def finish(self) -> Dict[str, Dict[str, int]]:
+        db.session.execute(db.delete(TransferIdMap).where(TransferIdMap.run_id == self.run_id))
+        db.session.commit()
+        # 파생 데이터/캐시를 가져온 원본에 맞춘다
+        from services import competition_index, flag_verifier, scoring, team_phases
+
+        if {"challenges", "attempts"} & set(self.summary):
+            scoring.recompute_all()
+        if "challenges" in self.summary:
+            flag_verifier.invalidate()
+        if "competitions" in self.summary:
+            competition_index.invalidate()
+        if "team_posts" in self.summary:
+            team_phases.rebuild_counts()
+        return self.summary
+
+
+def import_stream(table: str, stream: Iterable[str], fmt: str, chunk_size: int = 1000,
+                  importer: Optional[Importer] = None) -> Dict[str, int]:
+    importer = importer or Importer(chunk_size)
+    return importer.import_records(table, read_records(stream, fmt))
+
+
+# ---------------------------------------------------------------------------
+# CLI: flask export / flask import
+# ---------------------------------------------------------------------------
+def _table_order(names: Iterable[str]) -> List[str]:
+    wanted = set(names)
+    return [table for table in TABLES if table in wanted]
+
+
+@click.command("export")
+@click.argument("tables", nargs=-1)
+@click.option("--format", "fmt", type=click.Choice(FORMATS), default="ndjson", show_default=True)
+@click.option("--output-dir", default="export", show_default=True, help="'-' 이면 표준 출력 (테이블 하나만)")
+@click.option("--include-password-hashes", is_flag=True, help="users.password_hash 포함")
+@click.option("--chunk-size", type=int, default=2000, show_default=True)
+@with_appcontext
+def export_command(tables, fmt, output_dir, include_password_hashes, chunk_size):
+    """테이블을 NDJSON/CSV 로 내보낸다 (기본: 전체)."""
+    tables = _table_order(tables or TABLES)
+    for table in tables:
+        _spec(table)
+    if output_dir == "-":
+        if len(tables) != 1:
+            raise click.UsageError("표준 출력으로는 테이블 하나만 내보낼 수 있습니다.")
+        for chunk in export_lines(tables[0], fmt, include_password_hashes, chunk_size):
+            click.echo(chunk, nl=False)
+        return
+    os.makedirs(output_dir, exist_ok=True)
+    for table in tables:
+        path = os.path.join(output_dir, f"{table}.{fmt}")
+        lines = 0
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            for chunk in export_lines(table, fmt, include_password_hashes, chunk_size):
+                fh.write(chunk)
+                lines += chunk.count("\n")
+        click.echo(f"{table}: {path} ({lines}줄)", err=True)
+
+
+def _import_sources(paths) -> List[tuple]:
+    # 파일 이름(<테이블>.<형식>) 으로 대상 테이블을 정한다. 디렉터리면 아는 파일을 모두 읽는다.
+    found = {}
+    for path in paths:
+        candidates = (
+            [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+        )
+        for candidate in candidates:
+            table, _, fmt = os.path.basename(candidate).partition(".")
+            if table in TABLES and fmt in FORMATS:
+                found[table] = (candidate, fmt)
+            elif not os.path.isdir(path):
+                raise click.BadParameter(f"파일 이름은 <테이블>.<ndjson|csv> 이어야 합니다: {candidate}")
+    return [(table, *found[table]) for table in _table_order(found)]
+
+
+@click.command("import")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--chunk-size", type=int, default=1000, show_default=True)
+@with_appcontext
+def import_command(paths, chunk_size):
+    """`flask export` 결과를 가져온다. FK 는 새 id 로 바뀐다."""
+    importer = Importer(chunk_size)
+    try:
+        for table, path, fmt in _import_sources(paths):
+            with open(path, "r", encoding="utf-8", newline="") as fh:
+                counts = import_stream(table, fh, fmt, importer=importer)
+            click.echo(
+                f"{table}: 추가 {counts['inserted']} / 기존 연결 {counts['linked']} / FK 없음으로 건너뜀 {counts['skipped']}"
+            )
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # 실패해도 id 매핑은 지우고 이미 들어간 청크에 맞춰 파생 데이터를 갱신한다
+        importer.finish()